@@ -1,12 +1,74 @@
+import time
+
+APP_START = time.perf_counter()
+
+import sys
+import os
+
+import single_instance
+
+# A second launch forwards its request (focus, open, search) to the running
+# dashboard and exits before paying for Tk, the other imports and startup
+SINGLE_INSTANCE = single_instance.enabled(sys.argv)
+LAUNCH_REQUEST = single_instance.request_from_args(sys.argv)
+if __name__ == "__main__" and getattr(sys, "frozen", False):
+    # Log search workers re-run the executable; let them through first
+    import multiprocessing
+    multiprocessing.freeze_support()
+if __name__ == "__main__" and SINGLE_INSTANCE:
+    handoff_seconds = single_instance.hand_off(LAUNCH_REQUEST)
+    if handoff_seconds is not None:
+        if "--startup-timings" in sys.argv or os.environ.get("TSE_STARTUP_TIMINGS"):
+            print(f"Handed off to the running dashboard in {handoff_seconds * 1000:.1f} ms "
+                  f"({(time.perf_counter() - APP_START) * 1000:.1f} ms after launch)")
+        sys.exit(0)
+
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, messagebox, simpledialog
-import subprocess
-import os
 import importlib.util
 import webbrowser
-import json  # For JSON file handling
+import sqlite3
+
+from autosave import TextAutosave
+from batch_runner import BatchJob, parse_dependencies
+from batch_window import BatchWindow
+from command_runner import CommandRunner, command_from_text
+from console_pane import ConsolePane
+from content_cache import ContentCache
+from facet_bar import FacetBar
+from history_window import RunHistoryWindow
+from io_service import IOService
+from link_checker import LinkChecker
+from log_viewer import LogViewer
+from library import Changes, LibraryStore, folder_records, read_library, seed_folder, write_folder_records
+from metadata_store import MetadataStore
+from pack_store import PackFile, PackLibraryStore, read_ndjson, write_ndjson
+from palette import CommandPalette, FuzzyIndex
+from revision_store import RevisionStore
+from revision_window import RevisionHistoryWindow, TrashWindow
+from run_history import RunHistory
+from search_index import IndexUpdater, SearchIndex
+from tag_index import TagIndex, parse_query, parse_tags
+from team_sync import TeamSync
+from text_loader import STREAM_THRESHOLD_BYTES, FileLoad, StreamingLoader
+from timings import PhaseTimer
+from trace_overlay import SlowestHandlersOverlay
+from ui_queue import UIQueue
+from usage_rank import HALF_LIFE_DAYS, UsageRanking
+from viewer_window import ViewerWindow
+from virtual_list import VirtualList
+from watcher import FolderWatcher
+import log_index
+import tracing
+
+# Startup phase timings; print them with --startup-timings
+STARTUP = PhaseTimer(APP_START)
+STARTUP.mark("import")
+PRINT_STARTUP_TIMINGS = "--startup-timings" in sys.argv or bool(os.environ.get("TSE_STARTUP_TIMINGS"))
+# Opt-in handler tracing and stall detection; see tracing.py
+TRACE_ENABLED = "--trace" in sys.argv or bool(os.environ.get("TSE_TRACE"))
+STALL_THRESHOLD_MS = float(os.environ.get("TSE_STALL_MS", tracing.STALL_THRESHOLD_MS))
 
-import shutil
 # Path to scripts.txt
 scripts_txt_path = os.path.join(os.path.dirname(__file__), "scripts_folder", "scripts.txt")
 
@@ -62,17 +124,157 @@ def ensure_user_dirs():
 if not ensure_user_dirs():
     raise SystemExit("Unable to initialize user directories")
 
-# Data files for persistent storage
+STARTUP.mark("dir setup")
+
+# Descriptions and links, persisted one edit at a time
+METADATA_FILE = os.path.join(base_user_dir, "metadata.sqlite3")
+# Last autosaved contents of the Notes pane, restored at startup
+NOTES_AUTOSAVE_FILE = os.path.join(base_user_dir, "notes_autosave.txt")
+# JSON files used by older versions; imported into METADATA_FILE once
 DATA_FILES = {
     "scripts": os.path.join(base_user_dir, "scripts_data.json"),
     "cmds": os.path.join(base_user_dir, "cmds_data.json")
 }
+# On-disk full-text index over filenames, descriptions and contents
+SEARCH_INDEX_FILE = os.path.join(base_user_dir, "search_index.sqlite3")
+# Byte budget for the shared file content cache used by viewers and editors
+CONTENT_CACHE_MAX_BYTES = int(os.environ.get("TSE_CONTENT_CACHE_BYTES", 16 * 1024 * 1024))
+# Scripts and CMDs open as tabs of one viewer window; past this many the
+# least recently used tab is closed and its text widget reused
+MAX_VIEWER_TABS = int(os.environ.get("TSE_VIEWER_TABS", 12))
+# Opens, copies and runs ranked by "Most used first"; a use counts half as
+# much after this many days
+FRECENCY_HALF_LIFE_DAYS = float(os.environ.get("TSE_FRECENCY_HALF_LIFE_DAYS", HALF_LIFE_DAYS))
+# Finished command runs (timings and the tail of their output)
+RUN_HISTORY_FILE = os.path.join(base_user_dir, "run_history.sqlite3")
+# Every saved version of a script or CMD, and the trash of deleted ones
+REVISIONS_FILE = os.path.join(base_user_dir, "revisions.sqlite3")
+# Saved CMDs run in the background; at most this many at once, each killed
+# (with its child processes) after COMMAND_TIMEOUT_SECONDS
+MAX_CONCURRENT_RUNS = int(os.environ.get("TSE_MAX_CONCURRENT_RUNS", 3))
+COMMAND_TIMEOUT_SECONDS = float(os.environ.get("TSE_COMMAND_TIMEOUT", 600))
+# Default number of CMDs a batch runs side by side
+BATCH_PARALLELISM = int(os.environ.get("TSE_BATCH_PARALLELISM", 4))
+# Shared team library (a folder with scripts_folder/ and cmds_folder/) pulled
+# into the user folders; also settable from Tools > Team Library Folder
+TEAM_LIBRARY = os.environ.get("TSE_TEAM_LIBRARY")
+TEAM_SYNC_MANIFEST = os.path.join(base_user_dir, "team_sync_manifest.json")
+TEAM_SYNC_INTERVAL_MS = int(float(os.environ.get("TSE_TEAM_SYNC_INTERVAL", 300)) * 1000)
+# Where scripts and cmds are stored: "folders" (one .txt file each, the
+# default) or "pack" (one indexed SQLite file; the folders are imported
+# into it the first time)
+STORAGE_BACKEND = os.environ.get("TSE_STORAGE", "folders")
+PACK_FILE = os.path.join(base_user_dir, "library.pack")
+# Chrome trace written at exit when tracing is on
+TRACE_FILE = os.path.join(base_user_dir, "trace.json")
+# Helpful Links stored the first time the dashboard runs
+DEFAULT_LINKS = [
+    {"desc": "Playbook for SQL scripts", "url": "https://your-playbook-link.com"},
+    {"desc": "Company Wiki", "url": "https://your-company-wiki.com"},
+    {"desc": "Troubleshooting Guide", "url": "https://your-troubleshooting-guide.com"},
+]
+
+
+def read_library_data(metadata, stores):
+    """Read the saved descriptions and links and list both user folders.
+
+    Runs on the I/O pool at startup. Returns ``(data, errors, snapshots,
+    links, link_status, usage, sort_by_use)``; all but the links and their
+    status are keyed by ``"scripts"``/``"cmds"``.
+    """
+    data, errors, snapshots = read_library(metadata, stores, DATA_FILES)
+    sort_by_use = {store.kind: metadata.get_setting(f"sort_by_use:{store.kind}") == "1" for store in stores}
+    return (data, errors, snapshots, metadata.load_links(DEFAULT_LINKS), metadata.load_link_status(),
+            metadata.load_usage(), sort_by_use)
+
 
 class DashboardApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("TSE Dashboard")
         self.geometry("800x600")
+        self.closed = False  # set once the window is closing; late callbacks check it
+
+        self.content_cache = ContentCache(CONTENT_CACHE_MAX_BYTES)
+        # Disk work runs on a small thread pool; results come back through
+        # the UI queue so the Tk main loop never waits on I/O.
+        self.ui_queue = UIQueue(self)
+        self.ui_queue.start()
+        if tracing.TRACER is not None:
+            tracing.TRACER.attach(self)
+        self.io = IOService(self.ui_queue, report_error=self.report_io_error)
+        self.history = RunHistory(
+            RUN_HISTORY_FILE,
+            on_error=lambda e: self.ui_queue.post(self.report_io_error, "Saving run history", e))
+        self.revisions = RevisionStore(REVISIONS_FILE)
+        self.runner = CommandRunner(self.ui_queue, max_concurrent=MAX_CONCURRENT_RUNS,
+                                    default_timeout=COMMAND_TIMEOUT_SECONDS, on_finish=self.record_run)
+        self.batch_windows = []
+        self.viewer = None  # created on the first file opened
+        self.team_sync = None
+        self._team_sync_running = False
+        self._team_sync_job = None
+        # Each description or link edit is written as it happens
+        self.metadata = MetadataStore(
+            METADATA_FILE,
+            on_error=lambda e: self.ui_queue.post(self.report_io_error, "Saving metadata", e))
+
+        # --- Menu bar ---
+        menubar = tk.Menu(self)
+        self.tools_menu = tk.Menu(menubar, tearoff=0)
+        self.tools_menu.add_command(label="Content Cache Stats", command=self.show_cache_stats)
+        self.tools_menu.add_command(label="Run History", command=lambda: RunHistoryWindow(self, self.history, self.io))
+        self.tools_menu.add_command(label="Trash...", command=lambda: TrashWindow(
+            self, self.revisions, self.io, self.restore_from_trash))
+        self.tools_menu.add_command(label="Check Links", command=lambda: self.check_links(force=True))
+        self.tools_menu.add_command(label="Team Library Folder...", command=self.choose_team_library)
+        self.tools_menu.add_command(label="Export Library (NDJSON)...", command=self.export_library)
+        self.tools_menu.add_command(label="Import Library (NDJSON)...", command=self.import_library)
+        self.tools_menu.add_command(label="Sync Team Library Now", command=lambda: self.sync_team_library(manual=True))
+        if tracing.TRACER is not None:
+            self.tools_menu.add_command(label="Slowest Handlers",
+                                        command=lambda: SlowestHandlersOverlay(self, tracing.TRACER))
+            self.tools_menu.add_command(label="Export Trace", command=self.export_trace)
+        self.tools_menu.add_command(label="Go to...", accelerator="Ctrl+K", command=self.open_palette)
+        menubar.add_cascade(label="Tools", menu=self.tools_menu)
+        self.config(menu=menubar)
+
+        # --- Search bar (results listed below it while a query is typed) ---
+        search_frame = tk.Frame(self)
+        search_frame.pack(fill="x", padx=10, pady=(5, 0))
+        self.search_frame = search_frame
+        tk.Label(search_frame, text="Search:").pack(side="left")
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.search_entry = search_entry
+        self.search_results = tk.Listbox(self, height=6)
+        self.search_results.bind("<Double-Button-1>", lambda e: self.open_search_result())
+        self.search_results.bind("<Return>", lambda e: self.open_search_result())
+        search_entry.bind("<Down>", lambda e: self.search_results.focus_set())
+        self.search_hits = []
+        self.search_index = SearchIndex(SEARCH_INDEX_FILE)
+        self.index_updater = IndexUpdater(SEARCH_INDEX_FILE)
+        self.index_updater.start()
+        self.search_var.trace_add("write", lambda *args: self.run_search())
+
+        # Ctrl+K palette over scripts, CMDs and links; kept in step with every change
+        self.palette_index = FuzzyIndex()
+        self.palette = None
+        # Text and Entry class bindings run before "all", and Tk's own Ctrl+K
+        # there deletes to the end of the line; take the key over in them too
+        for widget_class in ("Text", "Entry"):
+            self.bind_class(widget_class, "<Control-k>", self.on_palette_key)
+        self.bind_all("<Control-k>", self.on_palette_key)
+
+        # --- Tag filter (per-tag bitmaps over each panel, kept in step like the palette) ---
+        self.tag_indexes = {"scripts": TagIndex(), "cmds": TagIndex(), "links": TagIndex()}
+        self.tag_filter = ([], [])  # (groups, excluded) from tag_index.parse_query
+        self.facet_bar = FacetBar(self, on_change=lambda query: self.apply_tag_filter())
+        self.facet_bar.pack(fill="x", padx=10, pady=(5, 0))
+        # Opens, copies and runs per script and CMD; "Most used first" ranks by them
+        self.rankings = {kind: UsageRanking(FRECENCY_HALF_LIFE_DAYS) for kind in ("scripts", "cmds")}
+        self.sort_by_use = {kind: tk.BooleanVar(value=False) for kind in ("scripts", "cmds")}
 
         # --- Helpful Links Frame (Scrollable & Dynamic) ---
         links_frame = tk.LabelFrame(self, text="Helpful Links", padx=10, pady=10)
@@ -88,11 +290,12 @@ class DashboardApp(tk.Tk):
         self.links_inner_frame = tk.Frame(canvas)
         canvas.create_window((0, 0), window=self.links_inner_frame, anchor="nw")
 
-        self.links = [
-            {"desc": "Playbook for SQL scripts", "url": "https://your-playbook-link.com"},
-            {"desc": "Company Wiki", "url": "https://your-company-wiki.com"},
-            {"desc": "Troubleshooting Guide", "url": "https://your-troubleshooting-guide.com"},
-        ]
+        # Loaded from the metadata store by the startup pipeline
+        self.links = []
+        # Links are checked in the background; results are cached in the metadata store
+        self.link_checker = LinkChecker(self.ui_queue, on_result=self.link_checked)
+        self.link_badges = {}  # url -> badge labels
+        self.link_rows = []  # widgets of each link's row, in list order
 
         # Listbox for selecting links to delete
         self.links_listbox = tk.Listbox(self.links_inner_frame, height=6)
@@ -116,87 +319,81 @@ class DashboardApp(tk.Tk):
         script_frame.pack(fill="x", padx=10, pady=5)
         self.scripts_frame = script_frame
 
-        # Canvas + Scrollbar for scripts
-        scripts_canvas = tk.Canvas(script_frame, height=120)
-        scripts_canvas.pack(side="left", fill="both", expand=True)
-        scripts_scrollbar = tk.Scrollbar(script_frame, orient="vertical", command=scripts_canvas.yview)
-        scripts_scrollbar.pack(side="right", fill="y")
-        scripts_canvas.configure(yscrollcommand=scripts_scrollbar.set)
-
-        self.scripts_list_frame = tk.Frame(scripts_canvas)
-        scripts_canvas.create_window((0, 0), window=self.scripts_list_frame, anchor="nw")
-
-        self.scripts_list_frame.bind("<Configure>", lambda e: scripts_canvas.configure(scrollregion=scripts_canvas.bbox("all")))
-
-        self.scripts = []
-        # Copy boilerplate scripts to user folder if not present
-        install_scripts_folder = os.path.join(os.path.dirname(__file__), "scripts_folder")
-        if os.path.exists(install_scripts_folder):
-            for filename in os.listdir(install_scripts_folder):
-                if filename.endswith(".txt"):
-                    src = os.path.join(install_scripts_folder, filename)
-                    dst = os.path.join(USER_SCRIPTS_FOLDER, filename)
-                    if not os.path.exists(dst):
-                        shutil.copy2(src, dst)
-        # Load scripts from user folder
-        if os.path.exists(USER_SCRIPTS_FOLDER):
-            for filename in os.listdir(USER_SCRIPTS_FOLDER):
-                if filename.endswith(".txt"):
-                    self.scripts.append({"desc": filename, "filename": filename})
-        self.render_scripts(script_frame, USER_SCRIPTS_FOLDER)
+        # Virtualized list for scripts (fixed pool of rows sized to the viewport)
+        self.scripts_view = VirtualList(
+            script_frame,
+            on_open=lambda i: self.show_script_content(USER_SCRIPTS_FOLDER, self.scripts[i]["filename"]),
+            on_edit=self.edit_script,
+            on_delete=self.delete_script,
+        )
+        self.scripts_view.pack(side="left", fill="both", expand=True)
+
+        # Filled in by the startup pipeline (see start_loading)
+        self.pack = PackFile(PACK_FILE) if STORAGE_BACKEND == "pack" else None
+        if self.pack is not None:
+            self.scripts_store = PackLibraryStore("scripts", self.pack, self.metadata)
+        else:
+            self.scripts_store = LibraryStore("scripts", USER_SCRIPTS_FOLDER, self.metadata, self.content_cache)
+        self.scripts = self.scripts_store.entries
         script_btn_frame = tk.Frame(script_frame)
         script_btn_frame.pack(side="right", padx=10, pady=5)
         new_script_btn = tk.Button(script_btn_frame, text="New Script File", command=lambda: self.create_new_script_file(USER_SCRIPTS_FOLDER))
         new_script_btn.pack(fill="x", pady=2)
-        refresh_script_btn = tk.Button(script_btn_frame, text="Refresh", command=lambda: self.refresh_scripts(USER_SCRIPTS_FOLDER))
-        refresh_script_btn.pack(fill="x", pady=2)
+        tk.Checkbutton(script_btn_frame, text="Most used first", variable=self.sort_by_use["scripts"],
+                       command=lambda: self.toggle_sort_by_use(self.scripts_view, self.scripts_store)).pack(anchor="w")
 
         # --- CMDs Frame ---
         cmds_frame = tk.LabelFrame(self, text="Saved CMDs", padx=10, pady=10)
         cmds_frame.pack(fill="x", padx=10, pady=5)
         self.cmds_frame = cmds_frame
 
-        # Canvas + Scrollbar for cmds
-        cmds_canvas = tk.Canvas(cmds_frame, height=120)
-        cmds_canvas.pack(side="left", fill="both", expand=True)
-        cmds_scrollbar = tk.Scrollbar(cmds_frame, orient="vertical", command=cmds_canvas.yview)
-        cmds_scrollbar.pack(side="right", fill="y")
-        cmds_canvas.configure(yscrollcommand=cmds_scrollbar.set)
-
-        self.cmds_list_frame = tk.Frame(cmds_canvas)
-        cmds_canvas.create_window((0, 0), window=self.cmds_list_frame, anchor="nw")
-
-        self.cmds_list_frame.bind("<Configure>", lambda e: cmds_canvas.configure(scrollregion=cmds_canvas.bbox("all")))
-
-        self.cmds = []
-        # Copy boilerplate cmds to user folder if not present
-        install_cmds_folder = os.path.join(os.path.dirname(__file__), "cmds_folder")
-        if os.path.exists(install_cmds_folder):
-            for filename in os.listdir(install_cmds_folder):
-                if filename.endswith(".txt"):
-                    src = os.path.join(install_cmds_folder, filename)
-                    dst = os.path.join(USER_CMDS_FOLDER, filename)
-                    if not os.path.exists(dst):
-                        shutil.copy2(src, dst)
-        # Load cmds from user folder
-        if os.path.exists(USER_CMDS_FOLDER):
-            for filename in os.listdir(USER_CMDS_FOLDER):
-                if filename.endswith(".txt"):
-                    self.cmds.append({"desc": "No description", "filename": filename})
-        self.render_cmds(cmds_frame, USER_CMDS_FOLDER)
+        # Virtualized list for cmds (fixed pool of rows sized to the viewport)
+        self.cmds_view = VirtualList(
+            cmds_frame,
+            on_open=lambda i: self.show_cmd_content(USER_CMDS_FOLDER, self.cmds[i]["filename"]),
+            on_edit=self.edit_cmd,
+            on_delete=self.delete_cmd,
+            on_run=self.run_cmd,
+            selectable=True,
+        )
+        self.cmds_view.pack(side="left", fill="both", expand=True)
+
+        if self.pack is not None:
+            self.cmds_store = PackLibraryStore("cmds", self.pack, self.metadata, default_desc="No description")
+        else:
+            self.cmds_store = LibraryStore("cmds", USER_CMDS_FOLDER, self.metadata, self.content_cache,
+                                           default_desc="No description")
+        self.cmds = self.cmds_store.entries
         cmd_btn_frame = tk.Frame(cmds_frame)
         cmd_btn_frame.pack(side="right", padx=10, pady=5)
         add_cmd_btn = tk.Button(cmd_btn_frame, text="New CMD File", command=lambda: self.create_new_cmd_file(USER_CMDS_FOLDER))
         add_cmd_btn.pack(fill="x", pady=2)
-        refresh_cmd_btn = tk.Button(cmd_btn_frame, text="Refresh", command=lambda: self.refresh_cmds(USER_CMDS_FOLDER))
-        refresh_cmd_btn.pack(fill="x", pady=2)
+        run_selected_btn = tk.Button(cmd_btn_frame, text="Run Selected", command=self.run_selected_cmds)
+        run_selected_btn.pack(fill="x", pady=2)
+        tk.Checkbutton(cmd_btn_frame, text="Most used first", variable=self.sort_by_use["cmds"],
+                       command=lambda: self.toggle_sort_by_use(self.cmds_view, self.cmds_store)).pack(anchor="w")
+
+        # Watch the user folders so files dropped in by sync tools show up
+        # without a manual refresh. Batches are applied on the Tk thread.
+        # Started once the initial listing is rendered.
+        self.watcher = FolderWatcher(
+            {"scripts": USER_SCRIPTS_FOLDER, "cmds": USER_CMDS_FOLDER},
+            lambda batch: self.ui_queue.post(self.on_folder_changes, batch),
+        )
+
+        # Notes and the log viewer side by side
+        lower_pane = tk.PanedWindow(self, orient="horizontal", sashwidth=6)
+        lower_pane.pack(fill="both", expand=True, padx=10, pady=5)
 
         # Notes Frame
-        notes_frame = tk.LabelFrame(self, text="Notes", padx=10, pady=10)
-        notes_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        notes_frame = tk.LabelFrame(lower_pane, text="Notes", padx=10, pady=10)
+        lower_pane.add(notes_frame, stretch="always")
 
         self.notes_text = scrolledtext.ScrolledText(notes_frame, wrap=tk.WORD, height=10)
         self.notes_text.pack(fill="both", expand=True)
+        # Snapshot the notes in the background so they survive a restart
+        self.notes_autosave = TextAutosave(self.notes_text, NOTES_AUTOSAVE_FILE, self.io)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.notes_save_folder = os.path.join(os.path.expanduser("~"), "Desktop")
 
@@ -206,6 +403,30 @@ class DashboardApp(tk.Tk):
         save_notes_btn = tk.Button(notes_frame, text="Save Notes", command=self.save_notes)
         save_notes_btn.pack(side="right", fill="x", padx=5, pady=5)
 
+        # Large logs open here (memory-mapped) instead of being pasted into Notes
+        self.log_viewer = LogViewer(lower_pane, self.ui_queue)
+        lower_pane.add(self.log_viewer, stretch="always")
+
+        # Later launches hand their request to this instance instead of
+        # starting another one. Requests that arrive before the library has
+        # loaded (and this launch's own --open/--search) wait for startup.
+        self.instance_server = None
+        self.loaded = False
+        self.pending_launch_requests = [] if LAUNCH_REQUEST["action"] == "focus" else [LAUNCH_REQUEST]
+        if SINGLE_INSTANCE:
+            self.instance_server = single_instance.InstanceServer(
+                lambda request: self.ui_queue.post(self.handle_launch_request, request))
+            try:
+                self.instance_server.start()
+            except OSError as e:
+                print(f"Single-instance mode unavailable: {e}")
+                self.instance_server = None
+
+        # Paint the window shell first; seeding, scanning and rendering run
+        # from idle callbacks and the I/O pool.
+        STARTUP.mark("build window")
+        self.after_idle(self.start_loading)
+
        
         # # Command Prompts Listbox (OLD, REMOVE THIS)
         # cmds_frame = tk.LabelFrame(self, text="Saved CMDs", padx=10, pady=10)
@@ -266,13 +487,80 @@ class DashboardApp(tk.Tk):
             messagebox.showinfo("Saved", f"Notes saved to:\n{file_path}")
             self.notes_text.delete("1.0", tk.END)  # Clear notes after saving
 
-    def run_command(self):
-        cmd = self.command_entry.get()
-        try:
-            output = subprocess.check_output(cmd, shell=True, stderr=subprocess.STDOUT, universal_newlines=True)
-            messagebox.showinfo("Command Output", output)
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Command Error", e.output)
+    def run_command(self, cmd, name=None):
+        """Run ``cmd`` in the background and stream its output into a console window."""
+        popup = tk.Toplevel(self)
+        popup.title(f"Run: {name or cmd}")
+        popup.geometry("700x400")
+        console = None
+
+        def output(run, lines):
+            if console.winfo_exists():
+                console.append(lines)
+
+        def exited(run):
+            if console.winfo_exists():
+                console.finish()
+
+        run = self.runner.run(name or cmd, cmd, on_output=output, on_exit=exited)
+        console = ConsolePane(popup, self.runner, run)
+        console.pack(fill="both", expand=True)
+
+        def close():
+            # Closing the console stops the command
+            if not run.finished:
+                self.runner.cancel(run)
+            popup.destroy()
+
+        popup.protocol("WM_DELETE_WINDOW", close)
+        return run
+
+    def run_selected_cmds(self):
+        """Run the checked CMDs as a parallel batch with a live status table."""
+        filenames = [cmd["filename"] for cmd in self.cmds_view.selected_items()]
+        if not filenames:
+            messagebox.showinfo("Run Selected", "Tick the CMDs to run first.")
+            return
+
+        def read():
+            return [(filename, self.cmds_store.read(filename)) for filename in filenames]
+
+        def loaded(texts):
+            jobs = [BatchJob(filename, command_from_text(text), parse_dependencies(text))
+                    for filename, text in texts if command_from_text(text)]
+            empty = [filename for filename, text in texts if not command_from_text(text)]
+            if empty:
+                messagebox.showwarning("Run Selected", "No command to run in:\n" + "\n".join(empty))
+            if not jobs:
+                return
+            for job in jobs:
+                self.record_use(self.cmds_store, job.name, "run")
+            window = BatchWindow(self, self.ui_queue, jobs, parallelism=BATCH_PARALLELISM,
+                                 timeout=COMMAND_TIMEOUT_SECONDS, on_finish=self.record_run)
+            self.batch_windows = [w for w in self.batch_windows if w.winfo_exists()] + [window]
+
+        self.io.submit(read, on_done=loaded,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not read CMDs: {e}"))
+
+    def record_run(self, run):
+        if run.started is None:
+            return  # cancelled while queued
+        self.history.record(run.name, run.started, run.duration, run.returncode, run.status,
+                            run.captured_output(), output_size=run.output_bytes)
+
+    def run_cmd(self, idx):
+        cmd = self.cmds[idx]
+
+        def loaded(text):
+            command = command_from_text(text)
+            if not command:
+                messagebox.showwarning("Run CMD", f"{cmd['filename']} has no command to run.")
+                return
+            self.record_use(self.cmds_store, cmd["filename"], "run")
+            self.run_command(command, name=cmd["filename"])
+
+        self.io.submit(self.cmds_store.read, cmd["filename"], on_done=loaded,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not read {cmd['filename']}: {e}"))
 
     def show_scripts_txt(self):
         # Show the contents of scripts.txt in a popup window for copy/paste
@@ -368,50 +656,327 @@ class DashboardApp(tk.Tk):
         save_btn = tk.Button(popup, text="Save", command=save_changes)
         save_btn.pack(side="bottom", fill="x", pady=5)
 
-    def refresh_scripts(self, folder=USER_SCRIPTS_FOLDER):
-        scripts_dict = {s["filename"]: s["desc"] for s in self.scripts}
-        self.scripts.clear()
-        if os.path.exists(folder):
-            for filename in os.listdir(folder):
-                if filename.endswith(".txt"):
-                    desc = scripts_dict.get(filename, filename)
-                    self.scripts.append({"desc": desc, "filename": filename})
-        self.render_scripts(self.scripts_frame, folder)
-
-    def refresh_cmds(self, folder=USER_CMDS_FOLDER):
-        cmds_dict = {c["filename"]: c["desc"] for c in self.cmds}
-        self.cmds.clear()
-        if os.path.exists(folder):
-            for filename in os.listdir(folder):
-                if filename.endswith(".txt"):
-                    desc = cmds_dict.get(filename, "No description")
-                    self.cmds.append({"desc": desc, "filename": filename})
-        self.render_cmds(self.cmds_frame, folder)
+    def refresh_scripts(self):
+        # Scan on the I/O pool, diff and update rows on the Tk thread
+        self.io.submit(self.scripts_store.scan, on_done=lambda snapshot: self.apply_changes(
+            self.scripts_view, self.scripts_store, self.scripts_store.apply_snapshot(snapshot)))
+
+    def refresh_cmds(self):
+        self.io.submit(self.cmds_store.scan, on_done=lambda snapshot: self.apply_changes(
+            self.cmds_view, self.cmds_store, self.cmds_store.apply_snapshot(snapshot)))
+
+    def on_folder_changes(self, batch):
+        """Apply a debounced batch of watcher events, ``{key: filenames or None}``."""
+        if self.closed:
+            return  # the I/O pool is shut down; the next start rescans anyway
+        for key, filenames in batch.items():
+            if key == "scripts":
+                view, store = self.scripts_view, self.scripts_store
+            else:
+                view, store = self.cmds_view, self.cmds_store
+            if filenames is None:
+                self.refresh_scripts() if key == "scripts" else self.refresh_cmds()
+                continue
+            filenames = [f for f in filenames if f.endswith(".txt")]
+            self.io.submit(store.stat, filenames,
+                           on_done=lambda stats, v=view, s=store: self.apply_changes(v, s, s.apply_stats(stats)))
+
+    def apply_changes(self, view, store, changes):
+        """Update only the rows affected by a reconcile pass."""
+        if self.closed:
+            return
+        if changes.added or changes.removed or changes.changed:
+            self.update_search_index()
+        for filename in changes.removed:
+            self.palette_index.remove(store.kind, filename)
+        for filename in changes.added + changes.changed:
+            self.index_palette_entry(store.kind, store.by_name[filename])
+        if self.viewer is not None and self.viewer.winfo_exists():
+            for filename in changes.removed:
+                self.viewer.close(store.kind, filename)
+            for filename in changes.changed:
+                self.viewer.reload(store.kind, filename)
+        self.sync_tag_index(store, changes)
+        self.sync_ranking(store, changes)
+        if changes.added or changes.removed:
+            # Entries shifted; rebind the visible rows only (through the tag filter)
+            self.filter_panel(view, store)
+            self.update_facet_counts()
+            return
+        for filename in changes.changed:
+            view.refresh_item(store.by_name[filename])
+
+    # --- Tags ---
+    def sync_tag_index(self, store, changes):
+        """Mirror a reconcile pass in the panel's tag bitmaps."""
+        index = self.tag_indexes[store.kind]
+        if changes.removed:
+            index.remove_keys(changes.removed)
+        for filename in changes.added:
+            index.append(filename, store.by_name[filename].get("tags", ()))
+        if len(index) != len(store.entries):
+            self.rebuild_tag_index(store)
+
+    def rebuild_tag_index(self, store):
+        self.tag_indexes[store.kind].rebuild((entry["filename"], entry.get("tags", ())) for entry in store.entries)
+
+    def tag_filter_active(self):
+        return bool(self.tag_filter[0] or self.tag_filter[1])
+
+    def apply_tag_filter(self):
+        """Filter every panel by the tag bar and refresh its facet counts."""
+        self.tag_filter = parse_query(self.facet_bar.query())
+        self.filter_panel(self.scripts_view, self.scripts_store)
+        self.filter_panel(self.cmds_view, self.cmds_store)
+        self.filter_links()
+        self.update_facet_counts()
+
+    def filter_panel(self, view, store):
+        """Show the entries of a panel that match the tag filter (all of them without one)."""
+        order = None
+        if self.tag_filter_active():
+            index = self.tag_indexes[store.kind]
+            order = index.members(index.mask(*self.tag_filter))
+        if self.sort_by_use[store.kind].get():
+            ranking = self.rankings[store.kind]
+            ranking.set_filter(order)
+            order = ranking.current()
+        view.set_items(store.entries, order=order)
+
+    def update_facet_counts(self):
+        counts = {}
+        shown = total = 0
+        for index in self.tag_indexes.values():
+            mask = index.mask(*self.tag_filter)
+            for tag, count in index.counts(mask).items():
+                counts[tag] = counts.get(tag, 0) + count
+            shown += index.count(mask)
+            total += len(index)
+        self.facet_bar.show_counts(counts, shown, total)
+
+    def set_tags(self, kind, key, entry, tags):
+        """Save the tags of a script or CMD (``key`` is the filename) or link (its id)."""
+        if tuple(entry.get("tags", ())) == tags:
+            return
+        entry["tags"] = tags
+        self.metadata.set_tags(kind, key, tags)
+        index = self.tag_indexes[kind]
+        position = index.position(key)
+        if position is not None:
+            index.set_tags(position, tags)
+        self.apply_tag_filter()
+
+    # --- Usage ranking ---
+    def sync_ranking(self, store, changes):
+        """Mirror a reconcile pass in the panel's ranking, if it is sorted by use."""
+        if not self.sort_by_use[store.kind].get():
+            return
+        ranking = self.rankings[store.kind]
+        if changes.removed:
+            ranking.rebuild([entry["filename"] for entry in store.entries])
+            return
+        for filename in changes.added:
+            ranking.append(filename)
+        if len(ranking.positions) != len(store.entries):
+            ranking.rebuild([entry["filename"] for entry in store.entries])
+
+    def toggle_sort_by_use(self, view, store):
+        """Switch a panel between folder order and most used first."""
+        on = self.sort_by_use[store.kind].get()
+        self.metadata.set_setting(f"sort_by_use:{store.kind}", "1" if on else "0")
+        ranking = self.rankings[store.kind]
+        if on:
+            ranking.rebuild([entry["filename"] for entry in store.entries])
+        else:
+            ranking.clear()
+        self.filter_panel(view, store)
+
+    def record_use(self, store, filename, event):
+        """Count an open, copy or run of a script or CMD and move it to its new rank."""
+        record = self.rankings[store.kind].record(filename, event)
+        self.metadata.save_usage(store.kind, filename, record)
+        if self.sort_by_use[store.kind].get():
+            # Only the entry moved; rebind the visible rows
+            (self.scripts_view if store.kind == "scripts" else self.cmds_view).redraw()
+
+    def update_search_index(self):
+        """Ask the background indexer to pick up changed files and descriptions."""
+        self.index_updater.request_update({
+            "scripts": (self.scripts_store.index_source, list(self.scripts)),
+            "cmds": (self.cmds_store.index_source, list(self.cmds)),
+        })
+
+    def run_search(self):
+        query = self.search_var.get()
+        self.search_results.delete(0, tk.END)
+        if not query.strip():
+            self.search_hits = []
+            self.search_results.pack_forget()
+            return
+        try:
+            self.search_hits = self.search_index.search(query)
+        except sqlite3.Error as e:
+            print(f"Search failed: {e}")
+            self.search_hits = []
+        for kind, filename, desc, _score in self.search_hits:
+            label = "Script" if kind == "scripts" else "CMD"
+            self.search_results.insert(tk.END, f"[{label}] {desc}: {filename}")
+        if not self.search_hits:
+            self.search_results.insert(tk.END, "No matches")
+        self.search_results.pack(after=self.search_frame, fill="x", padx=10)
+
+    def open_search_result(self):
+        selected = self.search_results.curselection()
+        if not selected or selected[0] >= len(self.search_hits):
+            return
+        kind, filename, _desc, _score = self.search_hits[selected[0]]
+        if kind == "scripts":
+            self.show_script_content(USER_SCRIPTS_FOLDER, filename)
+        else:
+            self.show_cmd_content(USER_CMDS_FOLDER, filename)
+
+    # --- Command palette ---
+    def index_palette_entry(self, kind, entry):
+        self.palette_index.set(kind, entry["filename"], f"{entry['desc']}: {entry['filename']}",
+                               f"{entry['desc']} {entry['filename']}")
+
+    def on_palette_key(self, event):
+        self.open_palette()
+        return "break"
+
+    def open_palette(self):
+        if self.palette is not None and self.palette.winfo_exists():
+            self.palette.show()
+            return
+        self.palette = CommandPalette(self, self.palette_index, {
+            "open": self.palette_open,
+            "copy": self.palette_copy,
+            "run": self.palette_run,
+        })
+
+    def palette_open(self, kind, key, payload):
+        if kind == "links":
+            webbrowser.open_new(self.links_by_id(key)["url"])
+        elif kind == "scripts":
+            self.show_script_content(USER_SCRIPTS_FOLDER, key)
+        else:
+            self.show_cmd_content(USER_CMDS_FOLDER, key)
+
+    def palette_copy(self, kind, key, payload):
+        if kind == "links":
+            self.copy_to_clipboard(self.links_by_id(key)["url"])
+            return
+        store = self.scripts_store if kind == "scripts" else self.cmds_store
+
+        def copied(text):
+            self.copy_to_clipboard(text)
+            self.record_use(store, key, "copy")
+
+        self.io.submit(store.read, key, on_done=copied,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not read {key}: {e}"))
+
+    def palette_run(self, kind, key, payload):
+        # Only CMDs run; scripts and links open instead
+        if kind != "cmds":
+            self.palette_open(kind, key, payload)
+            return
+        idx = next((i for i, cmd in enumerate(self.cmds) if cmd["filename"] == key), None)
+        if idx is not None:
+            self.run_cmd(idx)
+
+    def links_by_id(self, link_id):
+        return next(link for link in self.links if link["id"] == link_id)
+
+    def copy_to_clipboard(self, text):
+        self.clipboard_clear()
+        self.clipboard_append(text)
 
     def render_links(self):
+        self.palette_index.sync_kind("links", [
+            (link["id"], f"{link['desc']}: {link['url']}", f"{link['desc']} {link['url']}") for link in self.links])
+        index = self.tag_indexes["links"]
+        if len(index) != len(self.links):
+            index.rebuild((link["id"], link.get("tags", ())) for link in self.links)
         # Clear previous widgets
         for widget in self.links_inner_frame.winfo_children():
             widget.destroy()
+        self.link_badges = {}
+        self.link_rows = []
         for idx, link in enumerate(self.links):
-            desc_label = tk.Label(self.links_inner_frame, text=link["desc"] + ": ", anchor="w")
-            desc_label.grid(row=idx, column=0, sticky="w", padx=5, pady=2)
+            badge = tk.Label(self.links_inner_frame, width=10, anchor="w")
+            badge.grid(row=idx, column=0, sticky="w", padx=5, pady=2)
+            self.link_badges.setdefault(link["url"], []).append(badge)
+            self.show_link_status(badge, self.link_checker.results.get(link["url"]),
+                                  link["url"] in self.link_checker.pending)
+            tags = "".join(" #" + tag for tag in link.get("tags", ()))
+            desc_label = tk.Label(self.links_inner_frame, text=link["desc"] + tags + ": ", anchor="w")
+            desc_label.grid(row=idx, column=1, sticky="w", padx=5, pady=2)
             url_label = tk.Label(self.links_inner_frame, text=link["url"], fg="blue", cursor="hand2", anchor="w")
-            url_label.grid(row=idx, column=1, sticky="w", padx=5)
+            url_label.grid(row=idx, column=2, sticky="w", padx=5)
             url_label.bind("<Button-1>", lambda e, url=link["url"]: webbrowser.open_new(url))
             edit_btn = tk.Button(self.links_inner_frame, text="Edit", command=lambda i=idx: self.edit_link(i))
-            edit_btn.grid(row=idx, column=2, padx=5)
+            edit_btn.grid(row=idx, column=3, padx=5)
             del_btn = tk.Button(self.links_inner_frame, text="Delete", command=lambda i=idx: self.delete_link(i))
-            del_btn.grid(row=idx, column=3, padx=5)
+            del_btn.grid(row=idx, column=4, padx=5)
+            self.link_rows.append((badge, desc_label, url_label, edit_btn, del_btn))
+        self.filter_links()
+
+    def filter_links(self):
+        """Show the link rows matching the tag filter; the widgets are kept, only hidden."""
+        shown = None
+        if self.tag_filter_active():
+            index = self.tag_indexes["links"]
+            shown = set(index.members(index.mask(*self.tag_filter)))
+        for idx, row in enumerate(self.link_rows):
+            visible = shown is None or idx in shown
+            for widget in row:
+                if visible:
+                    widget.grid()
+                else:
+                    widget.grid_remove()
+
+    # --- Link health ---
+    LINK_BADGES = {"ok": ("\u2714", "green"), "dead": ("\u2716", "red"), "error": ("\u26a0", "orange"),
+                   "skipped": ("-", "gray")}
+
+    def show_link_status(self, badge, result, checking=False):
+        if checking:
+            badge.config(text="checking", fg="gray")
+        elif result is None:
+            badge.config(text="?", fg="gray")
+        else:
+            symbol, color = self.LINK_BADGES[result["state"]]
+            badge.config(text=f"{symbol} {result['code'] or result['state']}", fg=color)
+
+    def check_links(self, force=False):
+        """Check links whose cached result expired (or all with ``force``)."""
+        for url in self.link_checker.check([link["url"] for link in self.links], force=force):
+            for badge in self.link_badges.get(url, ()):
+                self.show_link_status(badge, None, checking=True)
+
+    def link_checked(self, result):
+        self.metadata.save_link_status(result)
+        for badge in self.link_badges.get(result["url"], ()):
+            if badge.winfo_exists():
+                self.show_link_status(badge, result)
 
     def add_link(self):
         desc = simpledialog.askstring("Add Link", "Enter description:", parent=self)
         url = simpledialog.askstring("Add Link", "Enter URL:", parent=self)
         if desc and url:
-            self.links.append({"desc": desc, "url": url})
+            # Ids only grow, so they also keep the links in display order
+            link_id = max((link["id"] for link in self.links), default=0) + 1
+            link = {"id": link_id, "desc": desc, "url": url}
+            self.links.append(link)
+            self.metadata.save_link(link)
+            self.tag_indexes["links"].append(link_id)
             self.render_links()
+            self.check_links()
 
     def delete_link(self, idx=None):
         if idx is not None:
+            self.metadata.delete_link(self.links[idx]["id"])
+            self.tag_indexes["links"].remove_keys([self.links[idx]["id"]])
             del self.links[idx]
             self.render_links()
         else:
@@ -420,6 +985,8 @@ class DashboardApp(tk.Tk):
                 messagebox.showinfo("Delete Link", "Please select a link to delete.")
                 return
             idx = selected[0]
+            self.metadata.delete_link(self.links[idx]["id"])
+            self.tag_indexes["links"].remove_keys([self.links[idx]["id"]])
             del self.links[idx]
             self.render_links()
   
@@ -428,45 +995,74 @@ class DashboardApp(tk.Tk):
         new_desc = simpledialog.askstring("Edit Link", "Edit description:", initialvalue=link["desc"], parent=self)
         new_url = simpledialog.askstring("Edit Link", "Edit URL:", initialvalue=link["url"], parent=self)
         if new_desc and new_url:
-            self.links[idx] = {"desc": new_desc, "url": new_url}
+            new_tags = simpledialog.askstring("Edit Link", "Tags (e.g. product:portal, os:windows):",
+                                              initialvalue=", ".join(link.get("tags", ())), parent=self)
+            self.links[idx] = {"id": link["id"], "desc": new_desc, "url": new_url, "tags": link.get("tags", ())}
+            self.metadata.save_link(self.links[idx])
+            if new_tags is not None:
+                self.set_tags("links", link["id"], self.links[idx], parse_tags(new_tags))
             self.render_links()
+            self.check_links()
   
     def render_scripts(self, parent, scripts_folder):
-        # Only clear the list frame, not the button frame
-        for widget in self.scripts_list_frame.winfo_children():
-            widget.destroy()
-        for idx, script in enumerate(self.scripts):
-            desc_label = tk.Label(self.scripts_list_frame, text=script["desc"] + ": ", anchor="w")
-            desc_label.grid(row=idx, column=0, sticky="w", padx=5, pady=2)
-            file_label = tk.Label(self.scripts_list_frame, text=script["filename"], fg="blue", cursor="hand2", anchor="w")
-            file_label.grid(row=idx, column=1, sticky="w", padx=5)
-            file_label.bind("<Button-1>", lambda e, f=script["filename"]: self.show_script_content(scripts_folder, f))
-            edit_btn = tk.Button(self.scripts_list_frame, text="Edit", command=lambda i=idx: self.edit_script(i))
-            edit_btn.grid(row=idx, column=2, padx=5)
-            del_btn = tk.Button(self.scripts_list_frame, text="Delete", command=lambda i=idx: self.delete_script(i))
-            del_btn.grid(row=idx, column=3, padx=5)
+        # Rebinds only the pooled rows visible in the viewport (through the tag filter)
+        self.filter_panel(self.scripts_view, self.scripts_store)
 
     def show_script_content(self, folder, filename):
-        path = os.path.join(folder, filename)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except Exception as e:
-            content = f"Error loading {path}: {e}"
-        popup = tk.Toplevel(self)
-        popup.title(f"Script: {filename}")
-        popup.geometry("500x300")
-        text_widget = scrolledtext.ScrolledText(popup, wrap=tk.WORD)
-        text_widget.pack(fill="both", expand=True)
-        text_widget.insert(tk.END, content)
-        text_widget.config(state="normal")
+        self.show_in_viewer(self.scripts_store, filename, f"Script: {filename}")
+
+    def show_in_viewer(self, store, filename, title):
+        """Open a file as a tab of the shared viewer window."""
+        self.record_use(store, filename, "open")
+        if self.viewer is None or not self.viewer.winfo_exists():
+            stores = {"scripts": self.scripts_store, "cmds": self.cmds_store}
+            self.viewer = ViewerWindow(
+                self, lambda frame, text, kind, name: self.load_file_into(frame, text, stores[kind], name),
+                max_tabs=MAX_VIEWER_TABS)
+        self.viewer.open(store.kind, filename, title)
+
+    def load_file_into(self, popup, text_widget, store, filename, before=None):
+        """Fill ``text_widget`` with a file from ``store`` and return a ``FileLoad``.
+
+        The file is read on the I/O pool. Small files come from the content
+        cache; larger ones on disk stream in chunks over ``after()`` ticks so
+        the dashboard stays responsive.
+        """
+        load = FileLoad()
+        path = store.path(filename)
+
+        def read():
+            if path is not None:
+                size = os.path.getsize(path)
+                if size > STREAM_THRESHOLD_BYTES:
+                    return size, None
+            content = store.read(filename)
+            return len(content), content
+
+        def loaded(result):
+            if load.closed or not text_widget.winfo_exists():
+                return
+            size, content = result
+            if content is None:
+                load.streaming = StreamingLoader(popup, text_widget, path, size, before=before)
+                return
+            text_widget.insert(tk.END, content)
+            load._done = True
+
+        def failed(e):
+            if not load.closed and text_widget.winfo_exists():
+                text_widget.insert(tk.END, f"Error loading {filename}: {e}")
+            load._done = True
+
+        self.io.submit(read, on_done=loaded, on_error=failed)
+        return load
 
     def add_script(self, folder):
         desc = simpledialog.askstring("Add Script", "Enter description:", parent=self)
         filename = simpledialog.askstring("Add Script", "Enter filename (must exist in folder):", parent=self)
-        if desc and filename and os.path.exists(os.path.join(folder, filename)):
-            self.scripts.append({"desc": desc, "filename": filename})
-            self.render_scripts(self.scripts_frame, folder)
+        if desc and filename and self.scripts_store.stat([filename])[filename] is not None:
+            changes = self.scripts_store.touch(filename, desc=desc)
+            self.apply_changes(self.scripts_view, self.scripts_store, changes)
 
     def create_new_script_file(self, folder):
         filename = simpledialog.askstring("New Script", "Enter new script filename (e.g. script4.txt):", parent=self)
@@ -477,14 +1073,16 @@ class DashboardApp(tk.Tk):
             filename += ".txt"
         content = simpledialog.askstring("New Script", "Enter initial content for the script:", parent=self)
         if filename and content is not None:
-            path = os.path.join(folder, filename)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
             desc = simpledialog.askstring("New Script", "Enter description for the script:", parent=self)
             if not desc:
                 desc = filename
-            self.scripts.append({"desc": desc, "filename": filename})
-            self.refresh_scripts(folder)
+
+            def written(stat):
+                changes = self.scripts_store.apply_stat(filename, stat, desc=desc)
+                self.apply_changes(self.scripts_view, self.scripts_store, changes)
+
+            self.io.submit(self.scripts_store.write_file, filename, content, on_done=written,
+                           on_error=lambda e: messagebox.showerror("Error", f"Could not create {filename}: {e}"))
 
     def create_new_cmd_file(self, folder):
         filename = simpledialog.askstring("New CMD", "Enter new CMD filename (e.g. cmd4.txt):", parent=self)
@@ -495,26 +1093,19 @@ class DashboardApp(tk.Tk):
             filename += ".txt"
         content = simpledialog.askstring("New CMD", "Enter initial content for the CMD:", parent=self)
         if filename and content is not None:
-            path = os.path.join(folder, filename)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
             desc = simpledialog.askstring("New CMD", "Enter description for the CMD:", parent=self)
             if not desc:
                 desc = "No description"
-            self.cmds.append({"desc": desc, "filename": filename})
-            self.refresh_cmds(folder)
+
+            def written(stat):
+                changes = self.cmds_store.apply_stat(filename, stat, desc=desc)
+                self.apply_changes(self.cmds_view, self.cmds_store, changes)
+
+            self.io.submit(self.cmds_store.write_file, filename, content, on_done=written,
+                           on_error=lambda e: messagebox.showerror("Error", f"Could not create {filename}: {e}"))
 
     def edit_script(self, idx):
         script = self.scripts[idx]
-        folder = USER_SCRIPTS_FOLDER
-        file_path = os.path.join(folder, script["filename"])
-
-        # Load current file content
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                current_content = f.read()
-        except Exception as e:
-            current_content = f"Error loading file: {e}"
 
         # Popup for editing file content
         popup = tk.Toplevel(self)
@@ -531,89 +1122,85 @@ class DashboardApp(tk.Tk):
         desc_entry.pack(fill="x", padx=5, pady=5)
         desc_entry.insert(0, script["desc"])
 
+        tk.Label(edit_frame, text="Tags (e.g. os:windows, severity:high):").pack(anchor="w")
+        tags_entry = tk.Entry(edit_frame, width=50)
+        tags_entry.pack(fill="x", padx=5, pady=5)
+        tags_entry.insert(0, ", ".join(script.get("tags", ())))
+
         content_label = tk.Label(edit_frame, text="Content:")
         content_label.pack(anchor="w")
         text_widget = tk.Text(edit_frame, wrap=tk.WORD, width=50, height=10)
         text_widget.pack(fill="both", expand=True, padx=5, pady=5)
-        text_widget.insert(tk.END, current_content)
+        # Load current file content (large files stream in chunks)
+        loader = self.load_file_into(popup, text_widget, self.scripts_store, script["filename"], before=edit_frame)
 
         def save_changes():
+            if loader.cancelled and not loader.paged:
+                messagebox.showwarning("Load Cancelled", "Loading was cancelled, so only part of the file is in the "
+                                       "editor and saving would cut it short. Reopen the editor to load it fully.",
+                                       parent=popup)
+                return
+            if not loader.done and not loader.cancelled:
+                messagebox.showwarning("Still Loading", "Wait for the file to finish loading before saving.", parent=popup)
+                return
             updated_content = text_widget.get("1.0", tk.END)
             new_desc = desc_entry.get()
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(updated_content)
+            new_tags = parse_tags(tags_entry.get())
+            # A paged file is only partly in the editor; keep its content
+            if loader.paged:
+                updated_content = None
+
+            def saved(stat):
                 # Update in self.scripts
-                script["desc"] = new_desc
-                self.refresh_scripts(folder)
+                changes = self.scripts_store.apply_stat(script["filename"], stat, desc=new_desc)
+                self.apply_changes(self.scripts_view, self.scripts_store, changes)
+                entry = self.scripts_store.by_name.get(script["filename"])
+                if entry is not None:
+                    self.set_tags(self.scripts_store.kind, script["filename"], entry, new_tags)
                 popup.destroy()
                 messagebox.showinfo("Saved", f"{script['filename']} updated successfully.")
-            except Exception as e:
+
+            def failed(e):
+                if save_btn.winfo_exists():
+                    save_btn.config(state="normal")
                 messagebox.showerror("Error", f"Could not save: {e}")
 
+            save_btn.config(state="disabled")
+            self.io.submit(self.save_with_history, self.scripts_store, script["filename"], updated_content,
+                           on_done=saved, on_error=failed)
+
         save_btn = tk.Button(popup, text="Save", command=save_changes)
         save_btn.pack(side="bottom", fill="x", pady=5)
+        tk.Button(popup, text="History...", command=lambda: self.show_revisions(
+            self.scripts_view, self.scripts_store, script["filename"])).pack(side="bottom", fill="x")
 
     def delete_script(self, idx):
         script = self.scripts[idx]
-        file_path = os.path.join(USER_SCRIPTS_FOLDER, script["filename"])
-        # Remove from disk if file exists
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not delete file: {e}")
-        # Remove from list and refresh UI
-        del self.scripts[idx]
-        self.refresh_scripts(USER_SCRIPTS_FOLDER)
+
+        def removed(stat):
+            # Remove from list and refresh only the affected rows
+            changes = self.scripts_store.apply_delete(script["filename"], stat)
+            self.apply_changes(self.scripts_view, self.scripts_store, changes)
+
+        self.io.submit(self.trash_file, self.scripts_store, script["filename"], script["desc"], on_done=removed,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not delete file: {e}"))
 
     def render_cmds(self, parent, cmds_folder):
-        for widget in self.cmds_list_frame.winfo_children():
-            widget.destroy()
-        for idx, cmd in enumerate(self.cmds):
-            desc_label = tk.Label(self.cmds_list_frame, text=cmd["desc"] + ": ", anchor="w")
-            desc_label.grid(row=idx, column=0, sticky="w", padx=5, pady=2)
-            file_label = tk.Label(self.cmds_list_frame, text=cmd["filename"], fg="blue", cursor="hand2", anchor="w")
-            file_label.grid(row=idx, column=1, sticky="w", padx=5)
-            file_label.bind("<Button-1>", lambda e, f=cmd["filename"]: self.show_cmd_content(cmds_folder, f))
-            edit_btn = tk.Button(self.cmds_list_frame, text="Edit", command=lambda i=idx: self.edit_cmd(i))
-            edit_btn.grid(row=idx, column=2, padx=5)
-            del_btn = tk.Button(self.cmds_list_frame, text="Delete", command=lambda i=idx: self.delete_cmd(i))
-            del_btn.grid(row=idx, column=3, padx=5)
+        # Rebinds only the pooled rows visible in the viewport (through the tag filter)
+        self.filter_panel(self.cmds_view, self.cmds_store)
 
     def show_cmd_content(self, folder, filename):
-        path = os.path.join(folder, filename)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except Exception as e:
-            content = f"Error loading {path}: {e}"
-        popup = tk.Toplevel(self)
-        popup.title(f"CMD: {filename}")
-        popup.geometry("500x300")
-        text_widget = scrolledtext.ScrolledText(popup, wrap=tk.WORD)
-        text_widget.pack(fill="both", expand=True)
-        text_widget.insert(tk.END, content)
-        text_widget.config(state="normal")
+        self.show_in_viewer(self.cmds_store, filename, f"CMD: {filename}")
 
     def add_cmd(self, folder):
         desc = simpledialog.askstring("Add CMD", "Enter description:", parent=self)
         filename = simpledialog.askstring("Add CMD", "Enter filename (must exist in folder):", parent=self)
-        if desc and filename and os.path.exists(os.path.join(folder, filename)):
-            self.cmds.append({"desc": desc, "filename": filename})
-            self.render_cmds(self.cmds_frame, folder)
+        if desc and filename and self.cmds_store.stat([filename])[filename] is not None:
+            changes = self.cmds_store.touch(filename, desc=desc)
+            self.apply_changes(self.cmds_view, self.cmds_store, changes)
 
     def edit_cmd(self, idx):
         cmd = self.cmds[idx]
-        folder = USER_CMDS_FOLDER
-        file_path = os.path.join(folder, cmd["filename"])
-
-        # Load current file content
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                current_content = f.read()
-        except Exception as e:
-            current_content = f"Error loading file: {e}"
 
         # Popup for editing file content (text area 100x100 px)
         popup = tk.Toplevel(self)
@@ -630,71 +1217,426 @@ class DashboardApp(tk.Tk):
         desc_entry.pack(fill="x", padx=5, pady=5)
         desc_entry.insert(0, cmd["desc"])
 
+        tk.Label(edit_frame, text="Tags (e.g. os:windows, severity:high):").pack(anchor="w")
+        tags_entry = tk.Entry(edit_frame, width=50)
+        tags_entry.pack(fill="x", padx=5, pady=5)
+        tags_entry.insert(0, ", ".join(cmd.get("tags", ())))
+
         content_label = tk.Label(edit_frame, text="Content:")
         content_label.pack(anchor="w")
         text_widget = tk.Text(edit_frame, wrap=tk.WORD, width=50, height=10)
         text_widget.pack(fill="both", expand=True, padx=5, pady=5)
-        text_widget.insert(tk.END, current_content)
+        # Load current file content (large files stream in chunks)
+        loader = self.load_file_into(popup, text_widget, self.cmds_store, cmd["filename"], before=edit_frame)
 
         def save_changes():
+            if loader.cancelled and not loader.paged:
+                messagebox.showwarning("Load Cancelled", "Loading was cancelled, so only part of the file is in the "
+                                       "editor and saving would cut it short. Reopen the editor to load it fully.",
+                                       parent=popup)
+                return
+            if not loader.done and not loader.cancelled:
+                messagebox.showwarning("Still Loading", "Wait for the file to finish loading before saving.", parent=popup)
+                return
             updated_content = text_widget.get("1.0", tk.END)
             new_desc = desc_entry.get()
-            try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(updated_content)
+            new_tags = parse_tags(tags_entry.get())
+            # A paged file is only partly in the editor; keep its content
+            if loader.paged:
+                updated_content = None
+
+            def saved(stat):
                 # Update in self.cmds
-                cmd["desc"] = new_desc
-                self.refresh_cmds(folder)
+                changes = self.cmds_store.apply_stat(cmd["filename"], stat, desc=new_desc)
+                self.apply_changes(self.cmds_view, self.cmds_store, changes)
+                entry = self.cmds_store.by_name.get(cmd["filename"])
+                if entry is not None:
+                    self.set_tags(self.cmds_store.kind, cmd["filename"], entry, new_tags)
                 popup.destroy()
                 messagebox.showinfo("Saved", f"{cmd['filename']} updated successfully.")
-            except Exception as e:
+
+            def failed(e):
+                if save_btn.winfo_exists():
+                    save_btn.config(state="normal")
                 messagebox.showerror("Error", f"Could not save: {e}")
 
+            save_btn.config(state="disabled")
+            self.io.submit(self.save_with_history, self.cmds_store, cmd["filename"], updated_content,
+                           on_done=saved, on_error=failed)
+
         save_btn = tk.Button(popup, text="Save", command=save_changes)
         save_btn.pack(side="bottom", fill="x", pady=5)
+        tk.Button(popup, text="History...", command=lambda: self.show_revisions(
+            self.cmds_view, self.cmds_store, cmd["filename"])).pack(side="bottom", fill="x")
 
     def delete_cmd(self, idx):
         cmd = self.cmds[idx]
-        file_path = os.path.join(USER_CMDS_FOLDER, cmd["filename"])
-        # Remove from disk if file exists
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not delete file: {e}")
-        # Remove from list and refresh UI
-        del self.cmds[idx]
-        self.refresh_cmds(USER_CMDS_FOLDER)
+
+        def removed(stat):
+            # Remove from list and refresh only the affected rows
+            changes = self.cmds_store.apply_delete(cmd["filename"], stat)
+            self.apply_changes(self.cmds_view, self.cmds_store, changes)
+
+        self.io.submit(self.trash_file, self.cmds_store, cmd["filename"], cmd["desc"], on_done=removed,
+                       on_error=lambda e: messagebox.showerror("Error", f"Could not delete file: {e}"))
+
+    # --- Revision history and trash ---
+    def save_with_history(self, store, filename, content, note="edit"):
+        """Write a file through ``store`` and record it as a revision (I/O pool).
+
+        The version on disk is recorded first if the history does not have
+        it yet (a file never saved here, or changed outside the dashboard),
+        so a bad save can always be undone. ``content=None`` keeps the file.
+        """
+        if content is None:
+            return store.write_file(filename, None)
+        try:
+            self.revisions.record(store.kind, filename, store.read(filename), note="on disk")
+        except FileNotFoundError:
+            pass
+        except sqlite3.Error as e:
+            print(f"Could not record the previous version of {filename}: {e}")
+        stat = store.write_file(filename, content)
+        try:
+            self.revisions.record(store.kind, filename, content, note=note)
+        except sqlite3.Error as e:
+            print(f"Could not record a revision of {filename}: {e}")
+        return stat
+
+    def trash_file(self, store, filename, desc):
+        """Move a file to the trash, then delete it (I/O pool); returns the new stat."""
+        try:
+            content = store.read(filename)
+        except FileNotFoundError:
+            content = None
+        if content is not None:
+            self.revisions.trash(store.kind, filename, content, desc)
+        return store.remove_file(filename)
+
+    def show_revisions(self, view, store, filename):
+        def restore(rev, done):
+            def run():
+                content = self.revisions.content(store.kind, filename, rev)
+                return self.save_with_history(store, filename, content, note=f"restored r{rev}")
+
+            def restored(stat):
+                self.apply_changes(view, store, store.apply_stat(filename, stat))
+                done()
+
+            self.io.submit(run, on_done=restored, name=f"Restoring {filename}")
+
+        RevisionHistoryWindow(self, self.revisions, self.io, store.kind, filename, restore)
+
+    def restore_from_trash(self, trash_id, done):
+        def run():
+            kind, filename, desc, content = self.revisions.trash_item(trash_id)
+            store = self.scripts_store if kind == "scripts" else self.cmds_store
+            # The name may have been reused since; restore beside it
+            stem, ext = os.path.splitext(filename)
+            candidate, n = filename, 1
+            while store.stat([candidate])[candidate] is not None:
+                candidate = f"{stem} (restored{'' if n == 1 else f' {n}'}){ext}"
+                n += 1
+            stat = self.save_with_history(store, candidate, content, note="restored from trash")
+            self.revisions.untrash(trash_id)
+            return kind, candidate, desc, stat
+
+        def restored(result):
+            kind, filename, desc, stat = result
+            view, store = (self.scripts_view, self.scripts_store) if kind == "scripts" else (self.cmds_view, self.cmds_store)
+            self.apply_changes(view, store, store.apply_stat(filename, stat, desc=desc or filename))
+            done()
+
+        self.io.submit(run, on_done=restored, name="Restoring from trash")
+
+    def show_cache_stats(self):
+        stats = self.content_cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = 100.0 * stats["hits"] / lookups if lookups else 0.0
+        messagebox.showinfo(
+            "Content Cache",
+            f"Hits: {stats['hits']}\n"
+            f"Misses: {stats['misses']}\n"
+            f"Evictions: {stats['evictions']}\n"
+            f"Hit rate: {hit_rate:.1f}%\n"
+            f"Entries: {stats['entries']}\n"
+            f"Size: {stats['bytes'] / 1024:.0f} KB of {stats['max_bytes'] / 1024:.0f} KB",
+        )
+
+    # --- Library import/export ---
+    def export_library(self):
+        """Stream every script and CMD (with its description) to an NDJSON file."""
+        path = filedialog.asksaveasfilename(defaultextension=".ndjson", initialfile="tse-library.ndjson",
+                                            filetypes=[("NDJSON", "*.ndjson"), ("All files", "*.*")])
+        if not path:
+            return
+        stores = (self.scripts_store, self.cmds_store)
+        descs = {(store.kind, entry["filename"]): entry["desc"] for store in stores for entry in store.entries}
+
+        def export():
+            with open(path + ".tmp", "w", encoding="utf-8") as out:
+                count = sum(write_ndjson(out, store.records(), descs) for store in stores)
+            os.replace(path + ".tmp", path)
+            return count
+
+        self.io.submit(export, name="Exporting library",
+                       on_done=lambda count: messagebox.showinfo("Export", f"Exported {count} files to:\n{path}"),
+                       on_error=lambda e: messagebox.showerror("Export", f"Export failed: {e}"))
+
+    def import_library(self):
+        """Stream an NDJSON export into the current storage; files with the same name are replaced."""
+        path = filedialog.askopenfilename(filetypes=[("NDJSON", "*.ndjson"), ("All files", "*.*")])
+        if not path:
+            return
+        descs = []
+        stores = ((self.scripts_store, self.scripts_view), (self.cmds_store, self.cmds_view))
+
+        def run():
+            with open(path, "r", encoding="utf-8") as lines:
+                records = read_ndjson(lines, on_desc=lambda kind, filename, desc: descs.append((kind, filename, desc)))
+                if self.pack is not None:
+                    count = self.pack.import_records(records)
+                else:
+                    count = write_folder_records(records, {"scripts": USER_SCRIPTS_FOLDER, "cmds": USER_CMDS_FOLDER})
+            return count, {store.kind: store.scan() for store, _view in stores}
+
+        def imported(result):
+            count, snapshots = result
+            for store, view in stores:
+                changes = store.apply_snapshot(snapshots[store.kind])
+                described = []
+                for kind, filename, desc in descs:
+                    if kind == store.kind and filename in store.by_name:
+                        store.by_name[filename]["desc"] = desc
+                        self.metadata.set_desc(kind, filename, desc)
+                        described.append(filename)
+                self.apply_changes(view, store, Changes(changes.added, changes.removed, changes.changed + described))
+            messagebox.showinfo("Import", f"Imported {count} files from:\n{path}")
+
+        self.io.submit(run, name="Importing library", on_done=imported,
+                       on_error=lambda e: messagebox.showerror("Import", f"Import failed: {e}"))
+
+    # --- Team library sync ---
+    def choose_team_library(self):
+        folder = filedialog.askdirectory(title="Shared team library folder")
+        if folder:
+            self.metadata.set_setting("team_library", folder)
+            self.sync_team_library(manual=True)
+
+    def sync_team_library(self, manual=False):
+        """Pull changed files from the team library on the I/O pool, then schedule the next sync."""
+        if self.pack is not None:
+            if manual:
+                messagebox.showinfo("Team Library", "Team library sync works with the folder storage only.")
+            return
+        if self._team_sync_job is not None:
+            self.after_cancel(self._team_sync_job)
+            self._team_sync_job = None
+        if self._team_sync_running:
+            return
+        self._team_sync_running = True
+
+        def run():
+            shared = TEAM_LIBRARY or self.metadata.get_setting("team_library")
+            if not shared:
+                return None
+            if self.team_sync is None or self.team_sync.shared_dir != shared:
+                self.team_sync = TeamSync(shared, {
+                    "scripts": ("scripts_folder", USER_SCRIPTS_FOLDER),
+                    "cmds": ("cmds_folder", USER_CMDS_FOLDER),
+                }, TEAM_SYNC_MANIFEST)
+            return self.team_sync.run()
+
+        def finished():
+            self._team_sync_running = False
+            self._team_sync_job = self.after(TEAM_SYNC_INTERVAL_MS, self.sync_team_library)
+
+        def done(report):
+            finished()
+            if report is None:
+                if manual:
+                    messagebox.showinfo("Team Library", "Choose the shared folder first (Tools > Team Library Folder).")
+                return
+            for kind in report.changed_kinds():
+                self.refresh_scripts() if kind == "scripts" else self.refresh_cmds()
+            if manual or report.conflicts or report.errors:
+                message = f"Team library sync: {report.summary()}."
+                conflicts = [name for names in report.conflicts.values() for name in names]
+                if conflicts:
+                    message += "\n\nYou edited these files; the team's version was saved beside them:\n"
+                    message += "\n".join(conflicts[:20])
+                messagebox.showinfo("Team Library", message)
+
+        def failed(e):
+            finished()
+            if manual:
+                messagebox.showerror("Team Library", f"Sync failed: {e}")
+            else:
+                print(f"Team library sync failed: {e}")
+
+        self.io.submit(run, on_done=done, on_error=failed, name="Syncing team library")
+
+    # --- Startup pipeline: first paint -> seed -> scan -> render -> idle ---
+    def start_loading(self):
+        STARTUP.mark("first paint")
+        STARTUP.begin("seed")
+        install_dir = os.path.dirname(__file__)
+
+        def seed():
+            if self.pack is not None:
+                for kind, folder in (("scripts", USER_SCRIPTS_FOLDER), ("cmds", USER_CMDS_FOLDER)):
+                    # The first start with the pack backend imports the user folders
+                    if not self.pack.count(kind):
+                        self.pack.import_records(folder_records(kind, folder))
+                    self.pack.import_records(
+                        folder_records(kind, os.path.join(install_dir, f"{kind}_folder")), replace=False)
+                return
+            # Copy boilerplate scripts and cmds to the user folders if not present
+            seed_folder(os.path.join(install_dir, "scripts_folder"), USER_SCRIPTS_FOLDER)
+            seed_folder(os.path.join(install_dir, "cmds_folder"), USER_CMDS_FOLDER)
+
+        def seeded(_result):
+            STARTUP.end("seed")
+            self.load_data()
+
+        def seed_failed(e):
+            print(f"Could not copy boilerplate files: {e}")
+            seeded(None)
+
+        self.io.submit(seed, on_done=seeded, on_error=seed_failed)
+        self.notes_autosave.restore()
 
     def load_data(self):
-        """Load scripts and cmds data from JSON files."""
-        for key, file_path in DATA_FILES.items():
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, "r") as f:
-                        data = json.load(f)
-                        if key == "scripts":
-                            self.scripts = data
-                            self.render_scripts(self.scripts_frame, USER_SCRIPTS_FOLDER)
-                        elif key == "cmds":
-                            self.cmds = data
-                            self.render_cmds(self.cmds_frame, USER_CMDS_FOLDER)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not load {key} data: {e}")
+        """Load scripts and cmds data and list both folders, then render once.
+
+        The metadata store and folder listings are read on the I/O pool.
+        """
+        STARTUP.begin("scan")
+        self.io.submit(read_library_data, self.metadata, (self.scripts_store, self.cmds_store),
+                       on_done=self.apply_loaded_data)
+
+    def apply_loaded_data(self, result):
+        data, errors, snapshots, links, link_status, usage, sort_by_use = result
+        STARTUP.end("scan")
+        STARTUP.begin("render")
+        for key, error in errors.items():
+            messagebox.showerror("Error", f"Could not load {key} data: {error}")
+        for store in (self.scripts_store, self.cmds_store):
+            store.load(data.get(store.kind, []), snapshots[store.kind])
+            for entry in store.entries:
+                self.index_palette_entry(store.kind, entry)
+            self.rebuild_tag_index(store)
+            ranking = self.rankings[store.kind]
+            ranking.usage = usage.get(store.kind, {})
+            self.sort_by_use[store.kind].set(sort_by_use[store.kind])
+            if sort_by_use[store.kind]:
+                ranking.rebuild([entry["filename"] for entry in store.entries])
+        self.render_scripts(self.scripts_frame, USER_SCRIPTS_FOLDER)
+        self.render_cmds(self.cmds_frame, USER_CMDS_FOLDER)
+        self.links[:] = links
+        self.tag_indexes["links"].rebuild((link["id"], link.get("tags", ())) for link in links)
+        self.link_checker.load(link_status)
+        self.render_links()
+        self.update_facet_counts()
+        STARTUP.end("render")
+        if self.pack is None:
+            self.watcher.start()
+        # Index whatever changed since the last run (reads only changed files)
+        self.update_search_index()
+        # Recheck only links whose cached result is older than the TTL
+        self.check_links()
+        self.sync_team_library()
+        self.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        STARTUP.mark("first idle")
+        if PRINT_STARTUP_TIMINGS:
+            print(STARTUP.report())
+        if tracing.TRACER is not None:
+            SlowestHandlersOverlay(self, tracing.TRACER)
+        self.loaded = True
+        for request in self.pending_launch_requests:
+            self.handle_launch_request(request)
+        self.pending_launch_requests = []
+
+    def handle_launch_request(self, request):
+        """Act on a request forwarded by a later launch (see single_instance.py)."""
+        # Raise the window; briefly topmost so the window manager lets it come forward
+        self.deiconify()
+        self.lift()
+        self.attributes("-topmost", True)
+        self.after_idle(self.attributes, "-topmost", False)
+        self.focus_force()
+        action = request.get("action")
+        if action == "search":
+            self.search_var.set(request.get("query", ""))
+            self.search_entry.focus_set()
+            self.search_entry.icursor(tk.END)
+        elif action == "open":
+            if not self.loaded:
+                self.pending_launch_requests.append(request)
+                return
+            kind, filename = request.get("kind"), request.get("filename")
+            store = self.scripts_store if kind == "scripts" else self.cmds_store if kind == "cmds" else None
+            if store is None or filename not in store.by_name:
+                messagebox.showerror("Error", f"No such {kind or 'snippet'}: {filename}")
+                return
+            self.palette_open(kind, filename, None)
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="trace.json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            self.io.submit(tracing.TRACER.export, path, name="Exporting trace",
+                           on_done=lambda _: messagebox.showinfo("Trace", f"Trace written to:\n{path}"))
 
     def save_data(self):
-        """Save scripts and cmds data to JSON files."""
-        for key, file_path in DATA_FILES.items():
-            try:
-                data = self.scripts if key == "scripts" else self.cmds
-                with open(file_path, "w") as f:
-                    json.dump(data, f, indent=4)
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not save {key} data: {e}")
+        """Flush queued metadata and run history writes; every edit was already persisted."""
+        self.metadata.close()
+        self.history.close()
+        self.revisions.close()
+        if self.pack is not None:
+            self.pack.close()
+
+    def on_close(self):
+        # Write the last notes snapshot now; the I/O pool shuts down after mainloop
+        self.notes_autosave.close()
+        self.closed = True
+        self.destroy()
+
+    def report_io_error(self, name, exc):
+        if self.closed:
+            print(f"{name} failed: {exc}")  # no window left to show it in
+            return
+        messagebox.showerror("Error", f"{name} failed: {exc}")
 
 
 if __name__ == "__main__":
+    if TRACE_ENABLED:
+        tracing.enable(STALL_THRESHOLD_MS)  # before any widget registers a callback
     app = DashboardApp()
-    app.load_data()  # Load data at startup
-    app.mainloop()
-    app.save_data()  # Save data on exit
\ No newline at end of file
+    app.mainloop()  # Data is loaded by the startup pipeline once the window is up
+    app.closed = True
+    try:
+        if app.instance_server is not None:
+            app.instance_server.stop()
+        app.watcher.stop()
+        app.runner.shutdown()
+        app.link_checker.shutdown()
+        app.log_viewer.close()
+        log_index.shutdown_pool()
+        for window in app.batch_windows:
+            window.shutdown()
+        app.index_updater.stop()
+        app.io.shutdown(wait=True)
+        app.ui_queue.drain()  # Apply results of the final file writes
+    finally:
+        try:
+            app.save_data()  # Flush pending metadata writes
+        finally:
+            if tracing.TRACER is not None:
+                tracing.TRACER.stop()
+                tracing.TRACER.export(TRACE_FILE)
+                print(tracing.TRACER.report())
+                print(f"Trace written to {TRACE_FILE} (open it in chrome://tracing or ui.perfetto.dev)")
+            app.ui_queue.drain()  # Report any errors from them
\ No newline at end of file
@@ -0,0 +1,126 @@
+import os
+import time
+
+from library import atomic_write
+
+
+class TextAutosave:
+    """Snapshots a Text widget to ``path`` in the background.
+
+    The widget's modified flag signals edits: each ``<<Modified>>`` records
+    the time and clears the flag so the next edit fires again. A snapshot is
+    taken once typing pauses for ``delay_ms`` (or at least every
+    ``max_delay_ms`` while it goes on), and an unchanged buffer is never
+    written. Snapshots are written atomically on the I/O pool, one at a time.
+    """
+
+    def __init__(self, text_widget, path, io, delay_ms=1500, max_delay_ms=10000):
+        self.text = text_widget
+        self.path = path
+        self.io = io
+        self.delay_ms = delay_ms
+        self.max_delay_ms = max_delay_ms
+        self._job = None
+        self._first_edit = None
+        self._last_edit = None
+        self._writing = None  # future of the write in progress
+        self._queued = None  # latest snapshot waiting for the current write
+        self._closed = False
+        text_widget.bind("<<Modified>>", self._on_modified, add="+")
+
+    def restore(self, on_done=None):
+        """Load the last snapshot into the widget if it is still empty."""
+        def read():
+            if not os.path.exists(self.path):
+                return None
+            with open(self.path, "r", encoding="utf-8") as f:
+                return f.read()
+
+        def loaded(content):
+            if content and self.text.winfo_exists() and not self.text.get("1.0", "end-1c"):
+                self.text.insert("1.0", content)
+                self.text.edit_modified(False)
+                self._first_edit = self._last_edit = None
+                if self._job is not None:
+                    self.text.after_cancel(self._job)
+                    self._job = None
+            if on_done is not None:
+                on_done(content)
+
+        self.io.submit(read, on_done=loaded, name="Restoring notes")
+
+    def _on_modified(self, event=None):
+        if not self.text.edit_modified():
+            return  # the flag was just cleared
+        self.text.edit_modified(False)
+        now = time.monotonic()
+        self._last_edit = now
+        if self._first_edit is None:
+            self._first_edit = now
+        if self._job is None:
+            self._job = self.text.after(self.delay_ms, self._tick)
+
+    def _tick(self):
+        self._job = None
+        if self._first_edit is None:
+            return
+        now = time.monotonic()
+        idle_ms = (now - self._last_edit) * 1000
+        pending_ms = (now - self._first_edit) * 1000
+        if idle_ms < self.delay_ms and pending_ms < self.max_delay_ms:
+            wait = min(self.delay_ms - idle_ms, self.max_delay_ms - pending_ms)
+            self._job = self.text.after(max(1, int(wait)), self._tick)
+            return
+        self.flush()
+
+    def flush(self):
+        """Snapshot now if there are unsaved edits (e.g. before closing)."""
+        if self._job is not None:
+            self.text.after_cancel(self._job)
+            self._job = None
+        if self._first_edit is None or not self.text.winfo_exists():
+            return
+        self._first_edit = self._last_edit = None
+        self._write(self.text.get("1.0", "end-1c"))
+
+    def close(self):
+        """Write the last snapshot synchronously; call before the I/O pool shuts down.
+
+        Waits for a write in progress, then writes whatever is newer on this
+        thread, so nothing is left for the pool after it is gone.
+        """
+        if self._job is not None:
+            self.text.after_cancel(self._job)
+            self._job = None
+        content, self._queued = self._queued, None
+        if self._first_edit is not None and self.text.winfo_exists():
+            content = self.text.get("1.0", "end-1c")
+        self._first_edit = self._last_edit = None
+        self._closed = True
+        if self._writing is not None:
+            self._writing.exception()  # wait; a failure is reported by its callback
+        if content is not None:
+            try:
+                atomic_write(self.path, content)
+            except OSError as e:
+                print(f"Notes autosave failed: {e}")
+
+    def _write(self, content):
+        if self._closed:
+            return
+        if self._writing is not None:
+            self._queued = content
+            return
+
+        def finished(_result=None):
+            self._writing = None
+            queued, self._queued = self._queued, None
+            if queued is not None:
+                self._write(queued)
+
+        def failed(e):
+            print(f"Notes autosave failed: {e}")
+            finished()
+
+        self._writing = self.io.submit(atomic_write, self.path, content, on_done=finished, on_error=failed,
+                                       name="Saving notes")
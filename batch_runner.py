@@ -0,0 +1,156 @@
+import collections
+import time
+
+from command_runner import CommandRunner
+
+
+def parse_dependencies(text):
+    """Return the CMD filenames named on ``# after: a.txt, b.txt`` lines."""
+    deps = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.lower().startswith("# after:"):
+            deps.extend(name.strip() for name in line.split(":", 1)[1].split(",") if name.strip())
+    return deps
+
+
+class BatchJob:
+    """One command in a ``BatchRun``. ``status`` is ``pending``, ``skipped``
+    or the status of its ``CommandRun``."""
+
+    def __init__(self, name, command, deps=(), max_lines=2000):
+        self.name = name
+        self.command = command
+        self.deps = list(deps)
+        self.run = None
+        self.status = "pending"
+        self.reason = ""
+        self.output_bytes = 0
+        self.output = collections.deque(maxlen=max_lines)
+
+    @property
+    def finished(self):
+        return self.status not in ("pending", "queued", "running")
+
+    @property
+    def duration(self):
+        return self.run.duration if self.run is not None else 0.0
+
+    @property
+    def returncode(self):
+        return self.run.returncode if self.run is not None else None
+
+
+class BatchRun:
+    """Runs several ``BatchJob`` s on a pool of ``parallelism`` processes.
+
+    A job starts once every job it depends on (``deps`` naming other jobs in
+    the batch) has finished with exit code 0; if one of them fails, or the
+    dependencies form a cycle, the job is skipped. Independent jobs run side
+    by side, so the batch takes about as long as its slowest chain.
+    ``on_update(job)`` and ``on_done(batch)`` are called on the Tk thread;
+    ``on_finish`` is passed on to the ``CommandRunner``.
+    """
+
+    def __init__(self, ui_queue, jobs, parallelism=4, timeout=None, on_update=None, on_done=None,
+                 on_finish=None):
+        self.jobs = jobs
+        self.by_name = {job.name: job for job in jobs}
+        self.runner = CommandRunner(ui_queue, max_concurrent=parallelism, default_timeout=timeout,
+                                    on_finish=on_finish)
+        self.on_update = on_update or (lambda job: None)
+        self.on_done = on_done or (lambda batch: None)
+        self.started = None
+        self.ended = None
+        for job in jobs:
+            job.deps = [dep for dep in job.deps if dep in self.by_name and dep != job.name]
+
+    def start(self):
+        self.started = time.time()
+        self._skip_cycles()
+        self._schedule()
+
+    def cancel(self):
+        for job in self.jobs:
+            if job.status == "pending":
+                self._skip(job, "cancelled")
+        for job in self.jobs:
+            if job.run is not None and not job.run.finished:
+                self.runner.cancel(job.run)
+
+    def shutdown(self):
+        for job in self.jobs:
+            if job.status == "pending":
+                job.status = "skipped"
+        self.runner.shutdown()
+
+    @property
+    def finished(self):
+        return all(job.finished for job in self.jobs)
+
+    def summary(self):
+        counts = collections.Counter(job.status for job in self.jobs)
+        wall = ((self.ended or time.time()) - self.started) if self.started else 0.0
+        total = sum(job.duration for job in self.jobs)
+        parts = [f"{counts[status]} {status}" for status in sorted(counts)]
+        return f"{', '.join(parts)} - wall {wall:.1f}s, sum of commands {total:.1f}s"
+
+    # --- Scheduling (Tk thread) ---
+    def _skip_cycles(self):
+        # Kahn's algorithm; whatever is never freed sits on or behind a cycle
+        waiting = {job.name: len(job.deps) for job in self.jobs}
+        dependents = collections.defaultdict(list)
+        for job in self.jobs:
+            for dep in job.deps:
+                dependents[dep].append(job.name)
+        ready = [name for name, count in waiting.items() if count == 0]
+        while ready:
+            name = ready.pop()
+            for other in dependents[name]:
+                waiting[other] -= 1
+                if waiting[other] == 0:
+                    ready.append(other)
+        for name, count in waiting.items():
+            if count:
+                self._skip(self.by_name[name], "dependency cycle")
+
+    def _skip(self, job, reason):
+        job.status = "skipped"
+        job.reason = reason
+        self.on_update(job)
+
+    def _schedule(self):
+        progress = True
+        while progress:  # a skip can unblock (skip) jobs earlier in the list
+            progress = False
+            for job in self.jobs:
+                if job.status != "pending":
+                    continue
+                deps = [self.by_name[dep] for dep in job.deps]
+                failed = [dep.name for dep in deps if dep.finished and dep.status != "done"]
+                if failed:
+                    self._skip(job, f"{failed[0]} did not succeed")
+                    progress = True
+                elif all(dep.status == "done" for dep in deps):
+                    job.run = self.runner.run(job.name, job.command, on_output=self._output, on_exit=self._exit)
+                    job.status = job.run.status
+                    self.on_update(job)
+        if self.finished and self.ended is None:
+            self.ended = time.time()
+            self.on_done(self)
+
+    def _output(self, run, lines):
+        job = self.by_name[run.name]
+        job.status = run.status
+        for stream, line in lines:
+            job.output_bytes += len(line.encode("utf-8", "replace"))
+            job.output.append((stream, line))
+        self.on_update(job)
+
+    def _exit(self, run):
+        job = self.by_name[run.name]
+        job.status = run.status
+        if run.error is not None:
+            job.reason = str(run.error)
+        self.on_update(job)
+        self._schedule()
@@ -0,0 +1,145 @@
+import tkinter as tk
+from tkinter import scrolledtext, ttk
+
+from batch_runner import BatchRun
+
+# How often running rows (status, wall time) are refreshed
+REFRESH_MS = 250
+
+
+def _size(n):
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+class BatchWindow(tk.Toplevel):
+    """Runs a batch of saved CMDs and shows a live status table.
+
+    One row per command with status, exit code, wall time and output size;
+    double-click a row to see its output. Parallelism can be changed until
+    the batch is started.
+    """
+
+    COLUMNS = (("status", "Status", 160), ("exit", "Exit", 50), ("time", "Time", 70), ("output", "Output", 80))
+
+    def __init__(self, parent, ui_queue, jobs, parallelism=4, timeout=None, on_finish=None):
+        super().__init__(parent)
+        self.title(f"Batch: {len(jobs)} CMDs")
+        self.geometry("650x350")
+        self.ui_queue = ui_queue
+        self.jobs = jobs
+        self.timeout = timeout
+        self.on_finish = on_finish
+        self.batch = None
+        self._job = None
+
+        bar = tk.Frame(self)
+        bar.pack(side="top", fill="x", padx=5, pady=5)
+        tk.Label(bar, text="Parallel:").pack(side="left")
+        self.parallel_var = tk.IntVar(value=parallelism)
+        self.parallel_box = tk.Spinbox(bar, from_=1, to=32, width=4, textvariable=self.parallel_var)
+        self.parallel_box.pack(side="left", padx=5)
+        self.start_btn = tk.Button(bar, text="Start", command=self.start)
+        self.start_btn.pack(side="left", padx=5)
+        self.cancel_btn = tk.Button(bar, text="Cancel", command=self.cancel, state="disabled")
+        self.cancel_btn.pack(side="left", padx=5)
+        self.summary = tk.Label(bar, anchor="w")
+        self.summary.pack(side="left", fill="x", expand=True, padx=5)
+
+        self.table = ttk.Treeview(self, columns=[c[0] for c in self.COLUMNS])
+        self.table.heading("#0", text="CMD")
+        self.table.column("#0", width=220)
+        for name, heading, width in self.COLUMNS:
+            self.table.heading(name, text=heading)
+            self.table.column(name, width=width, anchor="w" if name == "status" else "e")
+        scrollbar = tk.Scrollbar(self, orient="vertical", command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.table.pack(fill="both", expand=True)
+        self.table.bind("<Double-Button-1>", lambda e: self.show_output())
+        for index, job in enumerate(jobs):
+            self.table.insert("", "end", iid=str(index), text=job.name)
+            self.update_row(job)
+
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    def start(self):
+        try:
+            parallelism = max(1, int(self.parallel_var.get()))
+        except (tk.TclError, ValueError):
+            parallelism = 1
+        self.batch = BatchRun(self.ui_queue, self.jobs, parallelism=parallelism, timeout=self.timeout,
+                              on_update=self.update_row, on_done=self.finished, on_finish=self.on_finish)
+        self.start_btn.config(state="disabled")
+        self.parallel_box.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.batch.start()
+        if not self.batch.finished:
+            self._job = self.after(REFRESH_MS, self._tick)
+
+    def cancel(self):
+        if self.batch is not None:
+            self.batch.cancel()
+
+    def close(self):
+        # Closing the window stops the batch
+        if self.batch is not None and not self.batch.finished:
+            self.batch.cancel()
+        if self._job is not None:
+            self.after_cancel(self._job)
+        self.destroy()
+
+    def shutdown(self):
+        if self.batch is not None:
+            self.batch.shutdown()
+
+    # --- Table ---
+    def update_row(self, job):
+        if not self.winfo_exists():
+            return
+        status = job.run.status if job.run is not None and not job.finished else job.status
+        if job.reason:
+            status = f"{status} ({job.reason})"
+        self.table.item(str(self.jobs.index(job)), values=(
+            status,
+            "" if job.returncode is None else job.returncode,
+            f"{job.duration:.1f}s" if job.run is not None else "",
+            _size(job.output_bytes),
+        ))
+
+    def _tick(self):
+        self._job = None
+        for job in self.jobs:
+            if job.run is not None and not job.finished:
+                self.update_row(job)
+        self.summary.config(text=self.batch.summary())
+        if not self.batch.finished:
+            self._job = self.after(REFRESH_MS, self._tick)
+
+    def finished(self, batch):
+        if not self.winfo_exists():
+            return
+        for job in self.jobs:
+            self.update_row(job)
+        self.summary.config(text=batch.summary())
+        self.cancel_btn.config(state="disabled")
+
+    def show_output(self):
+        selected = self.table.selection()
+        if not selected:
+            return
+        job = self.jobs[int(selected[0])]
+        popup = tk.Toplevel(self)
+        popup.title(f"Output: {job.name}")
+        popup.geometry("600x300")
+        text = scrolledtext.ScrolledText(popup, wrap=tk.NONE)
+        text.pack(fill="both", expand=True)
+        text.tag_configure("stderr", foreground="red")
+        text.insert(tk.END, f"> {job.command}\n")
+        for stream, line in job.output:
+            text.insert(tk.END, line if line.endswith("\n") else line + "\n",
+                        "stderr" if stream == "stderr" else ())
+        text.config(state="disabled")
@@ -0,0 +1,99 @@
+"""Single-instance handoff latency.
+
+Starts an ``InstanceServer`` in this process as a stand-in for a running
+dashboard, then measures the request round trip in-process and the wall
+time of real second launches (``python app.py --search ...``) from process
+start to exit. An empty interpreter launch is timed as the floor. Exits
+non-zero if a request is lost or the handoff misses its targets.
+
+    python benchmarks/bench_handoff.py [--calls 200] [--launches 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from single_instance import InstanceServer, hand_off  # noqa: E402
+
+ROUND_TRIP_TARGET = 0.02  # seconds, p50 in-process
+LAUNCH_OVERHEAD_TARGET = 0.15  # seconds, p50 launch-to-exit above the bare interpreter
+
+
+def launch_times(args, env, count):
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, env=env, cwd=ROOT, check=True, timeout=30,
+                       stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def ms(seconds):
+    return f"{seconds * 1000:.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200, help="in-process handoffs")
+    parser.add_argument("--launches", type=int, default=20, help="second launches of app.py")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "instance.json")
+        received = []
+        server = InstanceServer(received.append, path)
+        server.start()
+        try:
+            round_trips = []
+            for i in range(args.calls):
+                elapsed = hand_off({"action": "search", "query": f"q{i}"}, path)
+                if elapsed is None:
+                    failures.append(f"handoff {i} was not accepted")
+                    break
+                round_trips.append(elapsed)
+            if round_trips:
+                p50 = statistics.median(round_trips)
+                print(f"in-process round trip: p50 {ms(p50)}, max {ms(max(round_trips))} over {len(round_trips)} calls")
+                if p50 > ROUND_TRIP_TARGET:
+                    failures.append(f"round trip p50 {ms(p50)} (target {ms(ROUND_TRIP_TARGET)})")
+
+            env = dict(os.environ, TSE_INSTANCE_FILE=path, TSE_SINGLE_INSTANCE="1")
+            floor = launch_times(["-c", "pass"], env, args.launches)
+            before = len(received)
+            launches = launch_times(["app.py", "--search", "user groups"], env, args.launches)
+            overhead = statistics.median(launches) - statistics.median(floor)
+            print(f"second launch of app.py: p50 {ms(statistics.median(launches))} to exit "
+                  f"(bare interpreter {ms(statistics.median(floor))}, overhead {ms(overhead)})")
+            forwarded = received[before:]
+            if len(forwarded) != args.launches or any(r != {"action": "search", "query": "user groups"}
+                                                      for r in forwarded):
+                failures.append(f"{len(forwarded)} of {args.launches} launches were forwarded intact")
+            if overhead > LAUNCH_OVERHEAD_TARGET:
+                failures.append(f"launch overhead {ms(overhead)} (target {ms(LAUNCH_OVERHEAD_TARGET)})")
+
+            if hand_off({"action": "focus"}, path + ".missing") is not None:
+                failures.append("handoff succeeded without an instance file")
+        finally:
+            server.stop()
+        if os.path.exists(path):
+            failures.append("instance file left behind after stop()")
+        if hand_off({"action": "focus"}, path) is not None:
+            failures.append("handoff succeeded after the instance stopped")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: launches were handed off to the running instance")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Event-loop stall check for the background I/O service.
+
+Runs a 10 ms heartbeat on the Tk event loop while artificially slow I/O
+(``time.sleep`` inside the operation) is in flight, first synchronously on the
+Tk thread as the dashboard used to, then through ``IOService``. Reports the
+worst gap between heartbeats and exits non-zero if the I/O service lets the
+loop stall. Needs a display (or a virtual one such as Xvfb).
+
+    python benchmarks/bench_io_stall.py [--ops 8] [--delay 0.25]
+"""
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io_service import IOService  # noqa: E402
+from ui_queue import UIQueue  # noqa: E402
+
+HEARTBEAT_MS = 10
+STALL_LIMIT = 0.1  # A gap this long would be a visible UI freeze
+
+
+class Heartbeat:
+    def __init__(self, root):
+        self.root = root
+        self.last = time.perf_counter()
+        self.worst = 0.0
+        self.beats = 0
+        self._job = root.after(HEARTBEAT_MS, self._beat)
+
+    def _beat(self):
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self.last)
+        self.last = now
+        self.beats += 1
+        self._job = self.root.after(HEARTBEAT_MS, self._beat)
+
+    def stop(self):
+        self.root.after_cancel(self._job)
+
+
+def slow_write(delay):
+    time.sleep(delay)
+    return delay
+
+
+def run_sync(root, ops, delay):
+    beat = Heartbeat(root)
+
+    def work():
+        for _ in range(ops):
+            slow_write(delay)
+        root.after(HEARTBEAT_MS * 3, root.quit)
+
+    root.after(HEARTBEAT_MS * 3, work)
+    root.mainloop()
+    beat.stop()
+    return beat
+
+
+def run_async(root, ops, delay):
+    ui_queue = UIQueue(root, interval_ms=5)
+    ui_queue.start()
+    io = IOService(ui_queue, max_workers=4)
+    beat = Heartbeat(root)
+    done = []
+
+    def finished(result):
+        done.append(result)
+        if len(done) == ops:
+            root.after(HEARTBEAT_MS * 3, root.quit)
+
+    def start():
+        for _ in range(ops):
+            io.submit(slow_write, delay, on_done=finished)
+
+    root.after(HEARTBEAT_MS * 3, start)
+    root.mainloop()
+    beat.stop()
+    ui_queue.stop()
+    io.shutdown()
+    return beat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.25, help="seconds each I/O operation takes")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available, skipping stall check: {e}")
+        return 0
+    root.withdraw()
+
+    sync = run_sync(root, args.ops, args.delay)
+    print(f"synchronous:  worst heartbeat gap {sync.worst * 1000:7.1f} ms over {sync.beats} beats")
+    background = run_async(root, args.ops, args.delay)
+    print(f"I/O service:  worst heartbeat gap {background.worst * 1000:7.1f} ms over {background.beats} beats")
+    root.destroy()
+
+    if background.worst > STALL_LIMIT:
+        print(f"FAIL: event loop stalled for more than {STALL_LIMIT * 1000:.0f} ms")
+        return 1
+    print("OK: event loop kept servicing events while I/O was in flight")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Headless benchmark suite for the script/CMD library.
+
+Builds synthetic libraries (1k, 10k and 100k files by default) and drives the
+same ``LibraryStore``/``MetadataStore``/search code the dashboard uses,
+without a display. Reports latency and throughput for scanning, refreshing,
+loading and saving metadata, single-file CRUD and search. With ``--render``
+the ``bench_render.py`` widget benchmark runs too, under ``xvfb-run`` when no
+display is set (skipped if neither is available).
+
+    python benchmarks/bench_library.py [--sizes 1000,10000,100000] [--render]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import search_index  # noqa: E402
+from library import LibraryStore, read_library  # noqa: E402
+from metadata_store import MetadataStore  # noqa: E402
+from synthetic_library import make_library  # noqa: E402
+
+QUERIES = ["sel", "network", "log err", "tcp host disk"]
+CRUD_OPS = 200
+EDITS = 1000
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.median(samples) * 1000, p95 * 1000
+
+
+def report(name, seconds, items=None):
+    rate = f"{items / seconds:>12,.0f}/s" if items and seconds else ""
+    print(f"  {name:<28} {seconds * 1000:>10.1f} ms {rate}")
+
+
+def report_latency(name, samples):
+    p50, p95 = percentiles(samples)
+    print(f"  {name:<28} p50 {p50:>7.3f} ms   p95 {p95:>7.3f} ms   ({len(samples)} ops)")
+
+
+def write_legacy_json(root, stores):
+    """Descriptions in the pre-SQLite JSON format, for the import benchmark."""
+    data_files = {}
+    for store in stores:
+        path = os.path.join(root, f"{store.kind}_data.json")
+        entries = [{"desc": f"Snippet {name}", "filename": name} for name in store.scan()]
+        with open(path, "w") as f:
+            json.dump(entries, f)
+        data_files[store.kind] = path
+    return data_files
+
+
+def bench_size(root, n_files, words):
+    print(f"\n{n_files:,} files")
+    start = time.perf_counter()
+    scripts_folder, cmds_folder = make_library(root, n_files, words_per_file=words)
+    print(f"  (generated in {time.perf_counter() - start:.1f}s)")
+
+    metadata = MetadataStore(os.path.join(root, "metadata.sqlite3"))
+    stores = [LibraryStore("scripts", scripts_folder, metadata),
+              LibraryStore("cmds", cmds_folder, metadata, default_desc="No description")]
+    data_files = write_legacy_json(root, stores)
+
+    # --- Scan and load ---
+    _, seconds = timed(lambda: [store.scan() for store in stores])
+    report("scan", seconds, n_files)
+    (data, _errors, snapshots), seconds = timed(read_library, metadata, stores, data_files)
+    report("load (first run, JSON import)", seconds, n_files)
+    (data, _errors, snapshots), seconds = timed(read_library, metadata, stores, data_files)
+    report("load (metadata + scan)", seconds, n_files)
+    _, seconds = timed(lambda: [s.load(data.get(s.kind, []), snapshots[s.kind]) for s in stores])
+    report("apply loaded entries", seconds, n_files)
+
+    # --- Refresh ---
+    _, seconds = timed(lambda: [store.refresh() for store in stores])
+    report("refresh (no changes)", seconds, n_files)
+    store = stores[0]
+    changed = list(store.by_name)[:max(1, n_files // 200)]
+    for filename in changed:
+        with open(store.path(filename), "a", encoding="utf-8") as f:
+            f.write(" edited")
+    changes, seconds = timed(store.refresh)
+    report(f"refresh ({len(changes.changed)} changed)", seconds, n_files // 2)
+    samples = []
+    for filename in changed[:CRUD_OPS]:
+        _, seconds = timed(lambda f=filename: store.apply_stats(store.stat([f])))
+        samples.append(seconds)
+    report_latency("watcher single-file update", samples)
+
+    # --- Save (per-edit metadata writes) ---
+    names = list(store.by_name)
+    samples = []
+    for i in range(min(CRUD_OPS, len(names))):
+        _, seconds = timed(lambda: metadata.set_desc(store.kind, names[i], f"edited {i}").result())
+        samples.append(seconds)
+    report_latency("description save (durable)", samples)
+    start = time.perf_counter()
+    futures = [metadata.set_desc(store.kind, names[i % len(names)], f"bulk {i}") for i in range(EDITS)]
+    futures[-1].result()
+    report(f"{EDITS} queued description saves", time.perf_counter() - start, EDITS)
+
+    # --- CRUD ---
+    for op in ("create", "update", "delete"):
+        samples = []
+        for i in range(CRUD_OPS):
+            filename = f"bench-crud-{i:04d}.txt"
+            start = time.perf_counter()
+            if op == "delete":
+                store.delete(filename)
+            else:
+                getattr(store, op)(filename, f"{op} body {i}", f"{op} {i}")
+            samples.append(time.perf_counter() - start)
+        report_latency(op, samples)
+
+    # --- Search ---
+    index_path = os.path.join(root, "search_index.sqlite3")
+    conn = search_index.connect(index_path)
+    start = time.perf_counter()
+    for s in stores:
+        search_index.update_index(conn, s.kind, s.folder, s.entries)
+    search_index.compact(conn, force=True)
+    report("index build", time.perf_counter() - start, n_files)
+    start = time.perf_counter()
+    for s in stores:
+        search_index.update_index(conn, s.kind, s.folder, s.entries)
+    report("index update (no changes)", time.perf_counter() - start, n_files)
+    conn.close()
+    index = search_index.SearchIndex(index_path)
+    cold, warm = [], []
+    for query in QUERIES:
+        index._cache.clear()
+        cold.append(timed(index.search, query)[1])
+        warm.append(timed(index.search, query)[1])
+    index.close()
+    report_latency("search (cold cache)", cold)
+    report_latency("search (warm cache)", warm)
+    metadata.close()
+
+
+def run_render_benchmark():
+    command = [sys.executable, os.path.join(HERE, "bench_render.py"), "--legacy-max", "1000"]
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        if shutil.which("xvfb-run") is None:
+            print("\nrender: skipped (no display and xvfb-run not found)")
+            return
+        command = ["xvfb-run", "-a"] + command
+    print("\nrender")
+    subprocess.run(command, check=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="comma-separated library sizes (default: %(default)s)")
+    parser.add_argument("--words", type=int, default=60, help="max words per synthetic file")
+    parser.add_argument("--render", action="store_true", help="also run the widget render benchmark")
+    args = parser.parse_args()
+
+    for n_files in (int(size) for size in args.sizes.split(",")):
+        root = tempfile.mkdtemp(prefix="tse-bench-")
+        try:
+            bench_size(root, n_files, (10, args.words))
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    if args.render:
+        run_render_benchmark()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Link health checker check against a local stand-in HTTP server.
+
+Starts two local HTTP/1.1 servers (two "hosts") serving healthy, missing,
+slow and HEAD-refusing pages, checks a batch of links against them and
+verifies the result of each, that keep-alive connections are reused, that
+the per-host rate limit holds and that a second pass is served from the
+TTL cache. Exits non-zero on a failed check. No network access is needed.
+
+    python benchmarks/bench_links.py [--links 40] [--per-host 2]
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from link_checker import LinkChecker  # noqa: E402
+
+SLOW_SECONDS = 1.5
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, head):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(SLOW_SECONDS)
+            if self.path.startswith("/missing"):
+                status = 404
+            elif self.path.startswith("/nohead") and head:
+                status = 405
+            else:
+                status = 200
+            body = b"stand-in page\n"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def do_HEAD(self):
+        self._reply(head=True)
+
+    def do_GET(self):
+        self._reply(head=False)
+
+
+class ManualQueue:
+    """Stands in for ``UIQueue``: callbacks run when ``pump`` is called."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def post(self, func, *args):
+        self._queue.put((func, args))
+
+    def pump(self, timeout):
+        func, args = self._queue.get(timeout=timeout)
+        func(*args)
+
+
+def run_pass(checker, ui_queue, urls, force=False):
+    start = time.perf_counter()
+    queued = checker.check(urls, force=force)
+    for _ in queued:
+        ui_queue.pump(timeout=30)
+    return queued, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, default=40, help="healthy links per host")
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=0.01, help="minimum seconds between requests per host")
+    args = parser.parse_args()
+
+    servers = [StandInServer() for _ in range(2)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    bases = [f"http://127.0.0.1:{server.server_address[1]}" for server in servers]
+
+    expected = {}
+    for base in bases:
+        for i in range(args.links):
+            expected[f"{base}/ok/{i}"] = "ok"
+        expected[f"{base}/missing"] = "dead"
+        expected[f"{base}/nohead"] = "ok"
+        expected[f"{base}/slow"] = "error"
+    expected["http://127.0.0.1:9/refused"] = "error"
+    expected["file:///etc/hosts"] = "skipped"
+
+    ui_queue = ManualQueue()
+    results = {}
+    checker = LinkChecker(ui_queue, on_result=lambda r: results.__setitem__(r["url"], r),
+                          per_host=args.per_host, timeout=SLOW_SECONDS / 3, min_interval=args.interval)
+    failures = []
+
+    queued, elapsed = run_pass(checker, ui_queue, list(expected))
+    requests = sum(server.requests for server in servers)
+    connections = sum(server.connections for server in servers)
+    print(f"checked {len(queued)} links in {elapsed:.2f}s: {requests} requests over {connections} connections")
+    for url, state in expected.items():
+        got = results.get(url, {}).get("state")
+        if got != state:
+            failures.append(f"{url}: expected {state}, got {got} ({results.get(url, {}).get('detail')})")
+    for base, server in zip(bases, servers):
+        print(f"  {base}: {server.requests} requests, {server.connections} connections, "
+              f"at most {server.max_in_flight} in flight")
+        if server.max_in_flight > args.per_host:
+            failures.append(f"{base}: {server.max_in_flight} requests in flight (limit {args.per_host})")
+        # Timed-out (slow) requests and the GET fallback each cost a connection
+        if server.connections > args.per_host + 4:
+            failures.append(f"{base}: {server.connections} connections; keep-alive not reused")
+    minimum = (args.links + 3) * args.interval
+    if elapsed < minimum:
+        failures.append(f"finished in {elapsed:.2f}s, faster than the rate limit allows ({minimum:.2f}s)")
+
+    queued, elapsed = run_pass(checker, ui_queue, list(expected))
+    print(f"second pass (TTL cache): {len(queued)} links rechecked in {elapsed * 1000:.1f} ms")
+    if queued:
+        failures.append(f"second pass rechecked {len(queued)} fresh links")
+    queued, elapsed = run_pass(checker, ui_queue, list(expected), force=True)
+    print(f"forced pass: {len(queued)} links rechecked in {elapsed:.2f}s")
+
+    checker.shutdown()
+    for server in servers:
+        server.shutdown()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: link states, connection reuse, per-host limits and the TTL cache behaved")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
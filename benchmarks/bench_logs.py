@@ -0,0 +1,141 @@
+"""Log viewer benchmark.
+
+Writes a synthetic log (1 GB by default) and measures what the log viewer
+does with it: time to open and show the first screen, background line-index
+build, random jump-to-line latency and regex/keyword search throughput with
+one worker and with the full process pool, compared with a plain sequential
+read of the file. Hits are checked against the lines planted in the log;
+the script exits non-zero on a mismatch or if opening is not instant.
+
+    python benchmarks/bench_logs.py [--mb 1024] [--workers N]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_index import LogFile, LogSearch, compile_query, literal_needle  # noqa: E402
+
+OPEN_TARGET = 0.05  # seconds to map the file and decode the first screen
+LINES_PER_BLOCK = 10_000
+PLANTED_AT = 4321  # line within each block that carries the needle
+
+
+def write_log(path, mb):
+    """Write about ``mb`` MB of log lines; returns (lines, planted line numbers)."""
+    template = [f"2024-05-01 12:{i // 600 % 60:02d}:{i // 10 % 60:02d}.{i % 10}00 INFO worker-{i % 16} "
+                f"request {i} handled in {i % 97} ms user=alice@example.com status=200\n"
+                for i in range(LINES_PER_BLOCK)]
+    block_bytes = sum(len(line) for line in template)
+    blocks = max(1, mb * 1024 * 1024 // block_bytes)
+    planted = []
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for b in range(blocks):
+            lines = list(template)
+            lines[PLANTED_AT] = f"2024-05-01 13:00:00.000 ERROR worker-3 OutOfMemoryError in block {b}\n"
+            planted.append(b * LINES_PER_BLOCK + PLANTED_AT)
+            f.write("".join(lines))
+    return blocks * LINES_PER_BLOCK, planted
+
+
+def read_throughput(path):
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        while f.read(8 * 1024 * 1024):
+            pass
+    return os.path.getsize(path) / (time.perf_counter() - start)
+
+
+def run_search(pool, log, regex, literal):
+    hits = []
+    done = threading.Event()
+    result = []
+    search = LogSearch(pool, log, regex, hits.extend, lambda *r: (result.extend(r), done.set()), literal=literal)
+    start = time.perf_counter()
+    search.start()
+    done.wait()
+    return hits, result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=int, default=1024, help="log size in MB")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="search processes")
+    parser.add_argument("--jumps", type=int, default=200)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "customer.log")
+        start = time.perf_counter()
+        total_lines, planted = write_log(path, args.mb)
+        size = os.path.getsize(path)
+        print(f"wrote {size / 1e6:,.0f} MB, {total_lines:,} lines in {time.perf_counter() - start:.1f}s")
+        disk = read_throughput(path)
+        print(f"sequential read: {disk / 1e6:,.0f} MB/s (page cache is warm, as for a log just copied in)")
+
+        start = time.perf_counter()
+        log = LogFile(path)
+        first_screen, _next = log.read_lines(0, 40)
+        opened = time.perf_counter() - start
+        print(f"open and show first 40 lines: {opened * 1000:.1f} ms")
+        if opened > OPEN_TARGET:
+            failures.append(f"opening took {opened * 1000:.0f} ms (target {OPEN_TARGET * 1000:.0f} ms)")
+
+        start = time.perf_counter()
+        log.build_index()
+        elapsed = time.perf_counter() - start
+        print(f"line index: {elapsed:.2f}s ({size / 1e6 / elapsed:,.0f} MB/s), "
+              f"{len(log.block_lines) * 8 / 1024:,.0f} KB for {log.line_count():,} lines")
+        if log.line_count() != total_lines:
+            failures.append(f"index counted {log.line_count()} lines, expected {total_lines}")
+
+        rng = random.Random(1)
+        jumps = []
+        for _ in range(args.jumps):
+            line = rng.randrange(total_lines)
+            start = time.perf_counter()
+            offset = log.line_offset(line)
+            lines, _next = log.read_lines(offset, 40)
+            jumps.append(time.perf_counter() - start)
+            if not lines[0].endswith(f"request {line % LINES_PER_BLOCK} handled in {line % LINES_PER_BLOCK % 97} ms "
+                                     f"user=alice@example.com status=200") and line not in planted:
+                failures.append(f"jump to line {line} showed {lines[0]!r}")
+                break
+        print(f"jump to line + render 40 lines: p50 {statistics.median(jumps) * 1000:.2f} ms, "
+              f"max {max(jumps) * 1000:.2f} ms")
+
+        queries = (("keyword", compile_query("outofmemoryerror"), literal_needle("outofmemoryerror")),
+                   ("regex", compile_query(r"ERROR worker-\d+ \w+Error", regex=True), None))
+        for workers in sorted({1, args.workers}):
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pool.submit(int).result()  # start the workers before timing
+                for label, regex, literal in queries:
+                    hits, (total, stopped, error), elapsed = run_search(pool, log, regex, literal)
+                    print(f"{label} search, {workers} worker(s): {elapsed:.2f}s "
+                          f"({size / 1e6 / elapsed:,.0f} MB/s, {size / elapsed / disk:.0%} of sequential read), "
+                          f"{total} hits")
+                    expected = planted[:len(hits)]
+                    if error is not None or [h[0] for h in hits] != expected or (
+                            not stopped and len(hits) != len(planted)):
+                        failures.append(f"{label} search with {workers} worker(s) returned wrong hits: {error}")
+                    elif any(log.line_offset(line) != offset for line, offset, _text in hits[:50]):
+                        failures.append(f"{label} search offsets do not match the line index")
+        log.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: the log opened instantly and every planted line was found")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
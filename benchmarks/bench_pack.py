@@ -0,0 +1,143 @@
+"""Pack-file storage benchmark.
+
+Builds a synthetic folder library (100k files by default), imports it into a
+pack file and compares scans and random reads against the folder layout.
+Then round-trips the pack through NDJSON and back out to folders, checking
+contents and reporting peak Python memory for the streaming import/export,
+which should stay far below the size of the library.
+
+    python benchmarks/bench_pack.py [--files 100000] [--reads 2000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import folder_records, scan_folder, write_folder_records  # noqa: E402
+from pack_store import PackFile, read_ndjson, write_ndjson  # noqa: E402
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def traced(func, *args):
+    """Run ``func`` and return ``(result, seconds, peak traced bytes)``."""
+    tracemalloc.start()
+    try:
+        result, elapsed = timed(func, *args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def content_for(i):
+    return f"-- snippet {i}\nSELECT * FROM orders WHERE id = {i};\n" + "-- padding\n" * (i % 40)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=2000, help="random reads timed per backend")
+    args = parser.parse_args()
+
+    failures = []
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = os.path.join(tmp, "scripts_folder")
+        os.makedirs(folder)
+        names = [f"snippet-{i:06d}.txt" for i in range(args.files)]
+        start = time.perf_counter()
+        total_bytes = 0
+        for i, name in enumerate(names):
+            with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+                total_bytes += f.write(content_for(i))
+        print(f"wrote {args.files} files ({total_bytes / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+
+        pack = PackFile(os.path.join(tmp, "library.pack"))
+        count, elapsed, peak = traced(pack.import_records, folder_records("scripts", folder))
+        print(f"import folder -> pack: {count} files in {elapsed:.1f}s, peak {peak / 1e6:.1f} MB")
+
+        folder_scan, folder_secs = timed(scan_folder, folder)
+        pack_scan, pack_secs = timed(pack.scan, "scripts")
+        print(f"scan: folder {folder_secs * 1000:.0f} ms, pack {pack_secs * 1000:.0f} ms "
+              f"({len(folder_scan)} / {len(pack_scan)} entries)")
+        if len(pack_scan) != args.files:
+            failures.append(f"pack scan found {len(pack_scan)} files, expected {args.files}")
+
+        sample = rng.sample(range(args.files), min(args.reads, args.files))
+        folder_times, pack_times = [], []
+        for i in sample:
+            start = time.perf_counter()
+            with open(os.path.join(folder, names[i]), "r", encoding="utf-8") as f:
+                f.read()
+            folder_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            content = pack.read("scripts", names[i])
+            pack_times.append(time.perf_counter() - start)
+            if content != content_for(i):
+                failures.append(f"pack read of {names[i]} returned different content")
+                break
+        print(f"random read p50: folder {statistics.median(folder_times) * 1e6:.0f} us, "
+              f"pack {statistics.median(pack_times) * 1e6:.0f} us")
+
+        ndjson = os.path.join(tmp, "library.ndjson")
+
+        def export():
+            with open(ndjson, "w", encoding="utf-8") as out:
+                return write_ndjson(out, pack.records(), {("scripts", names[0]): "first"})
+
+        count, elapsed, export_peak = traced(export)
+        print(f"export pack -> NDJSON: {count} records in {elapsed:.1f}s, peak {export_peak / 1e6:.1f} MB")
+
+        descs = []
+        copy = PackFile(os.path.join(tmp, "copy.pack"))
+
+        def import_ndjson():
+            with open(ndjson, "r", encoding="utf-8") as lines:
+                return copy.import_records(read_ndjson(lines, on_desc=lambda *d: descs.append(d)))
+
+        count, elapsed, import_peak = traced(import_ndjson)
+        print(f"import NDJSON -> pack: {count} records in {elapsed:.1f}s, peak {import_peak / 1e6:.1f} MB")
+        if count != args.files or copy.scan("scripts") != pack.scan("scripts"):
+            failures.append("NDJSON round trip changed the library")
+        if descs != [("scripts", names[0], "first")]:
+            failures.append(f"descriptions did not round-trip: {descs[:3]}")
+
+        out_folder = os.path.join(tmp, "exported")
+        os.makedirs(out_folder)
+        count, elapsed = timed(write_folder_records, copy.records(), {"scripts": out_folder})
+        print(f"export pack -> folders: {count} files in {elapsed:.1f}s")
+        if scan_folder(out_folder) != scan_folder(folder):
+            failures.append("folder export does not match the original files and mtimes")
+        for i in sample[:50]:
+            with open(os.path.join(out_folder, names[i]), "r", encoding="utf-8") as f:
+                if f.read() != content_for(i):
+                    failures.append(f"exported {names[i]} differs")
+                    break
+
+        # Streaming means memory does not grow with the library
+        for label, peak in (("export", export_peak), ("import", import_peak)):
+            if peak > max(total_bytes / 4, 8e6):
+                failures.append(f"NDJSON {label} peaked at {peak / 1e6:.1f} MB for a {total_bytes / 1e6:.1f} MB library")
+        pack.close()
+        copy.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: pack scans, reads and streaming NDJSON/folder round trips behaved")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Command palette benchmark.
+
+Fills a ``FuzzyIndex`` with synthetic scripts and CMDs (50k by default),
+then types queries one keystroke at a time and reports per-keystroke latency.
+The palette aims for under 5 ms per keystroke.
+
+    python benchmarks/bench_palette.py [--items 50000]
+"""
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from palette import FuzzyIndex  # noqa: E402
+from synthetic_library import make_vocabulary  # noqa: E402
+
+QUERIES = ["select", "netlog", "tcp host", "cfg-0012", "usrgrp", "disk err", "zzq", "ping"]
+TARGET_MS = 5.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    vocabulary = make_vocabulary()
+    index = FuzzyIndex()
+    start = time.perf_counter()
+    for i in range(args.items):
+        filename = f"{rng.choice(vocabulary)}-{i:06d}.txt"
+        desc = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4)))
+        index.set("scripts" if i % 2 else "cmds", filename, f"{desc}: {filename}", f"{desc} {filename}")
+    print(f"indexed {len(index)} items in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.set("scripts", f"edited-{i}.txt", "edited", f"edited description {i}")
+    print(f"1000 incremental updates in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    all_samples = []
+    gc.disable()  # as timeit does; a collection pause is not the palette's cost
+    print(f"{'query':<12} {'hits':>4} {'max ms':>8} {'mean ms':>8}")
+    for query in QUERIES:
+        samples = []
+        for n in range(1, len(query) + 1):
+            start = time.perf_counter()
+            hits = index.search(query[:n])
+            samples.append((time.perf_counter() - start) * 1000)
+        all_samples += samples
+        print(f"{query:<12} {len(hits):>4} {max(samples):>8.2f} {statistics.mean(samples):>8.2f}")
+    gc.enable()
+    all_samples.sort()
+    p95 = all_samples[int(len(all_samples) * 0.95)]
+    print(f"per keystroke: p50 {statistics.median(all_samples):.2f} ms, p95 {p95:.2f} ms, "
+          f"max {all_samples[-1]:.2f} ms (target {TARGET_MS} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Usage ranking benchmark.
+
+Ranks a synthetic 100k-entry panel by frecency and replays a month of uses
+(most of them on a few favourites, as at a support desk). Times one use
+re-ranking its entry in the skip list, and the rows a viewport rebinds
+afterwards, against re-sorting the whole panel after every use. Checks the
+incremental order, and the order the decayed scores give, against a full
+sort of freshly decayed sums. Exits non-zero on a mismatch or if a use
+misses the target.
+
+    python benchmarks/bench_rank.py [--entries 100000] [--uses 20000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from usage_rank import EPOCH, EVENT_WEIGHTS, UsageRanking  # noqa: E402
+
+USE_TARGET = 0.001  # seconds, p95 for one use plus a 20-row viewport
+VIEWPORT_ROWS = 20
+HALF_LIFE_DAYS = 7
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--uses", type=int, default=20_000)
+    parser.add_argument("--resorts", type=int, default=20, help="full re-sorts to time for comparison")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    failures = []
+    keys = [f"snippet-{i:06d}.txt" for i in range(args.entries)]
+    favourites = rng.sample(keys, 30)
+    ranking = UsageRanking(HALF_LIFE_DAYS)
+    start = time.perf_counter()
+    ranking.rebuild(keys)
+    print(f"ranked {args.entries:,} entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    now = EPOCH + 400 * 86400
+    begin = now - 30 * 86400
+    uses = []
+    times = []
+    for i in range(args.uses):
+        key = rng.choice(favourites) if rng.random() < 0.7 else rng.choice(keys)
+        event = rng.choice(list(EVENT_WEIGHTS))
+        when = begin + (now - begin) * i / args.uses
+        uses.append((key, event, when))
+        start = time.perf_counter()
+        ranking.record(key, event, when)
+        rows = [ranking.order[position] for position in range(VIEWPORT_ROWS)]
+        times.append(time.perf_counter() - start)
+    times.sort()
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"one use, re-ranked + {VIEWPORT_ROWS} rows fetched: p50 {statistics.median(times) * 1e6:.0f} us, "
+          f"p95 {p95 * 1e6:.0f} us")
+    if p95 > USE_TARGET:
+        failures.append(f"use p95 {p95 * 1000:.2f} ms (target {USE_TARGET * 1000:.0f} ms)")
+
+    resort = []
+    for _ in range(args.resorts):
+        start = time.perf_counter()
+        order = sorted(range(args.entries), key=lambda p: (-ranking.score(keys[p], now), p))
+        resort.append(time.perf_counter() - start)
+    print(f"full re-sort per use instead: {statistics.median(resort) * 1000:.0f} ms "
+          f"({statistics.median(resort) / statistics.median(times):,.0f}x slower)")
+
+    # Reference: decay every use to now and sort
+    totals = {}
+    for key, event, when in uses:
+        totals[key] = totals.get(key, 0.0) + EVENT_WEIGHTS[event] * 0.5 ** ((now - when) / (HALF_LIFE_DAYS * 86400))
+    got = list(ranking.order)
+    if rows != got[:VIEWPORT_ROWS]:
+        failures.append("the viewport fetched after the last use differs from the top of the order")
+    reference = [totals.get(keys[p], 0.0) for p in got]
+    # Near-ties may round either way, so only check the order is non-increasing
+    if any(later > earlier * (1 + 1e-9) for earlier, later in zip(reference, reference[1:])):
+        failures.append("incremental order differs from a full sort of the decayed scores")
+    if got != order:
+        failures.append("incremental order differs from re-sorting by current score")
+    top = keys[got[0]]
+    if abs(ranking.score(top, now) - totals[top]) > 1e-6 * totals[top]:
+        failures.append(f"score of {top} is {ranking.score(top, now):.4f}, expected {totals[top]:.4f}")
+    print(f"top entry {top}: score {ranking.score(top, now):.2f}, "
+          f"{sum(1 for key in keys if key in totals):,} entries used at least once")
+
+    ranking.set_filter(sorted(rng.sample(range(args.entries), args.entries // 10)))
+    start = time.perf_counter()
+    ranking.record(favourites[0], "run", now)
+    elapsed = time.perf_counter() - start
+    filtered = list(ranking.current())
+    if filtered != sorted(filtered, key=lambda p: (-ranking.score(keys[p], now), p)):
+        failures.append("filtered order is not ranked")
+    print(f"one use with a 10% filter active: {elapsed * 1e6:.0f} us")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: the incremental ranking matched a full sort of the decayed scores")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Render benchmark for the Scripts/Saved CMDs panels.
+
+Compares the old full-rebuild rendering (four widgets per entry gridded into
+one frame) with ``VirtualList`` at 100, 1k, 10k and 100k entries and reports
+render time and widget count. Needs a display (or a virtual one such as Xvfb).
+
+    python benchmarks/bench_render.py [--legacy-max 10000]
+"""
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from virtual_list import VirtualList  # noqa: E402
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def make_entries(n):
+    return [{"desc": f"Snippet {i}", "filename": f"snippet-{i:06d}.txt"} for i in range(n)]
+
+
+def count_widgets(widget):
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+
+def render_legacy(frame, entries):
+    """The pre-virtualization render loop from ``DashboardApp.render_scripts``."""
+    for widget in frame.winfo_children():
+        widget.destroy()
+    for idx, entry in enumerate(entries):
+        tk.Label(frame, text=entry["desc"] + ": ", anchor="w").grid(row=idx, column=0, sticky="w", padx=5, pady=2)
+        file_label = tk.Label(frame, text=entry["filename"], fg="blue", cursor="hand2", anchor="w")
+        file_label.grid(row=idx, column=1, sticky="w", padx=5)
+        file_label.bind("<Button-1>", lambda e, f=entry["filename"]: None)
+        tk.Button(frame, text="Edit", command=lambda i=idx: None).grid(row=idx, column=2, padx=5)
+        tk.Button(frame, text="Delete", command=lambda i=idx: None).grid(row=idx, column=3, padx=5)
+
+
+def bench_legacy(root, entries):
+    frame = tk.Frame(root)
+    frame.pack()
+    start = time.perf_counter()
+    render_legacy(frame, entries)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    widgets = count_widgets(frame)
+    frame.destroy()
+    return elapsed, widgets
+
+
+def bench_virtual(root, entries):
+    view = VirtualList(root, on_open=lambda i: None, on_edit=lambda i: None, on_delete=lambda i: None)
+    view.pack(fill="both", expand=True)
+    root.update_idletasks()
+    start = time.perf_counter()
+    view.set_items(entries)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+
+    # Scrolling through the whole list must not create widgets either
+    scroll_start = time.perf_counter()
+    for fraction in (0.25, 0.5, 0.75, 1.0):
+        view.yview("moveto", fraction)
+    root.update_idletasks()
+    scroll_elapsed = (time.perf_counter() - scroll_start) / 4
+
+    widgets = count_widgets(view)
+    view.destroy()
+    return elapsed, widgets, scroll_elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legacy-max", type=int, default=10_000,
+                        help="skip the legacy renderer above this many entries (it is very slow)")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available, skipping render benchmark: {e}")
+        return
+    root.geometry("800x200")
+
+    print(f"{'entries':>8}  {'mode':<8} {'render ms':>10} {'widgets':>8} {'scroll ms':>10}")
+    for n in SIZES:
+        entries = make_entries(n)
+        if n <= args.legacy_max:
+            elapsed, widgets = bench_legacy(root, entries)
+            print(f"{n:>8}  {'legacy':<8} {elapsed * 1000:>10.1f} {widgets:>8} {'-':>10}")
+        else:
+            print(f"{n:>8}  {'legacy':<8} {'skipped':>10}")
+        elapsed, widgets, scroll = bench_virtual(root, entries)
+        print(f"{n:>8}  {'virtual':<8} {elapsed * 1000:>10.1f} {widgets:>8} {scroll * 1000:>10.2f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
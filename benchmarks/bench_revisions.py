@@ -0,0 +1,121 @@
+"""Revision history benchmark.
+
+Saves a set of synthetic SQL snippets many times with small edits, as a
+curated library sees over months, and compares what the revision store
+keeps with storing a compressed full copy per save. Then rebuilds random
+revisions, checking each against the text that was saved, and reports the
+rebuild latency. Exits non-zero on a mismatch or if storage grows with the
+number of saves rather than with the edits.
+
+    python benchmarks/bench_revisions.py [--files 50] [--saves 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from revision_store import RevisionStore  # noqa: E402
+
+STORAGE_TARGET = 0.15  # stored bytes as a fraction of compressed full copies
+REBUILD_TARGET = 0.02  # seconds, p95
+
+
+def snippet(rng, lines):
+    return [f"SELECT t{i}.col_{rng.randrange(100)}, t{i}.name FROM table_{i} t{i} "
+            f"JOIN users u ON u.id = t{i}.user_id WHERE t{i}.id = {rng.randrange(10_000)};\n" for i in range(lines)]
+
+
+def edit(rng, lines, save):
+    """One small edit: change, add or drop a line."""
+    choice = rng.random()
+    i = rng.randrange(len(lines))
+    if choice < 0.6:
+        lines[i] = lines[i].replace("WHERE", f"/* v{save} */ WHERE", 1)
+    elif choice < 0.85 or len(lines) < 10:
+        lines.insert(i, f"-- note added in save {save}\n")
+    else:
+        del lines[i]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--saves", type=int, default=200, help="saves per file")
+    parser.add_argument("--lines", type=int, default=300, help="lines per snippet")
+    parser.add_argument("--rebuilds", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RevisionStore(os.path.join(tmp, "revisions.sqlite3"))
+        saved = {}
+        full_copies = 0
+        changed_bytes = 0
+        start = time.perf_counter()
+        for f in range(args.files):
+            name = f"snippet-{f:03d}.txt"
+            lines = snippet(rng, args.lines)
+            versions = saved[name] = {}  # rev -> text
+            for save in range(args.saves):
+                if save:
+                    before = len("".join(lines))
+                    edit(rng, lines, save)
+                    changed_bytes += abs(len("".join(lines)) - before) or 10
+                content = "".join(lines)
+                full_copies += len(zlib.compress(content.encode("utf-8"), 6))
+                rev = store.record("scripts", name, content)
+                if rev is not None:  # None: the edit changed nothing
+                    versions[rev] = content
+        elapsed = time.perf_counter() - start
+        saves = args.files * args.saves
+        count, size, stored = store.stats()
+        print(f"{saves:,} saves in {elapsed:.1f}s ({elapsed / saves * 1000:.2f} ms per save)")
+        print(f"stored {stored / 1e6:.2f} MB for {size / 1e6:.1f} MB of versions; compressed full copies "
+              f"would take {full_copies / 1e6:.2f} MB ({stored / full_copies:.1%}); "
+              f"about {changed_bytes / 1e6:.2f} MB of text changed")
+        if stored > STORAGE_TARGET * full_copies:
+            failures.append(f"stored {stored / full_copies:.0%} of full copies (target {STORAGE_TARGET:.0%})")
+
+        per_save = stored / saves
+        print(f"{per_save:,.0f} bytes stored per save for a {len(content):,}-byte snippet")
+
+        times = []
+        names = list(saved)
+        for _ in range(args.rebuilds):
+            name = rng.choice(names)
+            rev = rng.choice(list(saved[name]))
+            start = time.perf_counter()
+            content = store.content("scripts", name, rev)
+            times.append(time.perf_counter() - start)
+            if content != saved[name][rev]:
+                failures.append(f"revision {rev} of {name} rebuilt differently")
+                break
+        times.sort()
+        p95 = times[int(len(times) * 0.95) - 1]
+        print(f"rebuild a random revision: p50 {statistics.median(times) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms")
+        if p95 > REBUILD_TARGET:
+            failures.append(f"rebuild p95 {p95 * 1000:.1f} ms (target {REBUILD_TARGET * 1000:.0f} ms)")
+
+        last = saved[names[0]][max(saved[names[0]])] + "-- last words\n"
+        trash_id = store.trash("scripts", names[0], last, "first")
+        kind, filename, desc, content = store.trash_item(trash_id)
+        if content != last or desc != "first":
+            failures.append("trashed file did not come back intact")
+        store.close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: every revision rebuilt exactly and storage tracked the edits")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
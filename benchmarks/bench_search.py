@@ -0,0 +1,67 @@
+"""Search index benchmark.
+
+Builds a synthetic library (50k files by default), indexes it and reports
+cold (empty postings cache) and warm query latency.
+
+    python benchmarks/bench_search.py [--files 50000] [--keep DIR]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search_index  # noqa: E402
+from synthetic_library import make_library  # noqa: E402
+
+QUERIES = ["sel", "select", "network", "log err", "tcp host disk", "usr grp pol", "pingho"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--keep", help="build the library and index in DIR and keep them")
+    args = parser.parse_args()
+
+    root = args.keep or tempfile.mkdtemp(prefix="tse-bench-")
+    try:
+        index_path = os.path.join(root, "search_index.sqlite3")
+        if not os.path.exists(index_path):
+            start = time.perf_counter()
+            scripts_folder, cmds_folder = make_library(root, args.files)
+            print(f"generated {args.files} files in {time.perf_counter() - start:.1f}s")
+            conn = search_index.connect(index_path)
+            start = time.perf_counter()
+            for kind, folder in (("scripts", scripts_folder), ("cmds", cmds_folder)):
+                search_index.update_index(conn, kind, folder, [])
+            search_index.compact(conn, force=True)
+            print(f"indexed in {time.perf_counter() - start:.1f}s "
+                  f"({os.path.getsize(index_path) / 1e6:.0f} MB)")
+            start = time.perf_counter()
+            search_index.update_index(conn, "scripts", scripts_folder, [])
+            search_index.update_index(conn, "cmds", cmds_folder, [])
+            print(f"no-op incremental update in {(time.perf_counter() - start) * 1000:.0f} ms")
+            conn.close()
+
+        index = search_index.SearchIndex(index_path)
+        print(f"{'query':<16} {'hits':>4} {'cold ms':>8} {'warm ms':>8}")
+        for query in QUERIES:
+            index._cache.clear()
+            start = time.perf_counter()
+            hits = index.search(query)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            index.search(query)
+            warm = time.perf_counter() - start
+            print(f"{query:<16} {len(hits):>4} {cold * 1000:>8.2f} {warm * 1000:>8.2f}")
+        index.close()
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Team library sync benchmark.
+
+Builds a synthetic shared library (20k files by default) in a temporary
+folder and syncs it into empty user folders, then measures a no-op sync and
+a delta sync after editing, deleting and locally changing some files. The
+delta results are checked (updates, conflicts, removals, respected local
+deletes) and the script exits non-zero on a mismatch or if the no-op sync
+misses its target.
+
+    python benchmarks/bench_sync.py [--files 20000] [--changed 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from team_sync import TeamSync, conflict_name  # noqa: E402
+
+NOOP_TARGET = 0.5  # seconds
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def timed(sync):
+    start = time.perf_counter()
+    report = sync.run()
+    return report, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000, help="files in the team library (split across both kinds)")
+    parser.add_argument("--changed", type=int, default=200, help="team files edited before the delta sync")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = os.path.join(tmp, "team")
+        folders = {}
+        for kind, sub in (("scripts", "scripts_folder"), ("cmds", "cmds_folder")):
+            os.makedirs(os.path.join(shared, sub))
+            local = os.path.join(tmp, "user", sub)
+            os.makedirs(local)
+            folders[kind] = (sub, local)
+        names = [f"item-{i:06d}.txt" for i in range(args.files // 2)]
+        for sub, _local in folders.values():
+            for name in names:
+                write(os.path.join(shared, sub, name), f"-- {name}\nSELECT * FROM t WHERE id = {name[5:11]};\n")
+
+        sync = TeamSync(shared, folders, os.path.join(tmp, "manifest.json"))
+        report, elapsed = timed(sync)
+        print(f"initial sync of {args.files} files: {elapsed:.2f}s ({report.summary()})")
+
+        sync = TeamSync(shared, folders, os.path.join(tmp, "manifest.json"))  # cold manifest, as after a restart
+        report, cold = timed(sync)
+        report, warm = timed(sync)
+        print(f"no-op sync: {cold * 1000:.0f} ms with the manifest loaded from disk, {warm * 1000:.0f} ms warm "
+              f"({report.summary()}, {report.hashed} files hashed)")
+        if max(cold, warm) > NOOP_TARGET:
+            failures.append(f"no-op sync took {max(cold, warm) * 1000:.0f} ms (target {NOOP_TARGET * 1000:.0f} ms)")
+
+        sub, local = folders["scripts"]
+        changed = names[:args.changed]
+        edited_locally = changed[:10]
+        removed = names[-50:]
+        deleted_locally = names[args.changed:args.changed + 5]
+        for name in changed:
+            write(os.path.join(shared, sub, name), f"-- {name} v2\n")
+        for name in edited_locally:
+            write(os.path.join(local, name), "-- my local fix\n")
+        for name in removed:
+            os.remove(os.path.join(shared, sub, name))
+        for name in deleted_locally:
+            os.remove(os.path.join(local, name))
+        os.utime(os.path.join(shared, sub, names[args.changed + 10]))  # touched, same content
+
+        report, elapsed = timed(sync)
+        print(f"delta sync: {elapsed * 1000:.0f} ms ({report.summary()}, {report.hashed} files hashed)")
+        expected = {
+            "updated": len(changed) - len(edited_locally),
+            "conflicts": len(edited_locally),
+            "removed": len(removed),
+            "added": 0,
+        }
+        for field, count in expected.items():
+            got = len(getattr(report, field).get("scripts", []))
+            if got != count:
+                failures.append(f"delta sync: {got} {field}, expected {count}")
+        for name in edited_locally:
+            with open(os.path.join(local, name), encoding="utf-8") as f:
+                if f.read() != "-- my local fix\n":
+                    failures.append(f"local edit of {name} was overwritten")
+            if not os.path.exists(os.path.join(local, conflict_name(name))):
+                failures.append(f"no team copy saved for conflicting {name}")
+        for name in deleted_locally:
+            if os.path.exists(os.path.join(local, name)):
+                failures.append(f"locally deleted {name} came back")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: only changed files were transferred and conflicts kept local edits")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Tag filter benchmark.
+
+Tags a synthetic 100k-entry panel with product, severity, customer and OS
+facets, builds the per-tag bitmaps and times random AND/OR/NOT filters:
+matching the entries, listing them in panel order and counting every
+facet value within the result, as the filter bar does on each keystroke.
+Every result is checked against a plain per-entry evaluation. Also times
+retagging one entry and deleting entries, which update the bitmaps in
+place. Exits non-zero on a mismatch or if a filter misses the target.
+
+    python benchmarks/bench_tags.py [--entries 100000] [--queries 300]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tag_index import TagIndex, parse_query  # noqa: E402
+
+FILTER_TARGET = 0.02  # seconds, p95 for mask + member list + facet counts
+FACETS = {
+    "product": [f"product:{name}" for name in ("sql", "portal", "agent", "reports", "billing", "sync", "api", "mobile")],
+    "severity": ["severity:low", "severity:medium", "severity:high", "severity:critical"],
+    "customer": [f"customer:c{i:03d}" for i in range(200)],
+    "os": ["os:windows", "os:linux", "os:macos", "os:server2019", "os:server2022"],
+}
+
+
+def make_tags(rng, n):
+    tags = []
+    for _ in range(n):
+        entry = {rng.choice(FACETS["product"]), rng.choice(FACETS["severity"])}
+        if rng.random() < 0.5:
+            entry.add(rng.choice(FACETS["customer"]))
+        entry.update(rng.sample(FACETS["os"], rng.randint(0, 2)))
+        tags.append(tuple(sorted(entry)))
+    return tags
+
+
+def random_query(rng):
+    terms = []
+    for _ in range(rng.randint(1, 3)):
+        facet = rng.choice(list(FACETS))
+        choice = rng.random()
+        if choice < 0.5:
+            terms.append(rng.choice(FACETS[facet]))
+        elif choice < 0.8:
+            terms.append("|".join(rng.sample(FACETS[facet], 2)))
+        else:
+            terms.append("-" + rng.choice(FACETS[facet]))
+    return " ".join(terms)
+
+
+def brute_force(tags, groups, excluded):
+    return [i for i, entry in enumerate(tags)
+            if all(any(tag in entry for tag in group) for group in groups)
+            and not any(tag in entry for tag in excluded)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    failures = []
+    tags = make_tags(rng, args.entries)
+    index = TagIndex()
+    start = time.perf_counter()
+    index.rebuild((f"entry-{i:06d}.txt", entry) for i, entry in enumerate(tags))
+    elapsed = time.perf_counter() - start
+    size = sum((bits.bit_length() + 7) // 8 for bits in index.bitmaps.values())
+    print(f"built {len(index.bitmaps)} tag bitmaps over {args.entries:,} entries in {elapsed * 1000:.0f} ms "
+          f"({size / 1e6:.1f} MB)")
+
+    times = []
+    matched = []
+    for q in range(args.queries):
+        query = random_query(rng)
+        groups, excluded = parse_query(query)
+        start = time.perf_counter()
+        mask = index.mask(groups, excluded)
+        positions = index.members(mask)
+        counts = index.counts(mask)
+        times.append(time.perf_counter() - start)
+        matched.append(len(positions))
+        if q < 50:  # the plain evaluation is slow; check a sample
+            expected = brute_force(tags, groups, excluded)
+            if positions != expected:
+                failures.append(f"{query!r} matched {len(positions)} entries, expected {len(expected)}")
+                break
+            tag = rng.choice(list(counts))
+            if counts[tag] != sum(1 for i in expected if tag in tags[i]):
+                failures.append(f"facet count of {tag} is wrong for {query!r}")
+                break
+    times.sort()
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"filter + list + facet counts: p50 {statistics.median(times) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms "
+          f"(median {statistics.median(matched):,.0f} entries matched)")
+    if p95 > FILTER_TARGET:
+        failures.append(f"filter p95 {p95 * 1000:.1f} ms (target {FILTER_TARGET * 1000:.0f} ms)")
+
+    retag = []
+    for _ in range(200):
+        position = rng.randrange(args.entries)
+        new = make_tags(rng, 1)[0]
+        start = time.perf_counter()
+        index.set_tags(position, new)
+        retag.append(time.perf_counter() - start)
+        tags[position] = new
+    print(f"retag one entry: p50 {statistics.median(retag) * 1000:.3f} ms")
+
+    start = time.perf_counter()
+    gone = [index.keys[rng.randrange(len(index))] for _ in range(3)]
+    index.remove_keys(gone)
+    elapsed = time.perf_counter() - start
+    gone = set(gone)
+    tags = [entry for i, entry in enumerate(tags) if f"entry-{i:06d}.txt" not in gone]
+    print(f"delete {len(gone)} entries (bits shifted in place): {elapsed * 1000:.1f} ms")
+    groups, excluded = parse_query("severity:high|severity:critical -os:macos")
+    if index.members(index.mask(groups, excluded)) != brute_force(tags, groups, excluded):
+        failures.append("filter results are wrong after retagging and deleting")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: every filter matched the plain evaluation")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
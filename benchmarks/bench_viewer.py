@@ -0,0 +1,222 @@
+"""File viewer benchmark.
+
+Opens a stream of scripts the way a shift does (a few hundred clicks over a
+few dozen files, some of them again and again) with the old viewer, a new
+``Toplevel`` and ``ScrolledText`` per click, and with the tabbed
+``ViewerWindow``.
+
+The headless part runs anywhere. It writes the snippets to a temporary
+library and times, per click, the read each viewer does through
+``LibraryStore`` and the content cache: the old viewer reads on every
+click, the tabbed one only when a file gets a new tab. It also reports how
+much text each keeps in open viewers. With a display (or a virtual one such
+as Xvfb) it then times the real widgets and reports per-open latency, the
+widgets left behind and the growth in resident memory (read from /proc on
+Linux). Exits non-zero if the tabbed viewer goes over its tab cap or reloads
+a file that already has a tab.
+
+    python benchmarks/bench_viewer.py [--opens 300] [--files 40] [--tabs 12]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+from tkinter import scrolledtext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_cache import ContentCache  # noqa: E402
+from library import LibraryStore  # noqa: E402
+from text_loader import FileLoad  # noqa: E402
+from viewer_window import ViewerWindow  # noqa: E402
+
+CONTENT_CACHE_BYTES = 16 * 1024 * 1024  # the dashboard's default
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def count_widgets(widget):
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+
+def make_snippets(n, lines):
+    return {f"snippet-{i:03d}.txt": "".join(f"SELECT col_{j}, name FROM table_{i} WHERE id = {j};\n"
+                                            for j in range(lines)) for i in range(n)}
+
+
+def click_order(rng, names, opens):
+    # Most clicks go back to a handful of favourites, as at a support desk
+    favourites = names[:8]
+    return [rng.choice(favourites) if rng.random() < 0.6 else rng.choice(names) for _ in range(opens)]
+
+
+def tab_opens(order, tabs):
+    """Replay the tab policy: per click, whether it loads a file, and the tabs left open."""
+    loads, open_now = [], []
+    for filename in order:
+        if filename in open_now:
+            open_now.remove(filename)
+            loads.append(False)
+        else:
+            loads.append(True)
+            if len(open_now) >= tabs:
+                open_now.pop(0)
+        open_now.append(filename)
+    return loads, open_now
+
+
+def read_for_viewer(store, filename):
+    # What load_file_into does on the I/O pool for a file below the streaming threshold
+    os.path.getsize(store.path(filename))
+    return store.read(filename)
+
+
+def bench_headless(snippets, order, tabs):
+    """Per-click read time and text kept open, old viewer against tabs."""
+    folder = tempfile.mkdtemp(prefix="tse-viewer-")
+    try:
+        for filename, content in snippets.items():
+            with open(os.path.join(folder, filename), "w", encoding="utf-8") as f:
+                f.write(content)
+        results = {}
+        new_tab, open_now = tab_opens(order, tabs)
+        for label, reads in (("legacy", [True] * len(order)), ("tabs", new_tab)):
+            store = LibraryStore("scripts", folder, None, ContentCache(CONTENT_CACHE_BYTES))
+            times = []
+            for filename, read in zip(order, reads):
+                start = time.perf_counter()
+                if read:
+                    read_for_viewer(store, filename)
+                times.append(time.perf_counter() - start)
+            results[label] = (times, sum(reads))
+        held = {"legacy": sum(len(snippets[f].encode("utf-8")) for f in order),
+                "tabs": sum(len(snippets[f].encode("utf-8")) for f in open_now)}
+        for label in ("tabs", "legacy"):
+            times, reads = results[label]
+            times.sort()
+            p95 = times[int(len(times) * 0.95) - 1]
+            windows = len(order) if label == "legacy" else len(open_now)
+            print(f"{label:<8} read per click p50 {statistics.median(times) * 1e6:6.0f} us  "
+                  f"p95 {p95 * 1e6:6.0f} us  reads {reads:>4}  "
+                  f"text kept open {held[label] / 1e6:5.1f} MB in {windows} viewers")
+        return held
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def load_into(snippets, loads):
+    def load(frame, text, kind, filename):
+        loads.append(filename)
+        text.insert(tk.END, snippets[filename])
+        result = FileLoad()
+        result._done = True
+        return result
+    return load
+
+
+def bench_legacy(root, snippets, order):
+    """The pre-tabs ``show_script_content``: a window per click, never reused."""
+    times = []
+    for filename in order:
+        start = time.perf_counter()
+        popup = tk.Toplevel(root)
+        popup.title(f"Script: {filename}")
+        popup.geometry("500x300")
+        text_widget = scrolledtext.ScrolledText(popup, wrap=tk.WORD)
+        text_widget.pack(fill="both", expand=True)
+        text_widget.insert(tk.END, snippets[filename])
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_tabs(root, viewer, order):
+    times = []
+    for filename in order:
+        start = time.perf_counter()
+        viewer.open("scripts", filename, f"Script: {filename}")
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(label, times, widgets, grew):
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    memory = f"{grew:+.1f} MB" if grew is not None else "n/a"
+    print(f"{label:<8} open p50 {statistics.median(times) * 1000:6.2f} ms  p95 {p95 * 1000:6.2f} ms  "
+          f"widgets left {widgets:>5}  resident memory {memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--opens", type=int, default=300)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--lines", type=int, default=400, help="lines per snippet")
+    parser.add_argument("--tabs", type=int, default=12, help="tab cap for the tabbed viewer")
+    args = parser.parse_args()
+
+    snippets = make_snippets(args.files, args.lines)
+    order = click_order(random.Random(3), sorted(snippets), args.opens)
+    failures = []
+    new_tab, _open_now = tab_opens(order, args.tabs)
+    expected = sum(new_tab)
+
+    print(f"{len(order)} clicks over {len(snippets)} snippets of {args.lines} lines, cap {args.tabs} tabs")
+    held = bench_headless(snippets, order, args.tabs)
+    if held["tabs"] > held["legacy"]:
+        failures.append("the tabbed viewer keeps more text open than one window per click")
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available, skipping the widget measurements: {e}")
+        root = None
+    if root is None:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("OK: the tabbed viewer read and kept open less than one window per click")
+        return 1 if failures else 0
+
+    # Tabs first: Tk rarely hands freed memory back, so the legacy run goes last
+    before = rss_mb()
+    loads = []
+    viewer = ViewerWindow(root, load_into(snippets, loads), max_tabs=args.tabs)
+    times = bench_tabs(root, viewer, order)
+    after = rss_mb()
+    report("tabs", times, count_widgets(viewer), after - before if before is not None else None)
+    if len(viewer.tabs) > args.tabs or len(viewer.notebook.tabs()) > args.tabs:
+        failures.append(f"{len(viewer.notebook.tabs())} tabs open (cap {args.tabs})")
+    # A click on a file whose tab is open only selects it
+    if len(loads) != expected:
+        failures.append(f"the tabbed viewer loaded {len(loads)} files for {expected} new tabs")
+    print(f"         {len(loads)} loads for {len(order)} clicks; the rest selected an open tab")
+    viewer.destroy()
+
+    before = rss_mb()
+    times = bench_legacy(root, snippets, order)
+    after = rss_mb()
+    report("legacy", times, count_widgets(root), after - before if before is not None else None)
+    root.destroy()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: the viewer stayed within its tab cap and reused open tabs")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Synthetic script/CMD libraries for the benchmarks."""
+import os
+import random
+
+_SYLLABLES = [
+    "sel", "ect", "upd", "ate", "ser", "ver", "net", "work", "log", "err", "cfg",
+    "sql", "tab", "idx", "usr", "grp", "pol", "reg", "key", "val", "dns", "tcp",
+    "get", "set", "run", "dir", "fil", "ter", "cou", "nt", "ping", "host", "disk",
+]
+
+
+def make_vocabulary(size=20_000, seed=1):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 3))))
+    return sorted(words)
+
+
+def make_library(root, n_files, seed=1, words_per_file=(20, 200)):
+    """Write ``n_files`` snippets split between ``root/scripts_folder`` and
+    ``root/cmds_folder``. Returns ``(scripts_folder, cmds_folder)``."""
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(seed=seed)
+    folders = (os.path.join(root, "scripts_folder"), os.path.join(root, "cmds_folder"))
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+    for i in range(n_files):
+        body = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(*words_per_file)))
+        filename = f"{rng.choice(vocabulary)}-{i:06d}.txt"
+        with open(os.path.join(folders[i % 2], filename), "w", encoding="utf-8") as f:
+            f.write(body)
+    return folders
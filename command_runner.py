@@ -0,0 +1,240 @@
+import collections
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+# Seconds a cancelled process group gets to exit before it is killed
+KILL_GRACE = 2.0
+# Characters of output each run keeps (the tail) for ``captured_output``
+CAPTURE_CHARS = 256 * 1024
+
+
+def command_from_text(text):
+    """Turn a saved CMD file into one shell command line.
+
+    Blank lines and comments (``#`` or ``REM``) are dropped and the remaining
+    lines are chained with ``&&`` so a multi-line CMD stops at the first
+    failing step, the same way in ``cmd.exe`` and ``sh``.
+    """
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or line.upper().startswith("REM "):
+            continue
+        lines.append(line)
+    return " && ".join(lines)
+
+
+def kill_tree(proc, grace=KILL_GRACE):
+    """Stop ``proc`` and every process it started."""
+    if proc.poll() is not None:
+        return
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(grace)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class CommandRun:
+    """One launch of a command. ``status`` is one of ``queued``, ``running``,
+    ``done`` (exit code 0), ``failed``, ``timeout``, ``cancelled`` or
+    ``error`` (could not start)."""
+
+    def __init__(self, run_id, name, command, timeout, cwd, on_output, on_exit, capture_chars=CAPTURE_CHARS):
+        self.run_id = run_id
+        self.name = name
+        self.command = command
+        self.timeout = timeout
+        self.cwd = cwd
+        self.on_output = on_output
+        self.on_exit = on_exit
+        self.status = "queued"
+        self.returncode = None
+        self.error = None
+        self.started = None
+        self.ended = None
+        self.proc = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = []  # (stream, line) waiting for the Tk thread
+        self.output_bytes = 0  # UTF-8 size of all output, as run history stores it
+        self.capture_chars = capture_chars
+        self._captured = collections.deque()
+        self._captured_chars = 0
+
+    @property
+    def finished(self):
+        return self.ended is not None
+
+    @property
+    def duration(self):
+        if self.started is None:
+            return 0.0
+        return (self.ended or time.time()) - self.started
+
+    def captured_output(self):
+        """The last ``capture_chars`` of stdout and stderr, interleaved."""
+        with self._lock:
+            return "".join(self._captured)
+
+    def _capture(self, line):
+        # Called with self._lock held
+        self.output_bytes += len(line.encode("utf-8", "replace"))
+        self._captured.append(line)
+        self._captured_chars += len(line)
+        while self._captured_chars > self.capture_chars and len(self._captured) > 1:
+            self._captured_chars -= len(self._captured.popleft())
+
+
+class CommandRunner:
+    """Runs shell commands in the background and streams their output.
+
+    At most ``max_concurrent`` commands run at once; later ones wait in a
+    queue. Output lines are collected by reader threads and handed to
+    ``on_output(run, lines)`` on the Tk thread in batches (through the
+    ``UIQueue``); ``on_exit(run)`` follows when the process is gone. A run
+    that exceeds its timeout, or is cancelled, has its whole process tree
+    killed. ``on_finish(run)``, if given, is called for every finished run
+    before its own ``on_exit`` (e.g. to record history).
+    """
+
+    def __init__(self, ui_queue, max_concurrent=3, default_timeout=None, on_finish=None):
+        self.ui_queue = ui_queue
+        self.max_concurrent = max_concurrent
+        self.default_timeout = default_timeout
+        self.on_finish = on_finish
+        self.active = {}
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def run(self, name, command, on_output=None, on_exit=None, timeout=None, cwd=None):
+        """Start ``command`` (or queue it) and return its ``CommandRun``."""
+        with self._lock:
+            run = CommandRun(self._next_id, name, command,
+                             timeout if timeout is not None else self.default_timeout,
+                             cwd, on_output, on_exit)
+            self._next_id += 1
+            if len(self.active) < self.max_concurrent:
+                self._start(run)
+            else:
+                self._queue.append(run)
+        return run
+
+    def cancel(self, run):
+        with self._lock:
+            if run.status == "queued":
+                self._queue.remove(run)
+                run.status = "cancelled"
+                run.ended = time.time()
+                self.ui_queue.post(self._deliver_exit, run)
+                return
+        run._cancel.set()
+
+    def shutdown(self):
+        """Drop queued runs and kill the running ones."""
+        with self._lock:
+            queued = list(self._queue)
+            self._queue.clear()
+            running = list(self.active.values())
+        for run in queued:
+            run.status = "cancelled"
+        for run in running:
+            run._cancel.set()
+            if run.proc is not None:
+                kill_tree(run.proc)
+
+    # --- Worker side ---
+    def _start(self, run):
+        # Called with self._lock held
+        self.active[run.run_id] = run
+        run.status = "running"
+        run.started = time.time()
+        threading.Thread(target=self._supervise, args=(run,), daemon=True,
+                         name=f"cmd-{run.run_id}").start()
+
+    def _supervise(self, run):
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True  # own process group for killpg
+        try:
+            run.proc = subprocess.Popen(
+                run.command, shell=True, cwd=run.cwd, stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, encoding="utf-8", errors="replace", bufsize=1, **kwargs)
+        except OSError as e:
+            run.error = e
+            self._finish(run, "error")
+            return
+        readers = [
+            threading.Thread(target=self._read, args=(run, run.proc.stdout, "stdout"), daemon=True),
+            threading.Thread(target=self._read, args=(run, run.proc.stderr, "stderr"), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        deadline = run.started + run.timeout if run.timeout else None
+        status = None
+        while run.proc.poll() is None:
+            if run._cancel.wait(0.1):
+                status = "cancelled"
+            elif deadline is not None and time.time() > deadline:
+                status = "timeout"
+            if status is not None:
+                kill_tree(run.proc)
+                break
+        run.proc.wait()
+        for reader in readers:
+            reader.join(1.0)  # grandchildren may hold the pipes open
+        run.returncode = run.proc.returncode
+        if status is None:
+            status = "done" if run.returncode == 0 else "failed"
+        self._finish(run, status)
+
+    def _read(self, run, stream, name):
+        for line in stream:
+            with run._lock:
+                first = not run._pending
+                run._pending.append((name, line))
+                run._capture(line)
+            if first:
+                self.ui_queue.post(self._deliver_output, run)
+        stream.close()
+
+    def _finish(self, run, status):
+        run.status = status
+        run.ended = time.time()
+        with self._lock:
+            self.active.pop(run.run_id, None)
+            while self._queue and len(self.active) < self.max_concurrent:
+                self._start(self._queue.popleft())
+        self.ui_queue.post(self._deliver_exit, run)
+
+    # --- Tk thread ---
+    def _deliver_output(self, run):
+        with run._lock:
+            lines, run._pending = run._pending, []
+        if lines and run.on_output is not None:
+            run.on_output(run, lines)
+
+    def _deliver_exit(self, run):
+        self._deliver_output(run)
+        if self.on_finish is not None:
+            try:
+                self.on_finish(run)
+            except Exception as e:
+                print(f"on_finish for {run.name} failed: {e}")
+        if run.on_exit is not None:
+            run.on_exit(run)
@@ -0,0 +1,71 @@
+import tkinter as tk
+from tkinter import scrolledtext
+
+# Lines kept in a console; older output is dropped from the top
+MAX_CONSOLE_LINES = 5000
+
+
+class ConsolePane(tk.Frame):
+    """Scrollable output pane for one ``CommandRun``.
+
+    Keeps at most ``max_lines`` lines, shows stderr in red and follows the
+    end of the output unless the user has scrolled up. The status line and
+    Cancel button track the run.
+    """
+
+    def __init__(self, parent, runner, run, max_lines=MAX_CONSOLE_LINES):
+        super().__init__(parent)
+        self.runner = runner
+        self.run = run
+        self.max_lines = max_lines
+        self.dropped = 0
+
+        bar = tk.Frame(self)
+        bar.pack(side="top", fill="x")
+        self.status = tk.Label(bar, anchor="w")
+        self.status.pack(side="left", fill="x", expand=True, padx=5)
+        self.cancel_btn = tk.Button(bar, text="Cancel", command=lambda: self.runner.cancel(self.run))
+        self.cancel_btn.pack(side="right", padx=5)
+
+        self.text = scrolledtext.ScrolledText(self, wrap=tk.NONE, height=15)
+        self.text.pack(fill="both", expand=True)
+        self.text.tag_configure("stderr", foreground="red")
+        self.text.tag_configure("info", foreground="gray")
+        self.text.insert(tk.END, f"> {run.command}\n", "info")
+        self.text.config(state="disabled")
+        self.update_status()
+
+    def append(self, lines):
+        """Add ``[(stream, line), ...]`` and trim to ``max_lines``."""
+        follow = self.text.yview()[1] >= 0.999
+        self.text.config(state="normal")
+        for stream, line in lines:
+            self.text.insert(tk.END, line if line.endswith("\n") else line + "\n",
+                             "stderr" if stream == "stderr" else ())
+        excess = int(self.text.index("end-1c").split(".")[0]) - 1 - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.dropped += excess
+        self.text.config(state="disabled")
+        if follow:
+            self.text.see(tk.END)
+        self.update_status()
+
+    def finish(self):
+        run = self.run
+        if run.error is not None:
+            message = f"Could not start: {run.error}"
+        else:
+            message = f"[{run.status}, exit code {run.returncode}, {run.duration:.1f}s]"
+        self.text.config(state="normal")
+        self.text.insert(tk.END, message + "\n", "info")
+        self.text.config(state="disabled")
+        self.text.see(tk.END)
+        self.cancel_btn.config(state="disabled")
+        self.update_status()
+
+    def update_status(self):
+        text = f"{self.run.name}: {self.run.status}"
+        if self.dropped:
+            text += f" ({self.dropped} earlier lines dropped)"
+        self.status.config(text=text)
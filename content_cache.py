@@ -0,0 +1,74 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class ContentCache:
+    """Shared LRU cache of text file contents.
+
+    Entries are validated against the file's ``(mtime_ns, size)`` on every
+    read, so a hit costs one ``stat`` and no reads. The total size of cached
+    files is capped at ``max_bytes``; least recently used entries are evicted
+    first. Saves go through ``write`` so the cache stays warm after an edit.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, text)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def read(self, path):
+        """Return the text of ``path``; raises ``OSError`` like ``open``."""
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        self._store(path, st, text)
+        return text
+
+    def write(self, path, text):
+        """Write ``text`` to ``path`` and keep it cached (write-through)."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        self._store(path, os.stat(path), text)
+
+    def invalidate(self, path):
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _store(self, path, st, text):
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if st.st_size > self.max_bytes:
+                return
+            self._entries[path] = (st.st_mtime_ns, st.st_size, text)
+            self._bytes += st.st_size
+            while self._bytes > self.max_bytes:
+                _path, (_mtime, size, _text) = self._entries.popitem(last=False)
+                self._bytes -= size
+                self.evictions += 1
@@ -0,0 +1,69 @@
+import tkinter as tk
+
+from tag_index import facet
+
+
+class FacetBar(tk.Frame):
+    """Tag filter over the Scripts, Saved CMDs and Helpful Links panels.
+
+    The entry takes a filter such as ``product:sql severity:high|severity:critical
+    -os:macos`` (see ``tag_index.parse_query``) and ``on_change(query)`` runs
+    on every edit. The list beside it shows each tag, grouped by facet, with
+    how many of the entries shown carry it; double-click a tag to require
+    it, right-click to exclude it.
+    """
+
+    def __init__(self, parent, on_change):
+        super().__init__(parent)
+        self.on_change = on_change
+        self.tags = []  # tags in list order
+
+        left = tk.Frame(self)
+        left.pack(side="left", fill="x", expand=True, anchor="n")
+        row = tk.Frame(left)
+        row.pack(fill="x")
+        tk.Label(row, text="Tags:").pack(side="left")
+        self.query_var = tk.StringVar()
+        tk.Entry(row, textvariable=self.query_var).pack(side="left", fill="x", expand=True, padx=5)
+        tk.Button(row, text="Clear", command=lambda: self.query_var.set("")).pack(side="left")
+        self.status = tk.Label(left, anchor="w", fg="gray")
+        self.status.pack(fill="x")
+
+        scrollbar = tk.Scrollbar(self, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        self.facet_list = tk.Listbox(self, height=3, width=32, yscrollcommand=scrollbar.set)
+        self.facet_list.pack(side="right")
+        scrollbar.config(command=self.facet_list.yview)
+        self.facet_list.bind("<Double-Button-1>", lambda e: self._pick(e, exclude=False))
+        self.facet_list.bind("<Button-3>", lambda e: self._pick(e, exclude=True))
+        self.query_var.trace_add("write", lambda *args: self.on_change(self.query()))
+
+    def query(self):
+        return self.query_var.get()
+
+    def add_term(self, tag, exclude=False):
+        term = ("-" if exclude else "") + tag
+        terms = self.query().split()
+        if term not in terms:
+            self.query_var.set(" ".join(terms + [term]))
+
+    def _pick(self, event, exclude):
+        index = self.facet_list.nearest(event.y)
+        if 0 <= index < len(self.tags):
+            self.add_term(self.tags[index], exclude)
+
+    def show_counts(self, counts, shown, total):
+        """List ``{tag: count}``; ``shown`` of ``total`` entries match the filter."""
+        self.tags = sorted(counts, key=lambda tag: (facet(tag), tag))
+        self.facet_list.delete(0, tk.END)
+        for tag in self.tags:
+            self.facet_list.insert(tk.END, f"{tag} ({counts[tag]:,})")
+            if not counts[tag]:
+                self.facet_list.itemconfig(tk.END, fg="gray")
+        if not counts:
+            text = "No tags yet. Add some (e.g. os:windows, severity:high) in an Edit window."
+        elif self.query().strip():
+            text = f"Showing {shown:,} of {total:,} entries"
+        else:
+            text = "Double-click a tag to filter by it, right-click to exclude it"
+        self.status.config(text=text)
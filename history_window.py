@@ -0,0 +1,130 @@
+import datetime
+import tkinter as tk
+from tkinter import scrolledtext, ttk
+
+from run_history import since_for
+
+STATUSES = ("All", "done", "failed", "timeout", "cancelled", "error")
+RANGES = (("All time", None), ("Last hour", "hour"), ("Last day", "day"), ("Last week", "week"))
+
+
+def _ms(seconds):
+    return "" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+class RunHistoryWindow(tk.Toplevel):
+    """Browses the run history: filtered runs and per-command duration stats.
+
+    Queries run on the I/O pool; double-click a run to see its stored output.
+    """
+
+    def __init__(self, parent, history, io):
+        super().__init__(parent)
+        self.title("Run History")
+        self.geometry("800x500")
+        self.history = history
+        self.io = io
+        self.runs = []
+
+        bar = tk.Frame(self)
+        bar.pack(side="top", fill="x", padx=5, pady=5)
+        tk.Label(bar, text="CMD:").pack(side="left")
+        self.command_var = tk.StringVar(value="All")
+        self.command_box = ttk.Combobox(bar, textvariable=self.command_var, values=["All"], width=25, state="readonly")
+        self.command_box.pack(side="left", padx=5)
+        tk.Label(bar, text="Status:").pack(side="left")
+        self.status_var = tk.StringVar(value="All")
+        ttk.Combobox(bar, textvariable=self.status_var, values=STATUSES, width=10,
+                     state="readonly").pack(side="left", padx=5)
+        tk.Label(bar, text="When:").pack(side="left")
+        self.range_var = tk.StringVar(value=RANGES[0][0])
+        ttk.Combobox(bar, textvariable=self.range_var, values=[r[0] for r in RANGES], width=10,
+                     state="readonly").pack(side="left", padx=5)
+        tk.Button(bar, text="Refresh", command=self.refresh).pack(side="left", padx=5)
+        for var in (self.command_var, self.status_var, self.range_var):
+            var.trace_add("write", lambda *args: self.refresh())
+
+        runs_frame = tk.LabelFrame(self, text="Runs", padx=5, pady=5)
+        runs_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.runs_table = self._table(runs_frame, (
+            ("started", "Started", 150), ("command", "CMD", 200), ("status", "Status", 80),
+            ("exit", "Exit", 50), ("duration", "Duration", 80), ("output", "Output", 80)))
+        self.runs_table.bind("<Double-Button-1>", lambda e: self.show_output())
+
+        stats_frame = tk.LabelFrame(self, text="Duration per CMD (last 50 runs)", padx=5, pady=5)
+        stats_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.stats_table = self._table(stats_frame, (
+            ("command", "CMD", 200), ("runs", "Runs", 50), ("failures", "Failed", 50), ("p50", "p50", 80),
+            ("p95", "p95", 80), ("recent", "Last 10 p50", 90), ("trend", "Trend", 60)))
+        self.refresh()
+
+    def _table(self, parent, columns):
+        table = ttk.Treeview(parent, columns=[c[0] for c in columns], show="headings", height=8)
+        for name, heading, width in columns:
+            table.heading(name, text=heading)
+            table.column(name, width=width, anchor="w" if name in ("command", "started", "status") else "e")
+        scrollbar = tk.Scrollbar(parent, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        table.pack(fill="both", expand=True)
+        return table
+
+    def refresh(self):
+        command = self.command_var.get()
+        status = self.status_var.get()
+        since = since_for(dict(RANGES).get(self.range_var.get()))
+
+        def load():
+            return (
+                self.history.commands(),
+                self.history.query(command=None if command == "All" else command,
+                                   status=None if status == "All" else status, since=since),
+                self.history.stats(),
+            )
+
+        self.io.submit(load, on_done=self.show, name="Loading run history")
+
+    def show(self, result):
+        if not self.winfo_exists():
+            return
+        commands, runs, stats = result
+        self.command_box.config(values=["All"] + commands)
+        self.runs = runs
+        self.runs_table.delete(*self.runs_table.get_children())
+        for index, run in enumerate(runs):
+            started = datetime.datetime.fromtimestamp(run["started"]).strftime("%Y-%m-%d %H:%M:%S")
+            size = f"{run['output_bytes'] / 1024:.1f} KB" + (" (tail)" if run["truncated"] else "")
+            self.runs_table.insert("", "end", iid=str(index), values=(
+                started, run["command"], run["status"],
+                "" if run["exit_code"] is None else run["exit_code"], _ms(run["duration"]), size))
+        self.stats_table.delete(*self.stats_table.get_children())
+        for stat in stats:
+            trend = ""
+            if stat["p50"] and stat["recent_p50"] is not None:
+                trend = f"{(stat['recent_p50'] / stat['p50'] - 1) * 100:+.0f}%"
+            self.stats_table.insert("", "end", values=(
+                stat["command"], stat["runs"], stat["failures"], _ms(stat["p50"]), _ms(stat["p95"]),
+                _ms(stat["recent_p50"]), trend))
+
+    def show_output(self):
+        selected = self.runs_table.selection()
+        if not selected:
+            return
+        run = self.runs[int(selected[0])]
+        popup = tk.Toplevel(self)
+        popup.title(f"Output: {run['command']}")
+        popup.geometry("600x300")
+        text = scrolledtext.ScrolledText(popup, wrap=tk.NONE)
+        text.pack(fill="both", expand=True)
+
+        def loaded(output):
+            if not text.winfo_exists():
+                return
+            if output is None:
+                output = "(output was rotated out of the history)"
+            elif run["truncated"]:
+                output = "(earlier output was not kept)\n" + output
+            text.insert(tk.END, output)
+            text.config(state="disabled")
+
+        self.io.submit(self.history.output, run["id"], on_done=loaded, name="Loading run output")
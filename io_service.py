@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+
+class IOService:
+    """Bounded thread pool for disk work so the Tk main loop never waits on it.
+
+    ``submit`` returns a ``concurrent.futures.Future``. The ``on_done`` /
+    ``on_error`` callbacks are marshalled back to the Tk thread through the
+    ``UIQueue``, so they may touch widgets. Errors without an ``on_error``
+    callback go to ``report_error``.
+    """
+
+    def __init__(self, ui_queue, max_workers=4, report_error=None):
+        self.ui_queue = ui_queue
+        self.report_error = report_error or (lambda name, exc: print(f"I/O operation {name} failed: {exc}"))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io")
+
+    def submit(self, func, *args, on_done=None, on_error=None, name=None):
+        name = name or getattr(func, "__name__", repr(func))
+        if tracing.TRACER is not None:
+            func = tracing.TRACER.traced(func, name, "io")
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(
+            lambda f: self.ui_queue.post(self._deliver, f, on_done, on_error, name))
+        return future
+
+    def _deliver(self, future, on_done, on_error, name):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            if on_error is not None:
+                on_error(exc)
+            else:
+                self.report_error(name, exc)
+        elif on_done is not None:
+            on_done(future.result())
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,318 @@
+import os
+import shutil
+from collections import namedtuple
+
+# Filenames that were added, removed or changed on disk by a reconcile pass
+Changes = namedtuple("Changes", ["added", "removed", "changed"])
+
+
+def scan_folder(folder, suffix=".txt"):
+    """Return ``{filename: (mtime_ns, size)}`` for matching files in ``folder``.
+
+    Uses ``os.scandir`` so the stat data comes from the directory listing
+    itself where the platform provides it (no extra ``stat`` call per file on
+    Windows). A missing folder scans as empty.
+    """
+    snapshot = {}
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    st = entry.stat()
+                    snapshot[entry.name] = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        pass
+    return snapshot
+
+
+def seed_folder(src_folder, dst_folder, suffix=".txt"):
+    """Copy files from ``src_folder`` that are missing in ``dst_folder``.
+
+    Used to seed the user folders with the boilerplate shipped next to the
+    app. Returns the copied filenames.
+    """
+    copied = []
+    if not os.path.exists(src_folder):
+        return copied
+    for filename in os.listdir(src_folder):
+        if filename.endswith(suffix):
+            dst = os.path.join(dst_folder, filename)
+            if not os.path.exists(dst):
+                shutil.copy2(os.path.join(src_folder, filename), dst)
+                copied.append(filename)
+    return copied
+
+
+def folder_records(kind, folder, suffix=".txt"):
+    """Yield the files of a folder as records, reading one file at a time."""
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                        content = f.read()
+                    yield {"kind": kind, "filename": entry.name, "mtime_ns": entry.stat().st_mtime_ns,
+                           "content": content}
+    except FileNotFoundError:
+        return
+
+
+def write_folder_records(records, folders):
+    """Write streamed records into the folder layout, ``folders`` keyed by kind.
+
+    Keeps each record's mtime. Records of other kinds are skipped. Returns
+    how many files were written.
+    """
+    count = 0
+    for record in records:
+        folder = folders.get(record["kind"])
+        name = os.path.basename(record["filename"])
+        if folder is None or not name:
+            continue
+        path = os.path.join(folder, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(record["content"])
+        if record.get("mtime_ns"):
+            os.utime(path, ns=(record["mtime_ns"], record["mtime_ns"]))
+        count += 1
+    return count
+
+
+def atomic_write(path, text, encoding="utf-8"):
+    """Write ``text`` to ``path`` via a temp file and ``os.replace``.
+
+    Readers (and a crash mid-write) see either the old file or the new one,
+    never a partial write.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding=encoding) as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def stat_file(path):
+    """Return ``(mtime_ns, size)`` for ``path`` or ``None`` if it is gone."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def stat_files(folder, filenames):
+    """Return ``{filename: stat_file(...)}`` for a batch of files in ``folder``."""
+    return {name: stat_file(os.path.join(folder, name)) for name in filenames}
+
+
+class Reconciler:
+    """Keeps a list of ``{"desc", "filename"}`` entries in sync with a folder.
+
+    Entries are keyed by filename and compared against the last known
+    ``(mtime_ns, size)`` of each file, so a refresh only reports what was
+    added, removed or changed and callers can update just those rows.
+    """
+
+    def __init__(self, default_desc=None):
+        # ``default_desc`` of None means "use the filename"
+        self.default_desc = default_desc
+        self.entries = []
+        self.by_name = {}
+        self.snapshot = {}
+
+    def _new_entry(self, filename, desc=None):
+        if desc is None:
+            desc = filename if self.default_desc is None else self.default_desc
+        return {"desc": desc, "filename": filename}
+
+    def load(self, entries):
+        """Replace the entries (e.g. descriptions loaded from disk).
+
+        The stat snapshot is kept so files that did not change are not
+        reported again on the next ``rescan``.
+        """
+        self.entries[:] = []
+        self.by_name.clear()
+        for entry in entries:
+            if entry["filename"] not in self.by_name:
+                self.entries.append(entry)
+                self.by_name[entry["filename"]] = entry
+
+    def rescan(self, folder):
+        """Diff ``folder`` against the known entries and apply the changes."""
+        return self.apply_snapshot(scan_folder(folder))
+
+    def apply_snapshot(self, new):
+        """Apply a ``scan_folder`` result taken elsewhere (e.g. on a worker)."""
+        removed = [name for name in self.by_name if name not in new]
+        added = [name for name in new if name not in self.by_name]
+        changed = [
+            name for name, stat in new.items()
+            if name in self.by_name and self.snapshot.get(name, stat) != stat
+        ]
+        if removed:
+            gone = set(removed)
+            self.entries[:] = [e for e in self.entries if e["filename"] not in gone]
+            for name in removed:
+                del self.by_name[name]
+        for name in added:
+            entry = self._new_entry(name)
+            self.entries.append(entry)
+            self.by_name[name] = entry
+        self.snapshot = new
+        return Changes(added, removed, changed)
+
+    def touch(self, folder, filename, desc=None):
+        """Reconcile a single file after a known create, edit or delete.
+
+        Costs one ``stat`` instead of a directory listing. ``desc`` is applied
+        to the entry when given.
+        """
+        return self.apply_stat(filename, stat_file(os.path.join(folder, filename)), desc)
+
+    def apply_stat(self, filename, stat, desc=None):
+        """Apply a ``stat_file`` result taken elsewhere; ``None`` means deleted."""
+        entry = self.by_name.get(filename)
+        if stat is None:
+            self.snapshot.pop(filename, None)
+            if entry is None:
+                return Changes([], [], [])
+            self.entries.remove(entry)
+            del self.by_name[filename]
+            return Changes([], [filename], [])
+        self.snapshot[filename] = stat
+        if entry is None:
+            entry = self._new_entry(filename, desc)
+            self.entries.append(entry)
+            self.by_name[filename] = entry
+            return Changes([filename], [], [])
+        if desc is not None:
+            entry["desc"] = desc
+        return Changes([], [], [filename])
+
+
+def read_library(metadata, stores, data_files=None):
+    """Read saved descriptions and list every store's folder.
+
+    Disk-only, so it can run on a worker thread; apply the result with
+    ``LibraryStore.load``. ``data_files`` are old JSON files to import once.
+    Returns ``(data, errors, snapshots)`` keyed by store kind.
+    """
+    errors = metadata.import_json(data_files) if data_files else {}
+    data = metadata.load_entries()
+    snapshots = {store.kind: store.scan() for store in stores}
+    return data, errors, snapshots
+
+
+class LibraryStore:
+    """Headless scripts or cmds library: a folder of files plus descriptions.
+
+    The disk methods (``scan``, ``read``, ``write_file``, ``remove_file``)
+    touch no shared state and are safe on worker threads. The ``load`` /
+    ``apply_*`` methods update ``entries`` and the metadata store and belong
+    to the owning thread (the Tk thread in the dashboard). ``refresh``,
+    ``create``, ``update`` and ``delete`` chain the two for headless callers.
+    """
+
+    def __init__(self, kind, folder, metadata, content_cache=None, default_desc=None):
+        self.kind = kind
+        self.folder = folder
+        self.metadata = metadata
+        self.content_cache = content_cache
+        self.reconciler = Reconciler(default_desc)
+        self.entries = self.reconciler.entries
+        self.by_name = self.reconciler.by_name
+
+    def path(self, filename):
+        return os.path.join(self.folder, filename)
+
+    @property
+    def index_source(self):
+        """What the search indexer reads: the folder, or a store with ``scan``/``read_head``."""
+        return self.folder
+
+    # --- Disk work ---
+    def scan(self):
+        return scan_folder(self.folder)
+
+    def stat(self, filenames):
+        return stat_files(self.folder, filenames)
+
+    def read(self, filename):
+        path = self.path(filename)
+        if self.content_cache is not None:
+            return self.content_cache.read(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def write_file(self, filename, content):
+        """Write ``content`` (``None`` keeps the file as is); returns its stat."""
+        path = self.path(filename)
+        if content is not None:
+            if self.content_cache is not None:
+                self.content_cache.write(path, content)
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+        return stat_file(path)
+
+    def remove_file(self, filename):
+        path = self.path(filename)
+        if os.path.exists(path):
+            os.remove(path)
+        if self.content_cache is not None:
+            self.content_cache.invalidate(path)
+        return stat_file(path)
+
+    def records(self):
+        """Stream the files as ``{"kind", "filename", "mtime_ns", "content"}`` records."""
+        return folder_records(self.kind, self.folder)
+
+    # --- State changes ---
+    def load(self, entries, snapshot):
+        """Install saved descriptions and an initial ``scan`` result."""
+        self.reconciler.load(entries)
+        return self.reconciler.apply_snapshot(snapshot)
+
+    def apply_snapshot(self, snapshot):
+        return self.reconciler.apply_snapshot(snapshot)
+
+    def apply_stats(self, stats):
+        """Apply a ``stat`` result; returns the combined ``Changes``."""
+        added, removed, changed = [], [], []
+        for filename, stat in stats.items():
+            changes = self.reconciler.apply_stat(filename, stat)
+            added += changes.added
+            removed += changes.removed
+            changed += changes.changed
+        return Changes(added, removed, changed)
+
+    def apply_stat(self, filename, stat, desc=None):
+        """Apply a known create or edit; ``desc`` is saved when given."""
+        changes = self.reconciler.apply_stat(filename, stat, desc)
+        if desc is not None and stat is not None:
+            self.metadata.set_desc(self.kind, filename, desc)
+        return changes
+
+    def apply_delete(self, filename, stat):
+        """Apply a deletion made through the dashboard and drop its description."""
+        changes = self.reconciler.apply_stat(filename, stat)
+        self.metadata.delete_entry(self.kind, filename)
+        return changes
+
+    # --- Synchronous helpers for headless callers ---
+    def refresh(self):
+        return self.apply_snapshot(self.scan())
+
+    def create(self, filename, content, desc=None):
+        return self.apply_stat(filename, self.write_file(filename, content), desc)
+
+    update = create
+
+    def touch(self, filename, desc=None):
+        """Pick up a file changed outside the store (one ``stat``)."""
+        return self.apply_stat(filename, self.stat([filename])[filename], desc)
+
+    def delete(self, filename):
+        return self.apply_delete(filename, self.remove_file(filename))
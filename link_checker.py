@@ -0,0 +1,210 @@
+import http.client
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Results younger than this are reused instead of rechecked
+LINK_CHECK_TTL = 6 * 3600
+# Connections (and requests in flight) per host
+PER_HOST = 2
+# Minimum gap between requests to the same host, in seconds
+MIN_INTERVAL = 0.2
+TIMEOUT = 10.0
+USER_AGENT = "TSE-Dashboard link checker"
+
+# Result states
+OK, DEAD, ERROR, SKIPPED = "ok", "dead", "error", "skipped"
+
+
+def _result(url, state, code=None, detail=""):
+    return {"url": url, "state": state, "code": code, "detail": detail, "checked": time.time()}
+
+
+class HostPool:
+    """Keep-alive connections to one ``scheme://host:port``.
+
+    At most ``size`` requests are in flight at once and requests start at
+    least ``min_interval`` seconds apart. Idle connections are reused; one
+    the server has closed is replaced and the request retried once.
+    """
+
+    def __init__(self, scheme, netloc, size=PER_HOST, timeout=TIMEOUT, min_interval=MIN_INTERVAL):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.connections_opened = 0
+        self._slots = threading.Semaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._next_start = 0.0
+
+    def _connect(self):
+        self.connections_opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.netloc, timeout=self.timeout,
+                                               context=ssl.create_default_context())
+        return http.client.HTTPConnection(self.netloc, timeout=self.timeout)
+
+    def _wait_turn(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def request(self, method, path):
+        """Send one request and return ``(status, reason)``."""
+        with self._slots:
+            self._wait_turn()
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect()
+            try:
+                status, reason, reusable = self._send(conn, method, path)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection
+                conn = self._connect()
+                status, reason, reusable = self._send(conn, method, path)
+            except Exception:
+                conn.close()
+                raise
+            if reusable:
+                with self._lock:
+                    self._idle.append(conn)
+            else:
+                conn.close()
+            return status, reason
+
+    @staticmethod
+    def _send(conn, method, path):
+        conn.request(method, path, headers={"User-Agent": USER_AGENT, "Accept": "*/*"})
+        response = conn.getresponse()
+        if method == "HEAD":
+            response.read()
+            return response.status, response.reason, not response.will_close
+        # Only the status matters; drop the connection rather than read the body
+        response.close()
+        return response.status, response.reason, False
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class LinkChecker:
+    """Checks Helpful Links in the background and caches the results.
+
+    Links are checked concurrently on a small thread pool through one
+    ``HostPool`` per host, so links on the same server share keep-alive
+    connections and its rate limit. Each result is posted to
+    ``on_result(result)`` on the Tk thread through ``ui_queue``; a result
+    is ``{"url", "state", "code", "detail", "checked"}`` with ``state`` one of
+    ``"ok"``, ``"dead"`` (4xx/5xx), ``"error"`` (no response) or
+    ``"skipped"`` (not http/https). Results younger than ``ttl`` seconds are
+    not rechecked unless forced.
+    """
+
+    def __init__(self, ui_queue, on_result, max_workers=8, per_host=PER_HOST, timeout=TIMEOUT,
+                 min_interval=MIN_INTERVAL, ttl=LINK_CHECK_TTL):
+        self.ui_queue = ui_queue
+        self.on_result = on_result
+        self.per_host = per_host
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.ttl = ttl
+        self.results = {}
+        self.pending = set()
+        self._pools = {}
+        self._futures = set()  # checks submitted and not finished, cancelled at shutdown
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="link-check")
+
+    def load(self, results):
+        """Seed the cache with stored results, ``{url: result}``."""
+        self.results.update(results)
+
+    def is_fresh(self, url, now=None):
+        result = self.results.get(url)
+        return result is not None and (now or time.time()) - result["checked"] < self.ttl
+
+    def check(self, urls, force=False):
+        """Queue the ``urls`` that are stale (or all of them with ``force``); returns those queued."""
+        now = time.time()
+        queued = []
+        for url in dict.fromkeys(urls):
+            if url in self.pending or (not force and self.is_fresh(url, now)):
+                continue
+            self.pending.add(url)
+            queued.append(url)
+            future = self._executor.submit(self._check, url)
+            with self._lock:
+                self._futures.add(future)
+            future.add_done_callback(self._forget)
+        return queued
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _pool(self, scheme, netloc):
+        with self._lock:
+            pool = self._pools.get((scheme, netloc))
+            if pool is None:
+                pool = self._pools[(scheme, netloc)] = HostPool(
+                    scheme, netloc, self.per_host, self.timeout, self.min_interval)
+            return pool
+
+    def check_url(self, url):
+        """Check one URL on the calling thread and return its result."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            return _result(url, SKIPPED, detail="not an http(s) link")
+        pool = self._pool(parts.scheme, parts.netloc)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        try:
+            status, reason = pool.request("HEAD", path)
+            if status in (405, 501):
+                # Some servers refuse HEAD; ask for the page instead
+                status, reason = pool.request("GET", path)
+        except (OSError, http.client.HTTPException) as e:
+            return _result(url, ERROR, detail=str(e) or type(e).__name__)
+        # Redirects count as alive; the browser follows them
+        return _result(url, OK if status < 400 else DEAD, status, reason)
+
+    def _check(self, url):
+        try:
+            result = self.check_url(url)
+        except Exception as e:
+            result = _result(url, ERROR, detail=str(e))
+        self.ui_queue.post(self._deliver, result)
+
+    def _deliver(self, result):
+        if self._closed:
+            return  # checks still in flight at exit
+        self.pending.discard(result["url"])
+        self.results[result["url"]] = result
+        self.on_result(result)
+
+    def shutdown(self):
+        self._closed = True
+        with self._lock:
+            futures = list(self._futures)
+            pools = list(self._pools.values())
+        # Drop queued checks by hand: shutdown(cancel_futures=True) needs Python 3.9
+        for future in futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+        for pool in pools:
+            pool.close()
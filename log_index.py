@@ -0,0 +1,303 @@
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+# Kept free of tkinter: search workers import this module in fresh processes.
+
+BLOCK = 64 * 1024  # bytes per line-index block
+READ_SIZE = 4 * 1024 * 1024  # index build read size
+CHUNK_BYTES = 32 * 1024 * 1024  # bytes per search task
+MAX_HITS = 5000
+MAX_LINE_CHARS = 2000  # longer lines are cut when shown
+
+
+def decode_line(raw):
+    text = raw.rstrip(b"\r").decode("utf-8", errors="replace")
+    if len(text) > MAX_LINE_CHARS:
+        text = text[:MAX_LINE_CHARS] + " ..."
+    return text
+
+
+class LogFile:
+    """Read-only, memory-mapped view of a log file with a sparse line index.
+
+    Opening maps the file and returns at once; lines can be read forward
+    from any byte offset straight away. ``build_index`` (run on a background
+    thread) counts newlines per ``BLOCK`` bytes into ``block_lines``, where
+    ``block_lines[i]`` is the number of lines that end before byte
+    ``i * BLOCK``. Finding the offset of line ``n`` is then a bisect plus a
+    scan inside one block, so the index stays around 1 MB for a 1 GB log.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.block_lines = array("Q", [0])
+        self.indexed_bytes = 0
+        self.complete = self.size == 0
+        self._cancel = threading.Event()
+
+    def close(self):
+        self._cancel.set()
+        if self.size:
+            self.mm.close()
+        self._file.close()
+
+    # --- Line index ---
+    def build_index(self, progress=None):
+        """Count lines per block; ``progress(indexed_bytes)`` is called after each read.
+
+        Reads through its own file handle so ``close`` never pulls the map
+        out from under it. Returns ``False`` if cancelled by ``close``.
+        """
+        with open(self.path, "rb") as f:
+            total = 0
+            while not self._cancel.is_set():
+                data = f.read(READ_SIZE)
+                if not data:
+                    break
+                for start in range(0, len(data), BLOCK):
+                    total += data.count(b"\n", start, start + BLOCK)
+                    self.block_lines.append(total)
+                self.indexed_bytes += len(data)
+                if progress is not None:
+                    progress(self.indexed_bytes)
+        if self._cancel.is_set():
+            return False
+        self.complete = True
+        return True
+
+    def line_count(self):
+        """Lines indexed so far (all lines once ``complete``)."""
+        count = self.block_lines[-1]
+        if self.complete and self.size and self.mm[self.size - 1:self.size] != b"\n":
+            count += 1  # last line has no newline
+        return count
+
+    def line_offset(self, n):
+        """Byte offset where line ``n`` (0-based) starts, or ``None`` past the end."""
+        if n <= 0:
+            return 0
+        block = bisect_left(self.block_lines, n) - 1  # last block starting before line n
+        pos = block * BLOCK
+        for _ in range(n - self.block_lines[block]):
+            pos = self.mm.find(b"\n", pos) + 1
+            if pos == 0 or pos >= self.size:
+                return None
+        return pos
+
+    def line_number(self, offset):
+        """Line containing byte ``offset``, or ``None`` if not indexed yet."""
+        block = offset // BLOCK
+        if block >= len(self.block_lines):
+            return None
+        return self.block_lines[block] + self.mm[block * BLOCK:offset].count(b"\n")
+
+    # --- Reading ---
+    def read_lines(self, offset, count):
+        """Up to ``count`` decoded lines starting at ``offset``; returns ``(lines, next_offset)``."""
+        lines = []
+        while len(lines) < count and offset < self.size:
+            end = self.mm.find(b"\n", offset)
+            if end < 0:
+                end = self.size
+            lines.append(decode_line(self.mm[offset:end]))
+            offset = end + 1
+        return lines, min(offset, self.size)
+
+    def skip_lines(self, offset, delta):
+        """Offset of the line ``delta`` lines after (or before, if negative) the one at ``offset``.
+
+        Stops at the first or last line; returns ``(offset, lines moved)``.
+        """
+        moved = 0
+        if delta > 0:
+            while moved < delta:
+                end = self.mm.find(b"\n", offset)
+                if end < 0 or end + 1 >= self.size:
+                    break
+                offset = end + 1
+                moved += 1
+        else:
+            while moved > delta and offset > 0:
+                offset = self.mm.rfind(b"\n", 0, offset - 1) + 1
+                moved -= 1
+        return offset, moved
+
+
+# --- Parallel search ---
+def compile_query(query, regex=False, match_case=False):
+    """Bytes pattern for a keyword or regex query; raises ``re.error`` if invalid.
+
+    ``^`` and ``$`` match at line boundaries.
+    """
+    pattern = query if regex else re.escape(query)
+    return re.compile(pattern.encode("utf-8"), re.MULTILINE if match_case else re.MULTILINE | re.IGNORECASE)
+
+
+def literal_needle(query, regex=False, match_case=False):
+    """Bytes to look for with ``bytes.find`` when the query is a plain keyword, else ``None``.
+
+    Lower-cased for case-insensitive searches, which then run over a
+    lower-cased copy of the chunk; like ``re.IGNORECASE`` on bytes this
+    folds ASCII only, and it keeps every offset the same.
+    """
+    if regex:
+        return None
+    needle = query.encode("utf-8")
+    return needle if match_case else needle.lower()
+
+
+def search_chunk(path, start, end, pattern, flags, max_hits, literal=None):
+    """Search bytes ``[start, end)`` of ``path`` (both on line boundaries).
+
+    Runs in a worker process. Keyword searches pass ``literal`` and use
+    ``bytes.find``, several times faster than the equivalent regex. Returns
+    ``(lines in chunk, hits)`` with one hit per matching line as
+    ``(line in chunk, line offset, text)``.
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[start:end]
+    if literal is not None:
+        haystack = data.lower() if flags & re.IGNORECASE else data
+
+        def find(pos):
+            return haystack.find(literal, pos)
+    else:
+        regex = re.compile(pattern, flags)
+
+        def find(pos):
+            match = regex.search(data, pos)
+            return -1 if match is None else match.start()
+    hits = []
+    line = 0
+    counted = 0  # data[:counted] has been counted into ``line``
+    pos = 0
+    while len(hits) < max_hits:
+        found = find(pos)
+        if found < 0:
+            break
+        line_start = data.rfind(b"\n", 0, found) + 1
+        line_end = data.find(b"\n", found)
+        if line_end < 0:
+            line_end = len(data)
+        line += data.count(b"\n", counted, line_start)
+        counted = line_start
+        hits.append((line, start + line_start, decode_line(data[line_start:line_end])))
+        pos = line_end + 1
+    return line + data.count(b"\n", counted), hits
+
+
+class LogSearch:
+    """Splits a search across a process pool by chunk and streams hits in file order.
+
+    Chunks end on line boundaries. Results are collected in order on a
+    driver thread so each hit gets its absolute line number from the line
+    counts of the chunks before it; ``on_hits(hits)`` receives batches of
+    ``(line, offset, text)`` and ``on_done(total, stopped, error)`` is called
+    once, ``stopped`` meaning cancelled or capped at ``max_hits``.
+    Both run on the driver thread; post them to the UI queue.
+    """
+
+    def __init__(self, pool, log, regex, on_hits, on_done, literal=None, max_hits=MAX_HITS,
+                 chunk_bytes=CHUNK_BYTES):
+        self.pool = pool
+        self.log = log
+        self.regex = regex
+        self.literal = literal
+        self.on_hits = on_hits
+        self.on_done = on_done
+        self.max_hits = max_hits
+        self.chunk_bytes = chunk_bytes
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-search", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def chunks(self):
+        start = 0
+        while start < self.log.size:
+            end = self.log.mm.find(b"\n", min(start + self.chunk_bytes, self.log.size) - 1)
+            end = self.log.size if end < 0 else end + 1
+            yield start, end
+            start = end
+
+    def _run(self):
+        futures = []
+        total = 0
+        first_line = 0
+        stopped = False
+        error = None
+        try:
+            for start, end in self.chunks():
+                futures.append(_track(self.pool.submit(search_chunk, self.log.path, start, end, self.regex.pattern,
+                                                       self.regex.flags, self.max_hits, self.literal)))
+            for future in futures:
+                if self._cancel.is_set():
+                    stopped = True
+                    break
+                lines, hits = future.result()
+                hits = [(first_line + line, offset, text) for line, offset, text in hits]
+                first_line += lines
+                if hits:
+                    hits = hits[:self.max_hits - total]
+                    total += len(hits)
+                    self.on_hits(hits)
+                if total >= self.max_hits:
+                    stopped = True
+                    break
+        except Exception as e:  # worker crashed, file went away, pool shut down
+            error = e
+        finally:
+            for future in futures:
+                future.cancel()
+        self.on_done(total, stopped, error)
+
+
+_pool = None
+_pending = set()  # chunk searches submitted and not finished, cancelled at shutdown
+_pending_lock = threading.Lock()
+
+
+def _track(future):
+    with _pending_lock:
+        _pending.add(future)
+    future.add_done_callback(_untrack)
+    return future
+
+
+def _untrack(future):
+    with _pending_lock:
+        _pending.discard(future)
+
+
+def search_pool():
+    """Shared worker pool, started on the first search."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        with _pending_lock:
+            futures = list(_pending)
+        # Drop queued chunks by hand: shutdown(cancel_futures=True) needs Python 3.9
+        for future in futures:
+            future.cancel()
+        _pool.shutdown(wait=False)
+        _pool = None
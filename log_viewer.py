@@ -0,0 +1,259 @@
+import os
+import re
+import threading
+import time
+import tkinter as tk
+from tkinter import filedialog, font as tkfont, messagebox
+
+from log_index import LogFile, LogSearch, compile_query, literal_needle, search_pool
+
+CONTEXT_LINES = 3  # lines kept above a jump target
+HIT_PREVIEW_CHARS = 200
+
+
+class LogViewer(tk.LabelFrame):
+    """Viewer for large log files next to the Notes pane.
+
+    The file is memory-mapped and only the lines that fit in the text area
+    are decoded and shown, so opening is instant whatever the size. The
+    line index is built on a background thread; until it finishes the
+    scrollbar covers the lines counted so far. Searches run across the
+    ``log_index`` process pool and stream hits into the list below;
+    double-click a hit (or type a line number) to jump to it.
+    """
+
+    def __init__(self, parent, ui_queue):
+        super().__init__(parent, text="Log Viewer", padx=10, pady=10)
+        self.ui_queue = ui_queue
+        self.log = None
+        self.top_line = 0
+        self.top_offset = 0
+        self.rows = 10
+        self.mark_line = None  # highlighted jump target
+        self.search = None
+        self.hits = []
+        self._search_started = 0.0
+
+        bar = tk.Frame(self)
+        bar.pack(side="top", fill="x")
+        tk.Button(bar, text="Open Log...", command=self.open_log).pack(side="left")
+        self.query_var = tk.StringVar()
+        query_entry = tk.Entry(bar, textvariable=self.query_var, width=20)
+        query_entry.pack(side="left", fill="x", expand=True, padx=5)
+        query_entry.bind("<Return>", lambda e: self.start_search())
+        self.regex_var = tk.BooleanVar()
+        tk.Checkbutton(bar, text="Regex", variable=self.regex_var).pack(side="left")
+        self.case_var = tk.BooleanVar()
+        tk.Checkbutton(bar, text="Match case", variable=self.case_var).pack(side="left")
+        tk.Button(bar, text="Search", command=self.start_search).pack(side="left", padx=2)
+        tk.Button(bar, text="Stop", command=self.stop_search).pack(side="left")
+        tk.Label(bar, text="Line:").pack(side="left", padx=(8, 0))
+        self.line_var = tk.StringVar()
+        line_entry = tk.Entry(bar, textvariable=self.line_var, width=9)
+        line_entry.pack(side="left")
+        line_entry.bind("<Return>", lambda e: self.goto_typed_line())
+
+        self.status = tk.Label(self, anchor="w", text="No log open")
+        self.status.pack(side="bottom", fill="x")
+        self.hit_list = tk.Listbox(self, height=5)
+        self.hit_list.pack(side="bottom", fill="x")
+        self.hit_list.bind("<Double-Button-1>", lambda e: self.open_hit())
+        self.hit_list.bind("<Return>", lambda e: self.open_hit())
+
+        body = tk.Frame(self)
+        body.pack(side="top", fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(body, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        xscroll = tk.Scrollbar(body, orient="horizontal")
+        xscroll.pack(side="bottom", fill="x")
+        # Holds exactly the visible lines; scrolling re-renders from the map
+        self.text = tk.Text(body, wrap=tk.NONE, height=10, width=60, xscrollcommand=xscroll.set)
+        self.text.pack(side="left", fill="both", expand=True)
+        xscroll.config(command=self.text.xview)
+        self.text.tag_configure("lineno", foreground="gray")
+        self.text.tag_configure("mark", background="#fff2a8")
+        self.text.config(state="disabled")
+        self.linespace = tkfont.Font(font=self.text["font"]).metrics("linespace")
+        self.text.bind("<Configure>", self._on_resize)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text.bind(sequence, self._on_wheel)
+        for key, args in (("<Prior>", ("scroll", -1, "pages")), ("<Next>", ("scroll", 1, "pages")),
+                          ("<Up>", ("scroll", -1, "units")), ("<Down>", ("scroll", 1, "units"))):
+            self.text.bind(key, lambda e, args=args: self.yview(*args) or "break")
+
+    # --- Opening ---
+    def open_log(self, path=None):
+        path = path or filedialog.askopenfilename(filetypes=[("Log files", "*.log *.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            log = LogFile(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not open {path}: {e}")
+            return
+        self.close()
+        self.log = log
+        self.top_line, self.top_offset, self.mark_line = 0, 0, None
+        self.hit_list.delete(0, tk.END)
+        self.hits = []
+        self.render()
+        threading.Thread(target=self._build_index, args=(log,), name="log-index", daemon=True).start()
+
+    def _build_index(self, log):
+        started = time.perf_counter()
+        try:
+            done = log.build_index(progress=lambda _bytes: self.ui_queue.post(self._indexed, log, None))
+        except OSError as e:
+            self.ui_queue.post(self.status.config, {"text": f"Indexing failed: {e}"})
+            return
+        if done:
+            self.ui_queue.post(self._indexed, log, time.perf_counter() - started)
+
+    def _indexed(self, log, elapsed):
+        if log is not self.log:
+            return  # closed since
+        self._update_scrollbar()
+        if self.search is None:
+            self.show_status(elapsed)
+
+    def show_status(self, index_seconds=None):
+        log = self.log
+        text = f"{os.path.basename(log.path)}: {log.size / 1e6:,.1f} MB, {log.line_count():,} lines"
+        if not log.complete:
+            text += f" (indexing {100 * log.indexed_bytes // max(1, log.size)}%)"
+        elif index_seconds is not None:
+            text += f" (indexed in {index_seconds:.1f}s)"
+        self.status.config(text=text)
+
+    def close(self):
+        """Stop any search and unmap the current log."""
+        self.stop_search()
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    # --- Viewport ---
+    def render(self):
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        if self.log is not None:
+            lines, _next = self.log.read_lines(self.top_offset, self.rows)
+            for i, line in enumerate(lines):
+                number = self.top_line + i
+                self.text.insert(tk.END, f"{number + 1:>9}  ", "lineno")
+                self.text.insert(tk.END, line + "\n", "mark" if number == self.mark_line else ())
+        self.text.config(state="disabled")
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = max(self.log.line_count() if self.log is not None else 0, self.top_line + self.rows)
+        self.scrollbar.set(self.top_line / total, min(1.0, (self.top_line + self.rows) / total))
+
+    def yview(self, *args):
+        if self.log is None or not args:
+            return
+        if args[0] == "moveto":
+            total = self.log.line_count()
+            target = min(int(float(args[1]) * total), max(0, total - self.rows))
+            offset = self.log.line_offset(target)
+            if offset is None:
+                return
+            self.top_line, self.top_offset = target, offset
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.rows if args[2] == "pages" else 1)
+            self.top_offset, moved = self.log.skip_lines(self.top_offset, step)
+            self.top_line += moved
+        self.render()
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.yview("scroll", step * 3, "units")
+        return "break"
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self.linespace)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    def goto_line(self, line, offset=None):
+        """Show ``line`` (0-based) highlighted, a few lines below the top."""
+        if self.log is None:
+            return
+        if offset is None:
+            offset = self.log.line_offset(line)
+            if offset is None:
+                messagebox.showinfo("Log Viewer", f"Line {line + 1:,} is past the end of the log"
+                                    + ("" if self.log.complete else " or not indexed yet"))
+                return
+        self.top_offset, moved = self.log.skip_lines(offset, -CONTEXT_LINES)
+        self.top_line = line + moved
+        self.mark_line = line
+        self.render()
+
+    def goto_typed_line(self):
+        try:
+            line = int(self.line_var.get().replace(",", "")) - 1
+        except ValueError:
+            return
+        self.goto_line(max(0, line))
+
+    # --- Search ---
+    def start_search(self):
+        query = self.query_var.get()
+        if self.log is None or not query:
+            return
+        use_regex, match_case = self.regex_var.get(), self.case_var.get()
+        try:
+            regex = compile_query(query, regex=use_regex, match_case=match_case)
+        except re.error as e:
+            messagebox.showerror("Error", f"Invalid regular expression: {e}")
+            return
+        self.stop_search()
+        self.hits = []
+        self.hit_list.delete(0, tk.END)
+        search = LogSearch(search_pool(), self.log, regex,
+                           on_hits=lambda hits: self.ui_queue.post(self._add_hits, search, hits),
+                           on_done=lambda *result: self.ui_queue.post(self._search_done, search, *result),
+                           literal=literal_needle(query, regex=use_regex, match_case=match_case))
+        self.search = search
+        self._search_started = time.perf_counter()
+        self.status.config(text="Searching...")
+        search.start()
+
+    def stop_search(self):
+        if self.search is not None:
+            self.search.cancel()
+            self.search = None
+
+    def _add_hits(self, search, hits):
+        if search is not self.search:
+            return  # superseded
+        self.hits.extend(hits)
+        for line, _offset, text in hits:
+            self.hit_list.insert(tk.END, f"{line + 1:>9}: {text[:HIT_PREVIEW_CHARS]}")
+        self.status.config(text=f"Searching... {len(self.hits):,} hits")
+
+    def _search_done(self, search, total, stopped, error):
+        if search is not self.search:
+            return
+        self.search = None
+        if error is not None:
+            self.status.config(text=f"Search failed: {error}")
+            return
+        elapsed = time.perf_counter() - self._search_started
+        text = f"{total:,} hits in {elapsed:.2f}s ({self.log.size / 1e6 / max(elapsed, 1e-6):,.0f} MB/s)"
+        if stopped:
+            text = f"Showing the first {total:,} hits"
+        self.status.config(text=text)
+
+    def open_hit(self):
+        selected = self.hit_list.curselection()
+        if selected and selected[0] < len(self.hits):
+            line, offset, _text = self.hits[selected[0]]
+            self.goto_line(line, offset)
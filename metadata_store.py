@@ -0,0 +1,215 @@
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    desc TEXT NOT NULL,
+    PRIMARY KEY (kind, filename)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS links (
+    id INTEGER PRIMARY KEY,
+    desc TEXT NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS link_status (
+    url TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    code INTEGER,
+    detail TEXT NOT NULL,
+    checked REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tags (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (kind, key, tag)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS usage (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    score REAL NOT NULL,
+    opens INTEGER NOT NULL,
+    copies INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    last_used REAL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class MetadataStore:
+    """SQLite store for descriptions, tags, use counts, Helpful Links and their last health check.
+
+    Every change is its own small transaction, so an edit is persisted as it
+    happens (O(1) per edit) and a crash loses nothing that was already
+    saved. Writes are queued on a single writer thread: they never block the
+    Tk thread and are applied in the order they were made. Reads are meant
+    for the I/O pool (startup).
+    """
+
+    def __init__(self, path, on_error=None):
+        self.path = path
+        self.on_error = on_error or (lambda exc: print(f"Metadata write failed: {exc}"))
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata")
+
+    # --- Reads ---
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def import_json(self, data_files):
+        """One-time import of the old ``scripts_data.json``/``cmds_data.json``.
+
+        ``data_files`` maps kind to JSON path. Returns ``{kind: error}`` for
+        files that could not be read.
+        """
+        errors = {}
+        with self._lock:
+            if self._get_meta("json_imported"):
+                return errors
+            rows = []
+            for kind, path in data_files.items():
+                if not os.path.exists(path):
+                    continue
+                try:
+                    with open(path, "r") as f:
+                        rows.extend((kind, e["filename"], e["desc"]) for e in json.load(f))
+                except Exception as e:
+                    errors[kind] = e
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO entries (kind, filename, desc) VALUES (?, ?, ?)", rows)
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', '1')")
+        return errors
+
+    def _load_tags(self, kind=None):
+        tags = {}
+        rows = self.conn.execute("SELECT kind, key, tag FROM tags ORDER BY tag") if kind is None else \
+            self.conn.execute("SELECT kind, key, tag FROM tags WHERE kind = ? ORDER BY tag", (kind,))
+        for row_kind, key, tag in rows:
+            tags.setdefault((row_kind, key), []).append(tag)
+        return tags
+
+    def load_entries(self):
+        """Return ``{kind: [{"desc", "filename", "tags"}, ...]}``."""
+        result = {}
+        with self._lock:
+            tags = self._load_tags()
+            for kind, filename, desc in self.conn.execute("SELECT kind, filename, desc FROM entries"):
+                result.setdefault(kind, []).append(
+                    {"desc": desc, "filename": filename, "tags": tuple(tags.get((kind, filename), ()))})
+        return result
+
+    def load_links(self, defaults=()):
+        """Return the links in display order, ``[{"id", "desc", "url", "tags"}]``.
+
+        ``defaults`` are stored the first time the store is opened.
+        """
+        with self._lock:
+            if not self._get_meta("links_seeded"):
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT INTO links (desc, url) VALUES (?, ?)",
+                        [(link["desc"], link["url"]) for link in defaults])
+                    self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('links_seeded', '1')")
+            tags = self._load_tags("links")
+            return [
+                {"id": link_id, "desc": desc, "url": url, "tags": tuple(tags.get(("links", str(link_id)), ()))}
+                for link_id, desc, url in self.conn.execute("SELECT id, desc, url FROM links ORDER BY id")
+            ]
+
+    def load_usage(self):
+        """Return the use counts and frecency scores, ``{kind: {key: record}}`` (see ``usage_rank``)."""
+        result = {}
+        with self._lock:
+            for kind, key, score, opens, copies, runs, last_used in self.conn.execute(
+                    "SELECT kind, key, score, opens, copies, runs, last_used FROM usage"):
+                result.setdefault(kind, {})[key] = {
+                    "score": score, "opens": opens, "copies": copies, "runs": runs, "last_used": last_used}
+        return result
+
+    def get_setting(self, key, default=None):
+        with self._lock:
+            value = self._get_meta(f"setting:{key}")
+        return default if value is None else value
+
+    def load_link_status(self):
+        """Return the cached link checks, ``{url: {"url", "state", "code", "detail", "checked"}}``."""
+        with self._lock:
+            return {
+                url: {"url": url, "state": state, "code": code, "detail": detail, "checked": checked}
+                for url, state, code, detail, checked in self.conn.execute(
+                    "SELECT url, state, code, detail, checked FROM link_status")
+            }
+
+    # --- Writes (queued, applied in order) ---
+    def _submit(self, sql, params):
+        return self._submit_all([(sql, params)])
+
+    def _submit_all(self, statements):
+        """Queue ``[(sql, params)]`` to run as one transaction."""
+        def run():
+            with self._lock, self.conn:
+                for sql, params in statements:
+                    self.conn.execute(sql, params)
+
+        future = self._writer.submit(run)
+        future.add_done_callback(lambda f: f.exception() and self.on_error(f.exception()))
+        return future
+
+    def set_desc(self, kind, filename, desc):
+        return self._submit(
+            "INSERT OR REPLACE INTO entries (kind, filename, desc) VALUES (?, ?, ?)", (kind, filename, desc))
+
+    def delete_entry(self, kind, filename):
+        return self._submit_all([("DELETE FROM entries WHERE kind = ? AND filename = ?", (kind, filename)),
+                                 ("DELETE FROM tags WHERE kind = ? AND key = ?", (kind, filename)),
+                                 ("DELETE FROM usage WHERE kind = ? AND key = ?", (kind, filename))])
+
+    def save_usage(self, kind, key, record):
+        return self._submit(
+            "INSERT OR REPLACE INTO usage (kind, key, score, opens, copies, runs, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (kind, str(key), record["score"], record["opens"], record["copies"], record["runs"], record["last_used"]))
+
+    def set_tags(self, kind, key, tags):
+        """Replace the tags of a script or CMD (``key`` is the filename) or link (its id)."""
+        key = str(key)
+        return self._submit_all([("DELETE FROM tags WHERE kind = ? AND key = ?", (kind, key))] + [
+            ("INSERT INTO tags (kind, key, tag) VALUES (?, ?, ?)", (kind, key, tag)) for tag in tags])
+
+    def save_link(self, link):
+        return self._submit(
+            "INSERT OR REPLACE INTO links (id, desc, url) VALUES (?, ?, ?)", (link["id"], link["desc"], link["url"]))
+
+    def delete_link(self, link_id):
+        return self._submit_all([("DELETE FROM links WHERE id = ?", (link_id,)),
+                                 ("DELETE FROM tags WHERE kind = 'links' AND key = ?", (str(link_id),))])
+
+    def set_setting(self, key, value):
+        return self._submit("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (f"setting:{key}", value))
+
+    def save_link_status(self, result):
+        return self._submit(
+            "INSERT OR REPLACE INTO link_status (url, state, code, detail, checked) VALUES (?, ?, ?, ?, ?)",
+            (result["url"], result["state"], result["code"], result["detail"], result["checked"]))
+
+    def close(self):
+        """Wait for queued writes and close the database."""
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self.conn.close()
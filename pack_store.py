@@ -0,0 +1,222 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from library import LibraryStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    content TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS files_name ON files (kind, filename);
+CREATE INDEX IF NOT EXISTS files_stat ON files (kind, filename, mtime_ns, size);
+"""
+
+# Rows written per transaction by bulk imports
+BATCH_ROWS = 500
+
+
+def _size(content):
+    return len(content.encode("utf-8"))
+
+
+class PackFile:
+    """Whole scripts/cmds library in one indexed SQLite file.
+
+    Files are rows keyed by ``(kind, filename)``; a covering index answers
+    a scan (``{filename: (mtime_ns, size)}``, the same shape as
+    ``scan_folder``) without touching file contents, and reads are one
+    index lookup. Bulk imports and exports stream rows in batches so large
+    libraries never have to fit in memory. Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # --- Random access ---
+    def scan(self, kind):
+        with self._lock:
+            return {name: (mtime_ns, size) for name, mtime_ns, size in self.conn.execute(
+                "SELECT filename, mtime_ns, size FROM files WHERE kind = ?", (kind,))}
+
+    def stat(self, kind, filenames):
+        result = {}
+        with self._lock:
+            for name in filenames:
+                row = self.conn.execute("SELECT mtime_ns, size FROM files WHERE kind = ? AND filename = ?",
+                                        (kind, name)).fetchone()
+                result[name] = tuple(row) if row else None
+        return result
+
+    def read(self, kind, filename, limit=None):
+        """Content of a file (its first ``limit`` characters if given)."""
+        sql = "SELECT content FROM files WHERE kind = ? AND filename = ?"
+        params = (kind, filename)
+        if limit is not None:
+            sql = "SELECT substr(content, 1, ?) FROM files WHERE kind = ? AND filename = ?"
+            params = (limit, kind, filename)
+        with self._lock:
+            row = self.conn.execute(sql, params).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{kind}/{filename} is not in {self.path}")
+        return row[0]
+
+    def write(self, kind, filename, content, mtime_ns=None):
+        """Store a file; returns its new ``(mtime_ns, size)``."""
+        stat = (mtime_ns or time.time_ns(), _size(content))
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO files (kind, filename, content, mtime_ns, size) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (kind, filename) DO UPDATE SET content = excluded.content,"
+                " mtime_ns = excluded.mtime_ns, size = excluded.size",
+                (kind, filename, content) + stat)
+        return stat
+
+    def remove(self, kind, filename):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM files WHERE kind = ? AND filename = ?", (kind, filename))
+
+    def count(self, kind=None):
+        with self._lock:
+            if kind is None:
+                return self.conn.execute("SELECT count(*) FROM files").fetchone()[0]
+            return self.conn.execute("SELECT count(*) FROM files WHERE kind = ?", (kind,)).fetchone()[0]
+
+    # --- Streaming ---
+    def records(self, kinds=None):
+        """Yield ``{"kind", "filename", "mtime_ns", "content"}`` for every file, one at a time.
+
+        Uses its own connection, so a long export does not hold up reads
+        and writes from the dashboard.
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            sql = "SELECT kind, filename, mtime_ns, content FROM files"
+            params = ()
+            if kinds:
+                sql += f" WHERE kind IN ({', '.join('?' * len(kinds))})"
+                params = tuple(kinds)
+            for kind, filename, mtime_ns, content in conn.execute(sql + " ORDER BY kind, filename", params):
+                yield {"kind": kind, "filename": filename, "mtime_ns": mtime_ns, "content": content}
+        finally:
+            conn.close()
+
+    def import_records(self, records, replace=True):
+        """Store streamed records in batches; returns how many were written.
+
+        With ``replace=False`` files already in the pack are kept.
+        """
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        sql = f"{verb} INTO files (kind, filename, content, mtime_ns, size) VALUES (?, ?, ?, ?, ?)"
+        count = 0
+        batch = []
+        for record in records:
+            content = record["content"]
+            batch.append((record["kind"], os.path.basename(record["filename"]), content,
+                          record.get("mtime_ns") or time.time_ns(), _size(content)))
+            if len(batch) >= BATCH_ROWS:
+                count += self._write_batch(sql, batch)
+                batch = []
+        if batch:
+            count += self._write_batch(sql, batch)
+        return count
+
+    def _write_batch(self, sql, batch):
+        with self._lock, self.conn:
+            self.conn.executemany(sql, batch)
+        return len(batch)
+
+
+def write_ndjson(out, records, descs=None):
+    """Write records to the text stream ``out``, one JSON object per line.
+
+    ``descs`` maps ``(kind, filename)`` to a description to include.
+    Returns the number of lines written.
+    """
+    count = 0
+    for record in records:
+        if descs:
+            desc = descs.get((record["kind"], record["filename"]))
+            if desc is not None:
+                record = dict(record, desc=desc)
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def read_ndjson(lines, on_desc=None):
+    """Yield records from NDJSON ``lines`` (e.g. an open file), one at a time.
+
+    ``on_desc(kind, filename, desc)`` is called for records that carry a
+    description. Blank lines are skipped; a malformed line raises
+    ``ValueError`` with its line number.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            kind, filename, content = record["kind"], record["filename"], record["content"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"line {number}: {e}") from None
+        if not isinstance(content, str) or not isinstance(filename, str):
+            raise ValueError(f"line {number}: filename and content must be strings")
+        if on_desc is not None and record.get("desc") is not None:
+            on_desc(kind, filename, record["desc"])
+        yield record
+
+
+class PackLibraryStore(LibraryStore):
+    """``LibraryStore`` whose files live in a ``PackFile`` instead of a folder."""
+
+    def __init__(self, kind, pack, metadata, default_desc=None):
+        super().__init__(kind, None, metadata, default_desc=default_desc)
+        self.pack = pack
+
+    @property
+    def index_source(self):
+        return self
+
+    def path(self, filename):
+        return None  # not a file on disk
+
+    def scan(self):
+        return self.pack.scan(self.kind)
+
+    def stat(self, filenames):
+        return self.pack.stat(self.kind, filenames)
+
+    def read(self, filename):
+        return self.pack.read(self.kind, filename)
+
+    def read_head(self, filename, limit):
+        return self.pack.read(self.kind, filename, limit)
+
+    def write_file(self, filename, content):
+        if content is None:
+            return self.pack.stat(self.kind, [filename])[filename]
+        return self.pack.write(self.kind, filename, content)
+
+    def remove_file(self, filename):
+        self.pack.remove(self.kind, filename)
+        return None
+
+    def records(self):
+        return self.pack.records([self.kind])
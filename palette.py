@@ -0,0 +1,222 @@
+import heapq
+import re
+import tkinter as tk
+
+# Candidates scored per keystroke at most; past this the query is too broad
+# to rank exhaustively and the first ids are ranked (keep typing)
+MAX_SCORED = 1000
+_WORD_BREAKS = " _-./\\:"
+# Bit offsets set in each byte value, for enumerating bitset members
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+def _score(text, terms):
+    """Rank ``text`` against lower-case ``terms``; ``None`` if it does not match.
+
+    A term found as a substring scores higher than one that only matches as
+    a subsequence, with a bonus at the start of a word and earlier matches
+    preferred. Shorter texts win ties.
+    """
+    score = 0.0
+    for term in terms:
+        i = text.find(term)
+        if i >= 0:
+            score += 100 - min(i, 50)
+            if i == 0 or text[i - 1] in _WORD_BREAKS:
+                score += 30
+            continue
+        pos = -1
+        for char in term:
+            pos = text.find(char, pos + 1)
+            if pos < 0:
+                return None
+        score += 10
+    return score - len(text) * 0.01
+
+
+def _members(bits, limit):
+    """Yield up to ``limit`` set bit positions of the int ``bits``, lowest first."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for match in _NONZERO.finditer(data):
+        base = match.start() * 8
+        for bit in _BYTE_BITS[data[base // 8]]:
+            yield base + bit
+            limit -= 1
+            if not limit:
+                return
+
+
+class FuzzyIndex:
+    """Incrementally maintained fuzzy-match index over palette items.
+
+    Items are ``(kind, key)`` pairs with a display payload and the text they
+    are matched on. Each character and each adjacent character pair has a
+    bitset (a Python int, one bit per item id), so finding the items that
+    contain every character of a query, or every pair of it for whole
+    substring matches, is a handful of big-int ANDs instead of a scan. Only
+    those candidates are scored. Ids of removed items are reused to keep the
+    bitsets dense.
+    """
+
+    def __init__(self):
+        self.ids = {}  # (kind, key) -> id
+        self.items = {}  # id -> (kind, key, payload, text)
+        self.chars = {}
+        self.pairs = {}
+        self._free = []
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def _keys(text):
+        return set(text), {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def set(self, kind, key, payload, text):
+        """Add or update an item."""
+        text = text.lower()
+        item_id = self.ids.get((kind, key))
+        if item_id is not None:
+            if self.items[item_id][3] == text:
+                self.items[item_id] = (kind, key, payload, text)
+                return
+            self.remove(kind, key)
+        item_id = self._free.pop() if self._free else self._next_id
+        if item_id == self._next_id:
+            self._next_id += 1
+        self.ids[(kind, key)] = item_id
+        self.items[item_id] = (kind, key, payload, text)
+        bit = 1 << item_id
+        chars, pairs = self._keys(text)
+        for char in chars:
+            self.chars[char] = self.chars.get(char, 0) | bit
+        for pair in pairs:
+            self.pairs[pair] = self.pairs.get(pair, 0) | bit
+
+    def remove(self, kind, key):
+        item_id = self.ids.pop((kind, key), None)
+        if item_id is None:
+            return
+        text = self.items.pop(item_id)[3]
+        bit = 1 << item_id
+        chars, pairs = self._keys(text)
+        for char in chars:
+            self.chars[char] &= ~bit
+        for pair in pairs:
+            self.pairs[pair] &= ~bit
+        self._free.append(item_id)
+
+    def sync_kind(self, kind, items):
+        """Replace every item of ``kind`` with ``[(key, payload, text)]``."""
+        keys = set()
+        for key, payload, text in items:
+            keys.add(key)
+            self.set(kind, key, payload, text)
+        for item_kind, key in [k for k in self.ids if k[0] == kind and k[1] not in keys]:
+            self.remove(item_kind, key)
+
+    @staticmethod
+    def _all(index, keys):
+        bits = -1
+        for key in keys:
+            bits &= index.get(key, 0)
+            if not bits:
+                return 0
+        return bits
+
+    def search(self, query, limit=50):
+        """Return up to ``limit`` ``(kind, key, payload)`` best matches."""
+        terms = query.lower().split()
+        if not terms or not self.items:
+            return []
+        candidates = self._all(self.chars, set("".join(terms)))
+        # Whole-substring matches (every adjacent pair present) are scored first
+        pairs = {term[i:i + 2] for term in terms for i in range(len(term) - 1)}
+        strong = candidates & self._all(self.pairs, pairs) if pairs else candidates
+        scored = []
+        for pool in (strong, candidates & ~strong):
+            if len(scored) >= limit or not pool:
+                break
+            for item_id in _members(pool, MAX_SCORED):
+                score = _score(self.items[item_id][3], terms)
+                if score is not None:
+                    scored.append((score, item_id))
+        best = heapq.nlargest(limit, scored)
+        return [self.items[item_id][:3] for _, item_id in best]
+
+
+class CommandPalette(tk.Toplevel):
+    """Ctrl+K palette: type to fuzzy-find scripts, CMDs and links.
+
+    Enter opens the selection, Ctrl+C copies it and Ctrl+R runs it (CMDs run,
+    links open in the browser). ``actions`` maps ``"open"``, ``"copy"`` and
+    ``"run"`` to ``callback(kind, key, payload)``.
+    """
+
+    LABELS = {"scripts": "Script", "cmds": "CMD", "links": "Link"}
+
+    def __init__(self, parent, index, actions, limit=50):
+        super().__init__(parent)
+        self.title("Go to...")
+        self.geometry("600x320")
+        self.transient(parent)
+        self.index = index
+        self.actions = actions
+        self.limit = limit
+        self.results = []
+
+        self.query_var = tk.StringVar()
+        self.entry = tk.Entry(self, textvariable=self.query_var, font=("TkDefaultFont", 12))
+        self.entry.pack(fill="x", padx=5, pady=5)
+        self.listbox = tk.Listbox(self, activestyle="dotbox")
+        self.listbox.pack(fill="both", expand=True, padx=5)
+        hint = "Enter: open    Ctrl+C: copy    Ctrl+R: run    Esc: close"
+        tk.Label(self, text=hint, fg="gray", anchor="w").pack(fill="x", padx=5, pady=2)
+
+        self.query_var.trace_add("write", lambda *args: self.update_results())
+        for widget in (self.entry, self.listbox):
+            widget.bind("<Return>", lambda e: self.activate("open"))
+            widget.bind("<Control-c>", lambda e: self.activate("copy"))
+            widget.bind("<Control-r>", lambda e: self.activate("run"))
+            widget.bind("<Escape>", lambda e: self.destroy())
+        self.entry.bind("<Down>", lambda e: self.move(1))
+        self.entry.bind("<Up>", lambda e: self.move(-1))
+        self.listbox.bind("<Double-Button-1>", lambda e: self.activate("open"))
+        self.entry.focus_set()
+
+    def show(self):
+        """Bring an open palette back to the front, keeping what was typed."""
+        self.lift()
+        self.entry.focus_set()
+        self.entry.select_range(0, tk.END)
+
+    def update_results(self):
+        self.results = self.index.search(self.query_var.get(), self.limit)
+        self.listbox.delete(0, tk.END)
+        for kind, key, payload in self.results:
+            self.listbox.insert(tk.END, f"[{self.LABELS.get(kind, kind)}] {payload}")
+        if self.results:
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+
+    def move(self, step):
+        if not self.results:
+            return "break"
+        selected = self.listbox.curselection()
+        position = min(max(0, (selected[0] if selected else -1) + step), len(self.results) - 1)
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(position)
+        self.listbox.activate(position)
+        self.listbox.see(position)
+        return "break"
+
+    def activate(self, action):
+        selected = self.listbox.curselection()
+        if not selected or selected[0] >= len(self.results):
+            return "break"
+        kind, key, payload = self.results[selected[0]]
+        self.destroy()
+        self.actions[action](kind, key, payload)
+        return "break"
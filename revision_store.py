@@ -0,0 +1,221 @@
+import difflib
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+# A revision is stored in full once the deltas since the last full copy
+# add up to more than that copy, or after this many deltas in a row
+MAX_CHAIN = 64
+# Files with more lines than this are stored in full (diffing them is slow)
+MAX_DELTA_LINES = 20_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    rev INTEGER NOT NULL,
+    saved REAL NOT NULL,
+    note TEXT NOT NULL,
+    full INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS revisions_file ON revisions (kind, filename, rev);
+CREATE TABLE IF NOT EXISTS trash (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    desc TEXT,
+    deleted REAL NOT NULL,
+    rev INTEGER NOT NULL
+);
+"""
+
+# Columns returned by ``RevisionStore.history``
+COLUMNS = ("rev", "saved", "note", "full", "size", "stored")
+
+
+def make_delta(old, new):
+    """Encode ``new`` against ``old`` as line ops: ``[start, end]`` copies old lines, strings are new lines."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.extend(new_lines[j1:j2])
+    return ops
+
+
+def apply_delta(old, ops):
+    old_lines = old.splitlines(keepends=True)
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+class RevisionStore:
+    """Revision history and trash for scripts and CMDs, in one SQLite file.
+
+    Every save is a numbered revision of ``(kind, filename)``. Most are
+    stored as a zlib-compressed line delta against the previous revision,
+    so a small edit costs a few bytes whatever the file size; a full copy
+    is taken when the deltas since the last one outgrow it (or after
+    ``MAX_CHAIN`` deltas), which bounds the work to rebuild any revision.
+    Deleted files keep their history and get a trash row to restore from.
+    Methods block on SQLite; call them on the I/O pool.
+    """
+
+    def __init__(self, path, max_chain=MAX_CHAIN):
+        self.max_chain = max_chain
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # --- Recording ---
+    def record(self, kind, filename, content, note="edit"):
+        """Store ``content`` as the next revision; returns its number.
+
+        Returns ``None`` when it matches the latest revision, so recording
+        the on-disk version before every save only costs a hash.
+        """
+        encoded = content.encode("utf-8")
+        sha1 = hashlib.sha1(encoded).hexdigest()
+        with self._lock:
+            latest = self.conn.execute(
+                "SELECT rev, sha1 FROM revisions WHERE kind = ? AND filename = ? ORDER BY rev DESC LIMIT 1",
+                (kind, filename)).fetchone()
+            if latest is not None and latest[1] == sha1:
+                return None
+            rev = 1 if latest is None else latest[0] + 1
+            full, data = True, zlib.compress(encoded, 6)
+            if latest is not None:
+                delta = self._delta_blob(kind, filename, latest[0], content)
+                if delta is not None and self._chain_allows(kind, filename, len(delta)):
+                    full, data = False, delta
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO revisions (kind, filename, rev, saved, note, full, data, size, sha1)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (kind, filename, rev, time.time(), note, int(full), data, len(encoded), sha1))
+        return rev
+
+    def _delta_blob(self, kind, filename, base_rev, content):
+        if content.count("\n") > MAX_DELTA_LINES:
+            return None
+        base = self._content(kind, filename, base_rev)
+        if base.count("\n") > MAX_DELTA_LINES:
+            return None
+        return zlib.compress(json.dumps(make_delta(base, content), ensure_ascii=False).encode("utf-8"), 6)
+
+    def _chain_allows(self, kind, filename, delta_bytes):
+        # The most recent full copy and the deltas stored after it
+        rows = self.conn.execute(
+            "SELECT full, length(data) FROM revisions WHERE kind = ? AND filename = ? AND rev >= coalesce("
+            " (SELECT max(rev) FROM revisions WHERE kind = ? AND filename = ? AND full = 1), 0)",
+            (kind, filename, kind, filename)).fetchall()
+        full_bytes = sum(size for full, size in rows if full)
+        delta_total = sum(size for full, size in rows if not full) + delta_bytes
+        return len(rows) <= self.max_chain and delta_total <= full_bytes
+
+    # --- Reading ---
+    def history(self, kind, filename):
+        """Revisions of one file, newest first, as tuples in ``COLUMNS`` order."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT rev, saved, note, full, size, length(data) FROM revisions"
+                " WHERE kind = ? AND filename = ? ORDER BY rev DESC", (kind, filename)).fetchall()
+
+    def content(self, kind, filename, rev):
+        """Text of revision ``rev``; raises ``KeyError`` if there is none."""
+        with self._lock:
+            return self._content(kind, filename, rev)
+
+    def _content(self, kind, filename, rev):
+        start = self.conn.execute(
+            "SELECT max(rev) FROM revisions WHERE kind = ? AND filename = ? AND rev <= ? AND full = 1",
+            (kind, filename, rev)).fetchone()[0]
+        if start is None:
+            raise KeyError(f"No revision {rev} of {kind}/{filename}")
+        content = None
+        last = None
+        for last, full, data in self.conn.execute(
+                "SELECT rev, full, data FROM revisions WHERE kind = ? AND filename = ? AND rev BETWEEN ? AND ?"
+                " ORDER BY rev", (kind, filename, start, rev)):
+            text = zlib.decompress(data).decode("utf-8")
+            content = text if full else apply_delta(content, json.loads(text))
+        if last != rev:
+            raise KeyError(f"No revision {rev} of {kind}/{filename}")
+        return content
+
+    def stats(self):
+        """``(revisions, bytes of the versions they hold, bytes stored)``."""
+        with self._lock:
+            count, size, stored = self.conn.execute(
+                "SELECT count(*), coalesce(sum(size), 0), coalesce(sum(length(data)), 0) FROM revisions").fetchone()
+        return count, size, stored
+
+    # --- Trash ---
+    def trash(self, kind, filename, content, desc):
+        """Record a file's last content before it is deleted; returns the trash id."""
+        rev = self.record(kind, filename, content, note="deleted")
+        with self._lock, self.conn:
+            if rev is None:
+                rev = self.conn.execute("SELECT max(rev) FROM revisions WHERE kind = ? AND filename = ?",
+                                        (kind, filename)).fetchone()[0]
+            return self.conn.execute(
+                "INSERT INTO trash (kind, filename, desc, deleted, rev) VALUES (?, ?, ?, ?, ?)",
+                (kind, filename, desc, time.time(), rev)).lastrowid
+
+    def trashed(self):
+        """Trash rows, newest first: ``(id, kind, filename, desc, deleted, rev)``."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT id, kind, filename, desc, deleted, rev FROM trash ORDER BY deleted DESC").fetchall()
+
+    def trash_item(self, trash_id):
+        """``(kind, filename, desc, content)`` of a trashed file; raises ``KeyError`` if gone."""
+        with self._lock:
+            row = self.conn.execute("SELECT kind, filename, desc, rev FROM trash WHERE id = ?",
+                                    (trash_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Trash entry {trash_id} is gone")
+            kind, filename, desc, rev = row
+            return kind, filename, desc, self._content(kind, filename, rev)
+
+    def untrash(self, trash_id):
+        """Drop a trash row once its file has been written back; the history stays."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM trash WHERE id = ?", (trash_id,))
+
+    def purge(self, trash_id):
+        """Delete a trash row for good, with the history of a file that was not recreated."""
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT kind, filename, rev FROM trash WHERE id = ?", (trash_id,)).fetchone()
+            if row is None:
+                return
+            kind, filename, rev = row
+            self.conn.execute("DELETE FROM trash WHERE id = ?", (trash_id,))
+            latest = self.conn.execute("SELECT max(rev) FROM revisions WHERE kind = ? AND filename = ?",
+                                       (kind, filename)).fetchone()[0]
+            still_trashed = self.conn.execute("SELECT 1 FROM trash WHERE kind = ? AND filename = ?",
+                                              (kind, filename)).fetchone()
+            if latest == rev and still_trashed is None:
+                self.conn.execute("DELETE FROM revisions WHERE kind = ? AND filename = ?", (kind, filename))
@@ -0,0 +1,198 @@
+import datetime
+import difflib
+import tkinter as tk
+from tkinter import messagebox, scrolledtext, ttk
+
+
+def _when(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _kb(size):
+    return f"{size / 1024:.1f} KB"
+
+
+def _table(parent, columns, height=8):
+    table = ttk.Treeview(parent, columns=[c[0] for c in columns], show="headings", height=height,
+                         selectmode="browse")
+    for name, heading, width in columns:
+        table.heading(name, text=heading)
+        table.column(name, width=width, anchor="e" if name in ("rev", "size", "stored") else "w")
+    scrollbar = tk.Scrollbar(parent, orient="vertical", command=table.yview)
+    table.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side="right", fill="y")
+    table.pack(fill="both", expand=True)
+    return table
+
+
+class RevisionHistoryWindow(tk.Toplevel):
+    """Revisions of one script or CMD with a diff against the revision before.
+
+    ``on_restore(rev, done)`` writes a revision back as the current file and
+    calls ``done()`` once saved; the restore is itself recorded, so it can
+    be undone the same way.
+    """
+
+    def __init__(self, parent, revisions, io, kind, filename, on_restore):
+        super().__init__(parent)
+        self.title(f"History: {filename}")
+        self.geometry("700x500")
+        self.revisions = revisions
+        self.io = io
+        self.kind = kind
+        self.filename = filename
+        self.on_restore = on_restore
+        self.rows = []
+
+        top = tk.Frame(self)
+        top.pack(fill="both", expand=False, padx=5, pady=5)
+        self.table = _table(top, (("rev", "Rev", 50), ("saved", "Saved", 150), ("note", "Note", 170),
+                                  ("size", "Size", 80), ("stored", "Stored", 110)), height=7)
+        self.table.bind("<<TreeviewSelect>>", lambda e: self.show_diff())
+
+        bar = tk.Frame(self)
+        bar.pack(fill="x", padx=5)
+        self.restore_btn = tk.Button(bar, text="Restore This Revision", command=self.restore, state="disabled")
+        self.restore_btn.pack(side="left")
+        self.status = tk.Label(bar, anchor="w")
+        self.status.pack(side="left", fill="x", expand=True, padx=5)
+
+        self.diff = scrolledtext.ScrolledText(self, wrap=tk.NONE, height=15)
+        self.diff.pack(fill="both", expand=True, padx=5, pady=5)
+        self.diff.tag_configure("added", foreground="#107010")
+        self.diff.tag_configure("removed", foreground="red")
+        self.diff.tag_configure("info", foreground="gray")
+        self.refresh()
+
+    def refresh(self):
+        self.io.submit(self.revisions.history, self.kind, self.filename, on_done=self.show,
+                       name="Loading revisions")
+
+    def show(self, rows):
+        if not self.winfo_exists():
+            return
+        self.rows = rows
+        self.table.delete(*self.table.get_children())
+        for index, (rev, saved, note, full, size, stored) in enumerate(rows):
+            self.table.insert("", "end", iid=str(index), values=(
+                rev, _when(saved), note, _kb(size), _kb(stored) + (" full" if full else " delta")))
+        if rows:
+            self.table.selection_set("0")
+        else:
+            self.status.config(text="No saved revisions yet; every save from now on is kept.")
+
+    def selected(self):
+        selection = self.table.selection()
+        return self.rows[int(selection[0])] if selection else None
+
+    def show_diff(self):
+        row = self.selected()
+        self.restore_btn.config(state="normal" if row else "disabled")
+        if row is None:
+            return
+        rev = row[0]
+        index = self.rows.index(row)
+        previous = self.rows[index + 1][0] if index + 1 < len(self.rows) else None
+
+        def load():
+            new = self.revisions.content(self.kind, self.filename, rev)
+            old = self.revisions.content(self.kind, self.filename, previous) if previous is not None else None
+            return old, new
+
+        def loaded(result):
+            if not self.winfo_exists() or self.selected() is not row:
+                return
+            old, new = result
+            self.diff.config(state="normal")
+            self.diff.delete("1.0", tk.END)
+            if old is None:
+                self.diff.insert(tk.END, f"First revision ({row[2]}):\n", "info")
+                self.diff.insert(tk.END, new)
+            else:
+                lines = list(difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                                  f"r{previous}", f"r{rev}"))
+                if not lines:
+                    self.diff.insert(tk.END, "No changes from the revision before.\n", "info")
+                for line in lines:
+                    if not line.endswith("\n"):
+                        line += "\n"
+                    tag = ()
+                    if line.startswith(("---", "+++", "@@")):
+                        tag = "info"
+                    elif line.startswith("+"):
+                        tag = "added"
+                    elif line.startswith("-"):
+                        tag = "removed"
+                    self.diff.insert(tk.END, line, tag)
+            self.diff.config(state="disabled")
+
+        self.io.submit(load, on_done=loaded, name="Loading revision")
+
+    def restore(self):
+        row = self.selected()
+        if row is None:
+            return
+        if not messagebox.askyesno("Restore", f"Replace {self.filename} with revision {row[0]}?", parent=self):
+            return
+        self.on_restore(row[0], self.refresh)
+
+
+class TrashWindow(tk.Toplevel):
+    """Deleted scripts and CMDs, restorable with their descriptions.
+
+    ``on_restore(trash_id, done)`` writes the file back and calls ``done()``.
+    """
+
+    def __init__(self, parent, revisions, io, on_restore):
+        super().__init__(parent)
+        self.title("Trash")
+        self.geometry("650x350")
+        self.revisions = revisions
+        self.io = io
+        self.on_restore = on_restore
+        self.rows = []
+
+        frame = tk.Frame(self)
+        frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.table = _table(frame, (("deleted", "Deleted", 150), ("kind", "Kind", 60),
+                                    ("filename", "File", 200), ("desc", "Description", 200)), height=10)
+        self.table.bind("<Double-Button-1>", lambda e: self.restore())
+
+        bar = tk.Frame(self)
+        bar.pack(fill="x", padx=5, pady=5)
+        tk.Button(bar, text="Restore", command=self.restore).pack(side="left")
+        tk.Button(bar, text="Delete Forever", command=self.purge).pack(side="left", padx=5)
+        self.status = tk.Label(bar, anchor="w")
+        self.status.pack(side="left", fill="x", expand=True, padx=5)
+        self.refresh()
+
+    def refresh(self):
+        self.io.submit(lambda: (self.revisions.trashed(), self.revisions.stats()), on_done=self.show,
+                       name="Loading trash")
+
+    def show(self, result):
+        if not self.winfo_exists():
+            return
+        self.rows, (count, size, stored) = result
+        self.table.delete(*self.table.get_children())
+        for index, (_id, kind, filename, desc, deleted, _rev) in enumerate(self.rows):
+            label = "Script" if kind == "scripts" else "CMD"
+            self.table.insert("", "end", iid=str(index), values=(_when(deleted), label, filename, desc or ""))
+        self.status.config(text=f"{count:,} revisions kept: {_kb(stored)} stored for {_kb(size)} of versions")
+
+    def selected(self):
+        selection = self.table.selection()
+        return self.rows[int(selection[0])] if selection else None
+
+    def restore(self):
+        row = self.selected()
+        if row is not None:
+            self.on_restore(row[0], self.refresh)
+
+    def purge(self):
+        row = self.selected()
+        if row is None:
+            return
+        if not messagebox.askyesno("Delete Forever", f"Delete {row[2]} and its history for good?", parent=self):
+            return
+        self.io.submit(self.revisions.purge, row[0], on_done=lambda _: self.refresh(), name="Emptying trash")
@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Output kept per run (the tail, before compression)
+MAX_RUN_OUTPUT_BYTES = 256 * 1024
+# Compressed output kept across all runs; the oldest outputs are dropped first
+MAX_TOTAL_OUTPUT_BYTES = 64 * 1024 * 1024
+# Rows kept at all; older runs are deleted
+MAX_RUNS = 100_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    command TEXT NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    exit_code INTEGER,
+    status TEXT NOT NULL,
+    output BLOB,
+    output_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL DEFAULT 0,
+    truncated INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_command ON runs (command, started);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status, started);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Columns returned by ``RunHistory.query``
+COLUMNS = ("id", "command", "started", "duration", "exit_code", "status", "output_bytes", "truncated")
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * p // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+class RunHistory:
+    """SQLite log of finished command runs.
+
+    Each run stores its start time, duration, exit code, status and the
+    tail of its output (at most ``max_run_output`` bytes, zlib-compressed).
+    When the stored output of all runs passes ``max_total_output`` the
+    oldest outputs are dropped, while their timing rows are kept. Writes are
+    queued on a single writer thread; reads are meant for the I/O pool.
+    """
+
+    def __init__(self, path, max_run_output=MAX_RUN_OUTPUT_BYTES, max_total_output=MAX_TOTAL_OUTPUT_BYTES,
+                 max_runs=MAX_RUNS, on_error=None):
+        self.max_run_output = max_run_output
+        self.max_total_output = max_total_output
+        self.max_runs = max_runs
+        self.on_error = on_error or (lambda exc: print(f"Run history write failed: {exc}"))
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-history")
+
+    # --- Writes ---
+    def record(self, command, started, duration, exit_code, status, output, output_size=None):
+        """Queue one finished run.
+
+        ``output`` is its text output, or the tail of it when ``output_size``
+        gives the full size in UTF-8 bytes.
+        """
+        future = self._writer.submit(self._insert, command, started, duration, exit_code, status, output,
+                                     output_size)
+        future.add_done_callback(lambda f: f.exception() and self.on_error(f.exception()))
+        return future
+
+    def _insert(self, command, started, duration, exit_code, status, output, output_size):
+        data = output.encode("utf-8", "replace")
+        if output_size is None:
+            output_size = len(data)
+        truncated = len(data) > self.max_run_output or output_size > len(data)
+        if truncated:
+            data = data[-self.max_run_output:]
+        blob = zlib.compress(data, 6) if data else None
+        stored = len(blob) if blob else 0
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO runs (command, started, duration, exit_code, status, output, output_bytes,"
+                " stored_bytes, truncated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (command, started, duration, exit_code, status, blob, output_size, stored, int(truncated)))
+            total = self._meta("output_bytes") + stored
+            total = self._rotate(total)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('output_bytes', ?)", (total,))
+
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _rotate(self, total):
+        # Drop the oldest outputs until the budget fits; returns the new total
+        while total > self.max_total_output:
+            rows = self.conn.execute(
+                "SELECT id, stored_bytes FROM runs WHERE output IS NOT NULL ORDER BY id LIMIT 64").fetchall()
+            if not rows:
+                break
+            for run_id, stored in rows:
+                if total <= self.max_total_output:
+                    break
+                self.conn.execute("UPDATE runs SET output = NULL, stored_bytes = 0 WHERE id = ?", (run_id,))
+                total -= stored
+        row = self.conn.execute("SELECT max(id) FROM runs").fetchone()
+        if row[0] is not None and row[0] > self.max_runs:
+            cutoff = row[0] - self.max_runs
+            freed = self.conn.execute("SELECT coalesce(sum(stored_bytes), 0) FROM runs WHERE id <= ?",
+                                      (cutoff,)).fetchone()[0]
+            self.conn.execute("DELETE FROM runs WHERE id <= ?", (cutoff,))
+            total -= freed
+        return total
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self.conn.close()
+
+    # --- Reads ---
+    def query(self, command=None, status=None, since=None, until=None, limit=500):
+        """Newest-first runs matching the filters, as dicts of ``COLUMNS``."""
+        where, params = [], []
+        if command:
+            where.append("command = ?")
+            params.append(command)
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if since is not None:
+            where.append("started >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("started < ?")
+            params.append(until)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started DESC LIMIT ?"
+        with self._lock:
+            rows = self.conn.execute(sql, params + [limit]).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def output(self, run_id):
+        """Stored output of a run, or ``None`` if it was rotated out."""
+        with self._lock:
+            row = self.conn.execute("SELECT output FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8", "replace")
+
+    def commands(self):
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT command FROM runs ORDER BY command")]
+
+    def stats(self, window=50, recent=10):
+        """Rolling duration stats per command over its last ``window`` runs.
+
+        Returns ``[{"command", "runs", "failures", "p50", "p95", "recent_p50",
+        "last_run"}]``; ``recent_p50`` covers only the last ``recent`` runs, so
+        a command that is slowing down shows a ``recent_p50`` above ``p50``.
+        """
+        result = []
+        with self._lock:
+            for command in [row[0] for row in self.conn.execute("SELECT DISTINCT command FROM runs")]:
+                rows = self.conn.execute(
+                    "SELECT duration, status, started FROM runs WHERE command = ?"
+                    " ORDER BY started DESC LIMIT ?", (command, window)).fetchall()
+                durations = sorted(row[0] for row in rows)
+                latest = sorted(row[0] for row in rows[:recent])
+                result.append({
+                    "command": command,
+                    "runs": len(rows),
+                    "failures": sum(1 for row in rows if row[1] != "done"),
+                    "p50": percentile(durations, 50),
+                    "p95": percentile(durations, 95),
+                    "recent_p50": percentile(latest, 50),
+                    "last_run": rows[0][2],
+                })
+        result.sort(key=lambda s: s["command"])
+        return result
+
+
+def since_for(range_name, now=None):
+    """Start time for a named range (``"hour"``, ``"day"``, ``"week"``), else ``None``."""
+    seconds = {"hour": 3600, "day": 86400, "week": 7 * 86400}.get(range_name)
+    return None if seconds is None else (now or time.time()) - seconds
@@ -0,0 +1,496 @@
+import array
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from operator import itemgetter
+
+from library import scan_folder
+
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+MAX_TOKEN_LEN = 64
+MAX_CONTENT_BYTES = 256 * 1024  # Only the head of very large files is indexed
+FIELD_BOOST = (3.0, 2.0, 1.0)  # filename, desc, content
+BATCH_DOCS = 2000
+COMPACT_SEGMENTS = 16
+POSTINGS_CACHE_TERMS = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    desc TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    live INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS docs_kind_live ON docs(kind, live);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    seg INTEGER NOT NULL,
+    ids BLOB NOT NULL,
+    weights BLOB,
+    PRIMARY KEY (term, seg)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) <= MAX_TOKEN_LEN]
+
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def document_terms(filename, desc, content):
+    """Return ``{term: weight}`` for one document.
+
+    ``w:<token>`` terms carry a field-boosted log tf weight; ``t:<trigram>``
+    terms (weight ``None``) support substring matches on partial words.
+    """
+    terms = {}
+    for text, boost in zip((filename, desc, content), FIELD_BOOST):
+        for token, tf in Counter(tokenize(text)).items():
+            key = "w:" + token
+            terms[key] = terms.get(key, 0.0) + boost * (1.0 + math.log(tf))
+            for gram in trigrams(token):
+                terms["t:" + gram] = None
+    return terms
+
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _read_head(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(MAX_CONTENT_BYTES).decode("utf-8", "replace")
+    except OSError:
+        return ""
+
+
+def _meta(conn, key, default=0):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def _set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def _write_segment(conn, seg, postings):
+    """Write one segment row per term.
+
+    Token postings are stored best weight first so a query can stop scanning
+    early; trigram postings are plain id lists, ascending (ids only grow, so
+    they stay sorted across segments read in ``seg`` order).
+    """
+    rows = []
+    for term, pairs in postings.items():
+        if term.startswith("w:"):
+            pairs.sort(key=itemgetter(1), reverse=True)
+            ids = array.array("i", [p[0] for p in pairs]).tobytes()
+            weights = array.array("f", [p[1] for p in pairs]).tobytes()
+        else:
+            ids = array.array("i", pairs).tobytes()
+            weights = None
+        rows.append((term, seg, ids, weights))
+    conn.executemany("INSERT OR REPLACE INTO postings (term, seg, ids, weights) VALUES (?, ?, ?, ?)", rows)
+
+
+def update_index(conn, kind, folder, entries):
+    """Bring the index for one folder up to date.
+
+    Only files whose ``(mtime_ns, size)`` or description changed since they
+    were indexed are read. Changed documents get a new id and the old id is
+    marked dead; new postings go into a fresh segment so existing postings
+    are never rewritten here. Returns the number of documents (re)indexed.
+
+    ``folder`` may also be a store with ``scan()`` and ``read_head(filename,
+    limit)`` (the pack file backend).
+    """
+    descs = {e["filename"]: e["desc"] for e in entries}
+    if isinstance(folder, str):
+        disk = scan_folder(folder)
+
+        def read_head(name):
+            return _read_head(os.path.join(folder, name))
+    else:
+        disk = folder.scan()
+
+        def read_head(name):
+            return folder.read_head(name, MAX_CONTENT_BYTES)
+    known = {
+        row[1]: row for row in conn.execute(
+            "SELECT id, filename, desc, mtime_ns, size FROM docs WHERE kind = ? AND live = 1", (kind,))
+    }
+    stale = []
+    to_index = [name for name in disk if name not in known]
+    for name, (doc_id, _name, desc, mtime_ns, size) in known.items():
+        stat = disk.get(name)
+        if stat is None:
+            stale.append(doc_id)
+        elif stat != (mtime_ns, size) or descs.get(name, desc) != desc:
+            stale.append(doc_id)
+            to_index.append(name)
+    if stale:
+        conn.executemany("UPDATE docs SET live = 0 WHERE id = ?", [(i,) for i in stale])
+        conn.commit()
+
+    for start in range(0, len(to_index), BATCH_DOCS):
+        seg = _meta(conn, "next_seg")
+        postings = {}
+        for name in to_index[start:start + BATCH_DOCS]:
+            mtime_ns, size = disk[name]
+            desc = descs.get(name, known[name][2] if name in known else "")
+            cur = conn.execute(
+                "INSERT INTO docs (kind, filename, desc, mtime_ns, size) VALUES (?, ?, ?, ?, ?)",
+                (kind, name, desc, mtime_ns, size))
+            doc_id = cur.lastrowid
+            try:
+                content = read_head(name)
+            except OSError:
+                content = ""
+            for term, weight in document_terms(name, desc, content).items():
+                postings.setdefault(term, []).append(doc_id if weight is None else (doc_id, weight))
+        _write_segment(conn, seg, postings)
+        _set_meta(conn, "next_seg", seg + 1)
+        conn.commit()
+    return len(to_index)
+
+
+def compact(conn, force=False):
+    """Merge segments and drop postings of dead documents.
+
+    Runs when enough segments piled up (or the dead set grew large) so
+    queries keep reading one postings row per term.
+    """
+    segments = _meta(conn, "next_seg") - _meta(conn, "compacted_seg")
+    dead = {row[0] for row in conn.execute("SELECT id FROM docs WHERE live = 0")}
+    live = conn.execute("SELECT COUNT(*) FROM docs WHERE live = 1").fetchone()[0]
+    if not force and segments < COMPACT_SEGMENTS and len(dead) <= max(1000, live // 20):
+        return False
+
+    terms = [row[0] for row in conn.execute("SELECT DISTINCT term FROM postings")]
+    for term in terms:
+        rows = conn.execute("SELECT ids, weights FROM postings WHERE term = ?", (term,)).fetchall()
+        if len(rows) == 1 and not dead:
+            continue
+        pairs = []
+        for ids_blob, weights_blob in rows:
+            ids = array.array("i")
+            ids.frombytes(ids_blob)
+            if weights_blob is None:
+                pairs.extend(i for i in ids if i not in dead)
+            else:
+                weights = array.array("f")
+                weights.frombytes(weights_blob)
+                pairs.extend(p for p in zip(ids, weights) if p[0] not in dead)
+        conn.execute("DELETE FROM postings WHERE term = ?", (term,))
+        if pairs:
+            _write_segment(conn, 0, {term: pairs})
+    conn.execute("DELETE FROM docs WHERE live = 0")
+    _set_meta(conn, "compacted_seg", _meta(conn, "next_seg"))
+    conn.commit()
+    return True
+
+
+class _TokenPostings:
+    """Decoded postings of one ``w:`` term, best weight first."""
+
+    def __init__(self, ids, weights):
+        self.ids = ids
+        self.weights = weights
+        self.max_weight = weights[0] if weights else 0.0
+        self._lookup = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def lookup(self):
+        if self._lookup is None:
+            self._lookup = dict(zip(self.ids, self.weights))
+        return self._lookup
+
+
+def _has(ids, doc_id):
+    i = bisect_left(ids, doc_id)
+    return i < len(ids) and ids[i] == doc_id
+
+
+class _SubstringMatch:
+    """Docs containing every trigram of one word, resolved only as far as needed.
+
+    Common trigrams are in nearly every doc, so their postings are kept as
+    sorted arrays and never turned into sets: a word that only filters
+    another word's candidates is tested by bisecting them, and only the word
+    that drives a query materializes its matches (``ids``), intersecting
+    from the smallest posting and bisecting once the match is small.
+    """
+
+    def __init__(self, postings):
+        self.postings = sorted(postings, key=len)
+        # Upper bound on the matches, used to pick the driving word and its idf
+        self.bound = len(self.postings[0]) if self.postings else 0
+        self._ids = None if self.postings else set()
+
+    def __contains__(self, doc_id):
+        if self._ids is not None:
+            return doc_id in self._ids
+        return all(_has(ids, doc_id) for ids in self.postings)
+
+    def ids(self):
+        if self._ids is None:
+            match = set(self.postings[0])
+            for ids in self.postings[1:]:
+                if not match:
+                    break
+                if len(match) * 16 < len(ids):
+                    match = {doc_id for doc_id in match if _has(ids, doc_id)}
+                else:
+                    match = match.intersection(ids)
+            self._ids = match
+        return self._ids
+
+    def descending(self):
+        """Matching ids, highest first, without materializing the rest."""
+        if self._ids is not None:
+            return iter(sorted(self._ids, reverse=True))
+        return (doc_id for doc_id in reversed(self.postings[0]) if doc_id in self)
+
+
+class SearchIndex:
+    """Ranked queries over the on-disk index.
+
+    Only the postings of the query terms are read; file contents are never
+    touched at query time. Decoded postings are cached per term and the cache
+    is dropped whenever another connection commits (``PRAGMA data_version``).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = connect(path)
+        self._cache = OrderedDict()
+        self._data_version = None
+        self._dead = set()
+        self._doc_count = 0
+
+    def close(self):
+        self.conn.close()
+
+    def _check_version(self):
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self._cache.clear()
+            self._dead = {row[0] for row in self.conn.execute("SELECT id FROM docs WHERE live = 0")}
+            self._doc_count = self.conn.execute("SELECT COUNT(*) FROM docs WHERE live = 1").fetchone()[0]
+
+    def _postings(self, term):
+        """Return ``_TokenPostings`` for ``w:`` terms or a sorted id array for trigrams."""
+        cached = self._cache.get(term)
+        if cached is not None:
+            self._cache.move_to_end(term)
+            return cached
+        rows = self.conn.execute("SELECT ids, weights FROM postings WHERE term = ? ORDER BY seg",
+                                 (term,)).fetchall()
+        if term.startswith("w:"):
+            ids = array.array("i")
+            weights = array.array("f")
+            for ids_blob, weights_blob in rows:
+                ids.frombytes(ids_blob)
+                weights.frombytes(weights_blob)
+            if len(rows) > 1:
+                # Uncompacted segments: restore best-first order across them
+                pairs = sorted(zip(weights, ids), reverse=True)
+                weights = [p[0] for p in pairs]
+                ids = [p[1] for p in pairs]
+            result = _TokenPostings(ids, weights)
+        else:
+            result = array.array("i")
+            for ids_blob, _weights in rows:
+                result.frombytes(ids_blob)
+        self._cache[term] = result
+        if len(self._cache) > POSTINGS_CACHE_TERMS:
+            self._cache.popitem(last=False)
+        return result
+
+    def _substring_match(self, word):
+        """Docs containing every trigram of ``word`` (see ``_SubstringMatch``)."""
+        return _SubstringMatch(self._postings("t:" + g) for g in trigrams(word))
+
+    def _idf(self, df):
+        return math.log(1.0 + max(1, self._doc_count) / max(1, df))
+
+    def _rank_exact(self, postings, limit):
+        """Top ``limit`` docs matching every token exactly.
+
+        The rarest term drives the scan in best-weight-first order and the
+        scan stops once no remaining doc can beat the current top ``limit``.
+        """
+        postings = sorted(postings, key=len)
+        driver, others = postings[0], postings[1:]
+        driver_idf = self._idf(len(driver))
+        lookups = [(p.lookup(), self._idf(len(p))) for p in others]
+        rest_bound = sum(p.max_weight * idf for p, (_, idf) in zip(others, lookups))
+        dead = self._dead
+        heap = []
+        for doc_id, weight in zip(driver.ids, driver.weights):
+            score = weight * driver_idf
+            if len(heap) == limit and score + rest_bound <= heap[0][0]:
+                break
+            for lookup, idf in lookups:
+                other = lookup.get(doc_id)
+                if other is None:
+                    break
+                score += other * idf
+            else:
+                if doc_id in dead:
+                    continue
+                if len(heap) < limit:
+                    heapq.heappush(heap, (score, doc_id))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, doc_id))
+        return {doc_id: score for score, doc_id in heap}
+
+    def _rank_partial(self, words, limit):
+        """Like ``_rank_exact`` but the last word (and unknown words) may match
+        by substring, at a lower score than a whole-token match."""
+        per_word = []
+        for i, word in enumerate(words):
+            exact = self._postings("w:" + word)
+            partial = _SubstringMatch(())
+            if len(word) >= 3 and (i == len(words) - 1 or not len(exact)):
+                partial = self._substring_match(word)
+            if not len(exact) and not partial.bound:
+                return {}
+            per_word.append((exact, partial))
+        # Drive from the word with the fewest candidates; the others are only probed
+        per_word.sort(key=lambda p: len(p[0]) + p[1].bound)
+        scorers = []
+        for exact, partial in per_word:
+            bonus = 0.5 * self._idf(partial.bound) if partial.bound else 0.0
+            scorers.append((exact.lookup(), self._idf(len(exact)), partial, bonus))
+        if not any(len(exact) for exact, _ in per_word):
+            # Substring matches only: every match scores the same, so the top
+            # ``limit`` are the highest ids (as nlargest breaks ties) and the
+            # scan stops there instead of collecting every match
+            score = sum(bonus for _, _, _, bonus in scorers)
+            top = []
+            for doc_id in per_word[0][1].descending():
+                if doc_id not in self._dead and all(doc_id in partial for _, partial in per_word[1:]):
+                    top.append(doc_id)
+                    if len(top) == limit:
+                        break
+            return {doc_id: score for doc_id in top}
+        exact, partial = per_word[0]
+        candidates = set(exact.ids)
+        candidates.update(partial.ids())
+        candidates.difference_update(self._dead)
+        scored = []
+        for doc_id in candidates:
+            score = 0.0
+            for lookup, idf, word_partial, bonus in scorers:
+                weight = lookup.get(doc_id)
+                if weight is not None:
+                    score += weight * idf
+                elif doc_id in word_partial:
+                    score += bonus
+                else:
+                    break
+            else:
+                scored.append((score, doc_id))
+        return {doc_id: score for score, doc_id in heapq.nlargest(limit, scored)}
+
+    def search(self, query, limit=20):
+        """Return ``[(kind, filename, desc, score)]`` best first.
+
+        Every query word must match. Whole words match indexed tokens; when
+        that yields fewer than ``limit`` results, the last word (the one still
+        being typed) and unknown words also match by substring through their
+        trigrams, at a lower score.
+        """
+        self._check_version()
+        words = tokenize(query)
+        if not words:
+            return []
+        postings = [self._postings("w:" + word) for word in words]
+        results = {}
+        if all(len(p) for p in postings):
+            results = self._rank_exact(postings, limit)
+        if len(results) < limit:
+            results.update(self._rank_partial(words, limit))
+        top = heapq.nlargest(limit, results.items(), key=itemgetter(1))
+        if not top:
+            return []
+        placeholders = ",".join("?" * len(top))
+        docs = {
+            row[0]: row[1:] for row in self.conn.execute(
+                f"SELECT id, kind, filename, desc FROM docs WHERE id IN ({placeholders})",
+                [doc_id for doc_id, _ in top])
+        }
+        return [docs[doc_id] + (score,) for doc_id, score in top if doc_id in docs]
+
+
+class IndexUpdater(threading.Thread):
+    """Background thread that keeps the index in step with the folders.
+
+    ``request_update`` takes ``{kind: (folder or store, entries)}`` and coalesces
+    requests that arrive while an update is running.
+    """
+
+    def __init__(self, path, on_done=None):
+        super().__init__(name="IndexUpdater", daemon=True)
+        self.path = path
+        self.on_done = on_done
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._wake = threading.Event()
+        self._stopped = False
+
+    def request_update(self, sources):
+        with self._lock:
+            self._pending.update(sources)
+        self._wake.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def run(self):
+        conn = connect(self.path)
+        try:
+            while True:
+                self._wake.wait()
+                if self._stopped:
+                    break
+                self._wake.clear()
+                with self._lock:
+                    pending, self._pending = self._pending, {}
+                indexed = 0
+                for kind, (folder, entries) in pending.items():
+                    try:
+                        indexed += update_index(conn, kind, folder, entries)
+                    except (OSError, sqlite3.Error) as e:
+                        print(f"Search index update failed for {kind}: {e}")
+                if indexed:
+                    compact(conn)
+                    if self.on_done:
+                        self.on_done(indexed)
+        finally:
+            conn.close()
@@ -0,0 +1,154 @@
+import getpass
+import hmac
+import json
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import time
+
+# Kept free of tkinter and the rest of the app so a second launch can hand
+# off before paying for them.
+
+# Port and token of the running dashboard, one file per user
+INSTANCE_FILE = os.environ.get("TSE_INSTANCE_FILE") or os.path.join(
+    tempfile.gettempdir(), f"tse-dashboard-{getpass.getuser()}.json")
+CONNECT_TIMEOUT = 0.5  # seconds; a live instance answers in a few ms
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def enabled(argv):
+    """Single-instance mode is on unless ``--new-instance`` or ``TSE_SINGLE_INSTANCE=0``."""
+    return "--new-instance" not in argv and os.environ.get("TSE_SINGLE_INSTANCE", "1") != "0"
+
+
+def request_from_args(argv):
+    """Launch request from the command line.
+
+    ``--open scripts/name.txt`` (or ``cmds/...``) opens a snippet and
+    ``--search TERM`` runs a search; otherwise the window is just focused.
+    """
+    args = list(argv[1:])
+    for flag in ("--open", "--search"):
+        if flag in args:
+            index = args.index(flag)
+            value = args[index + 1] if index + 1 < len(args) else ""
+            if flag == "--search":
+                return {"action": "search", "query": value}
+            kind, _, filename = value.partition("/")
+            if kind in ("scripts", "cmds") and filename:
+                return {"action": "open", "kind": kind, "filename": filename}
+            print(f"Ignoring --open {value!r}: expected scripts/<file> or cmds/<file>")
+    return {"action": "focus"}
+
+
+def _read_instance_file(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        return int(info["port"]), str(info["token"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def hand_off(request, path=INSTANCE_FILE):
+    """Send ``request`` to a running dashboard.
+
+    Returns the round trip in seconds once the instance has accepted it, or
+    ``None`` when no instance answers (no file, stale port, wrong token), in
+    which case the caller starts normally.
+    """
+    info = _read_instance_file(path)
+    if info is None:
+        return None
+    port, token = info
+    start = time.perf_counter()
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=CONNECT_TIMEOUT) as conn:
+            conn.sendall(json.dumps(dict(request, token=token)).encode("utf-8") + b"\n")
+            reply = conn.makefile("rb").readline()
+    except OSError:
+        return None
+    if reply.strip() != b"ok":
+        return None
+    return time.perf_counter() - start
+
+
+class InstanceServer:
+    """Accepts launch requests from later launches on a localhost socket.
+
+    Listens on an ephemeral port on 127.0.0.1 and publishes the port and a
+    random token in ``path``; a request without the token is refused.
+    ``on_request(request)`` is called on the accept thread, so it should
+    only hand the request to the UI queue. Each request is answered as soon
+    as it is queued, so the launching process can exit right away.
+
+    Two launches racing each other may both start; the later one owns the
+    file and receives future requests.
+    """
+
+    def __init__(self, on_request, path=INSTANCE_FILE):
+        self.on_request = on_request
+        self.path = path
+        self.token = secrets.token_hex(16)
+        self.requests = 0
+        self._sock = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        sock.settimeout(0.5)  # wake up to notice stop()
+        self._sock = sock
+        self._publish(sock.getsockname()[1])
+        self._thread = threading.Thread(target=self._serve, name="instance-server", daemon=True)
+        self._thread.start()
+
+    def _publish(self, port):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"port": port, "token": self.token, "pid": os.getpid()}, f)
+        os.replace(tmp, self.path)
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._sock is not None:
+            self._sock.close()
+        # Leave the file alone if a newer instance has taken it over
+        info = _read_instance_file(self.path)
+        if info is not None and info[1] == self.token:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _serve(self):
+        while not self._stopped.is_set():
+            try:
+                conn, _addr = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            with conn:
+                try:
+                    self._handle(conn)
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring launch request: {e}")
+
+    def _handle(self, conn):
+        conn.settimeout(1.0)
+        line = conn.makefile("rb").readline(MAX_REQUEST_BYTES)
+        request = json.loads(line)
+        if not isinstance(request, dict) or not hmac.compare_digest(str(request.pop("token", "")), self.token):
+            conn.sendall(b"denied\n")
+            return
+        self.requests += 1
+        self.on_request(request)
+        conn.sendall(b"ok\n")
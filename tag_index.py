@@ -0,0 +1,180 @@
+import re
+
+# Above this many entries removed at once, rebuilding beats shifting bits
+MAX_SHIFTED_REMOVALS = 8
+_TAG_SPLIT = re.compile(r"[\s,;]+")
+# Bit offsets set in each byte value, for enumerating bitmap members
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+_NONZERO = re.compile(rb"[^\x00]")
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def _popcount(bits):
+        return bin(bits).count("1")
+
+
+def parse_tags(text):
+    """Tags typed as ``os:windows, severity:high customer:acme`` -> sorted tuple.
+
+    Tags are lower-cased; ``facet:value`` groups a tag under a facet.
+    """
+    return tuple(sorted({tag for tag in _TAG_SPLIT.split(text.lower()) if tag.strip(":")}))
+
+
+def facet(tag):
+    """The facet a tag is listed under (``os`` for ``os:windows``, ``""`` for plain tags)."""
+    return tag.split(":", 1)[0] if ":" in tag else ""
+
+
+def parse_query(text):
+    """Parse a tag filter into ``(groups, excluded)``.
+
+    Terms are ANDed. ``a|b`` (or ``a OR b``) matches either tag and binds
+    tighter than AND; ``-a``, ``!a`` or ``NOT a`` excludes a tag. Every
+    group must match and no excluded tag may.
+    """
+    groups, excluded = [], []
+    negate = join = False
+    for token in text.lower().split():
+        if token in ("and", "&"):
+            continue
+        if token == "not":
+            negate = True
+            continue
+        if token in ("or", "|"):
+            join = True
+            continue
+        if token[0] in "-!":
+            negate, token = True, token[1:]
+        tags = tuple(tag for tag in token.split("|") if tag)
+        if not tags:
+            continue
+        if negate:
+            excluded.extend(tags)
+        elif join and groups:
+            groups[-1] += tags
+        else:
+            groups.append(tags)
+        negate = join = False
+    return groups, excluded
+
+
+def _bitmap(positions, count):
+    data = bytearray((count + 7) // 8)
+    for position in positions:
+        data[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(data, "little")
+
+
+class TagIndex:
+    """Per-tag bitmaps over one list of entries (a panel), for faceted filtering.
+
+    Bit ``i`` of a tag's bitmap (a Python int) is set when the entry at
+    position ``i`` of the list has that tag, so a filter of any shape is a
+    few big-int AND/OR/AND NOTs, the matching positions come out in list
+    order (ready for ``VirtualList.order``) and a facet count is the
+    popcount of one AND. The index mirrors the list: ``append`` follows an
+    entry added at the end, and ``remove_keys`` shifts the higher bits down
+    as the list closes the gap.
+    """
+
+    def __init__(self):
+        self.keys = []  # key (filename or link id) per position
+        self.tags = []  # tuple of tags per position
+        self.bitmaps = {}  # tag -> int
+
+    def __len__(self):
+        return len(self.keys)
+
+    # --- Updates ---
+    def rebuild(self, items):
+        """Replace the index with ``[(key, tags)]`` in list order."""
+        self.keys = []
+        self.tags = []
+        members = {}
+        for position, (key, tags) in enumerate(items):
+            tags = tuple(tags)
+            self.keys.append(key)
+            self.tags.append(tags)
+            for tag in tags:
+                members.setdefault(tag, []).append(position)
+        self.bitmaps = {tag: _bitmap(positions, len(self.keys)) for tag, positions in members.items()}
+
+    def append(self, key, tags=()):
+        self.keys.append(key)
+        self.tags.append(())
+        self.set_tags(len(self.keys) - 1, tags)
+
+    def set_tags(self, position, tags):
+        old, new = set(self.tags[position]), set(tags)
+        bit = 1 << position
+        for tag in old - new:
+            bits = self.bitmaps[tag] & ~bit
+            if bits:
+                self.bitmaps[tag] = bits
+            else:
+                del self.bitmaps[tag]
+        for tag in new - old:
+            self.bitmaps[tag] = self.bitmaps.get(tag, 0) | bit
+        self.tags[position] = tuple(sorted(new))
+
+    def position(self, key):
+        """Position of ``key``, or ``None``."""
+        try:
+            return self.keys.index(key)
+        except ValueError:
+            return None
+
+    def remove_keys(self, keys):
+        gone = set(keys)
+        positions = [i for i, key in enumerate(self.keys) if key in gone]
+        if len(positions) > MAX_SHIFTED_REMOVALS:
+            self.rebuild([(key, tags) for key, tags in zip(self.keys, self.tags) if key not in gone])
+            return
+        for position in reversed(positions):
+            low = (1 << position) - 1
+            for tag, bits in list(self.bitmaps.items()):
+                bits = bits & low | bits >> (position + 1) << position
+                if bits:
+                    self.bitmaps[tag] = bits
+                else:
+                    del self.bitmaps[tag]
+            del self.keys[position]
+            del self.tags[position]
+
+    # --- Queries ---
+    def all(self):
+        return (1 << len(self.keys)) - 1
+
+    def mask(self, groups, excluded=()):
+        """Bitmap of the entries matching a ``parse_query`` result."""
+        result = self.all()
+        for group in groups:
+            any_bits = 0
+            for tag in group:
+                any_bits |= self.bitmaps.get(tag, 0)
+            result &= any_bits
+            if not result:
+                return 0
+        for tag in excluded:
+            result &= ~self.bitmaps.get(tag, 0)
+        return result
+
+    @staticmethod
+    def members(mask):
+        """Set bit positions of ``mask``, lowest first."""
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        positions = []
+        for match in _NONZERO.finditer(data):
+            base = match.start() * 8
+            positions.extend(base + bit for bit in _BYTE_BITS[data[match.start()]])
+        return positions
+
+    @staticmethod
+    def count(mask):
+        return _popcount(mask)
+
+    def counts(self, mask):
+        """``{tag: entries in mask with the tag}`` for every tag in use."""
+        return {tag: _popcount(bits & mask) for tag, bits in self.bitmaps.items()}
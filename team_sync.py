@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import shutil
+
+from library import atomic_write, scan_folder
+
+MANIFEST_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def conflict_name(filename):
+    """Name the team's copy of a file the user has edited locally."""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem} (team){ext}"
+
+
+class SyncReport:
+    """What one sync pass did, as filename lists keyed by kind."""
+
+    def __init__(self):
+        self.added = {}
+        self.updated = {}
+        self.removed = {}
+        self.conflicts = {}  # local edits kept; the team copy saved as conflict_name()
+        self.kept = {}  # removed from the team library but edited locally, so kept
+        self.errors = {}  # filename -> error
+        self.hashed = 0
+
+    def note(self, field, kind, filename):
+        getattr(self, field).setdefault(kind, []).append(filename)
+
+    def changed_kinds(self):
+        return {kind for field in (self.added, self.updated, self.removed, self.conflicts)
+                for kind, names in field.items() if names}
+
+    def summary(self):
+        counts = [(label, sum(len(names) for names in field.values())) for label, field in (
+            ("added", self.added), ("updated", self.updated), ("removed", self.removed),
+            ("conflicts", self.conflicts), ("kept", self.kept), ("errors", self.errors))]
+        return ", ".join(f"{count} {label}" for label, count in counts if count) or "up to date"
+
+
+class TeamSync:
+    """One-way delta sync from a shared team library into the user folders.
+
+    ``folders`` maps kind to ``(subfolder of shared_dir, local folder)``. A
+    manifest remembers, per file, the content hash last synced and the
+    ``(mtime_ns, size)`` of both copies at that point. A team file whose
+    stat has not changed is skipped without being read, so a sync that
+    finds nothing to do costs two directory scans. Changed team files are
+    hashed and copied only if their content differs.
+
+    Local edits win: a team update to a file the user changed is written
+    next to it as ``conflict_name(filename)``. A file removed from the team
+    library is removed locally only if the user never edited it, and a
+    local delete is respected until the team changes the file again.
+    """
+
+    def __init__(self, shared_dir, folders, manifest_path, suffix=".txt"):
+        self.shared_dir = shared_dir
+        self.folders = folders
+        self.manifest_path = manifest_path
+        self.suffix = suffix
+        self._files = None  # kind -> {filename: [hash, src mtime, src size, dst mtime, dst size]}
+
+    # --- Manifest ---
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable sync manifest {self.manifest_path}: {e}")
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION or manifest.get("shared") != self.shared_dir:
+            return {}  # a different library; start over
+        return manifest.get("files", {})
+
+    def _save_manifest(self):
+        atomic_write(self.manifest_path, json.dumps(
+            {"version": MANIFEST_VERSION, "shared": self.shared_dir, "files": self._files}))
+
+    # --- Sync ---
+    def run(self):
+        """Sync every kind once and return a ``SyncReport``. Runs on the I/O pool."""
+        if not os.path.isdir(self.shared_dir):
+            raise FileNotFoundError(f"Team library folder not found: {self.shared_dir}")
+        if self._files is None:
+            self._files = self._load_manifest()
+        report = SyncReport()
+        dirty = False
+        for kind, (subfolder, local) in self.folders.items():
+            entries = self._files.setdefault(kind, {})
+            dirty |= self._sync_kind(kind, os.path.join(self.shared_dir, subfolder), local, entries, report)
+        if dirty:
+            self._save_manifest()
+        return report
+
+    def _sync_kind(self, kind, shared, local, entries, report):
+        src = scan_folder(shared, self.suffix)
+        dst = scan_folder(local, self.suffix)
+        dirty = False
+        for name, src_stat in src.items():
+            entry = entries.get(name)
+            if entry is not None and (entry[1], entry[2]) == src_stat:
+                continue  # team copy unchanged since the last sync
+            try:
+                dirty |= self._sync_file(kind, name, shared, local, src_stat, dst.get(name), entry, entries, report)
+            except OSError as e:
+                report.errors[f"{kind}/{name}"] = e
+        for name in [name for name in entries if name not in src]:
+            entry = entries.pop(name)
+            dirty = True
+            dst_stat = dst.get(name)
+            if dst_stat is None:
+                continue
+            if (entry[3], entry[4]) == dst_stat:
+                try:
+                    os.remove(os.path.join(local, name))
+                    report.note("removed", kind, name)
+                except OSError as e:
+                    report.errors[f"{kind}/{name}"] = e
+            else:
+                report.note("kept", kind, name)
+        return dirty
+
+    def _sync_file(self, kind, name, shared, local, src_stat, dst_stat, entry, entries, report):
+        src_path = os.path.join(shared, name)
+        dst_path = os.path.join(local, name)
+        src_hash = file_hash(src_path)
+        report.hashed += 1
+        if entry is not None and entry[0] == src_hash:
+            # Touched but not changed
+            entry[1:3] = src_stat
+            return True
+        if dst_stat is None:
+            dst_stat = self._copy(src_path, dst_path)
+            report.note("added", kind, name)
+        elif entry is not None and (entry[3], entry[4]) == dst_stat:
+            dst_stat = self._copy(src_path, dst_path)
+            report.note("updated", kind, name)
+        else:
+            local_hash = file_hash(dst_path)
+            report.hashed += 1
+            if local_hash == src_hash:
+                pass  # already identical
+            elif entry is not None and local_hash == entry[0]:
+                dst_stat = self._copy(src_path, dst_path)
+                report.note("updated", kind, name)
+            else:
+                self._copy(src_path, os.path.join(local, conflict_name(name)))
+                report.note("conflicts", kind, name)
+        entries[name] = [src_hash, src_stat[0], src_stat[1], dst_stat[0], dst_stat[1]]
+        return True
+
+    @staticmethod
+    def _copy(src_path, dst_path):
+        # Copy beside the target and swap it in, so readers never see half a file
+        tmp = dst_path + ".sync-tmp"
+        shutil.copyfile(src_path, tmp)
+        os.replace(tmp, dst_path)
+        st = os.stat(dst_path)
+        return (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,193 @@
+import codecs
+import math
+import mmap
+import tkinter as tk
+
+# Files up to this size are read in one go (through the content cache)
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+# Files above this size are shown one page at a time to cap memory use
+PAGE_THRESHOLD_BYTES = 32 * 1024 * 1024
+PAGE_BYTES = 4 * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+
+
+class FileLoad:
+    """Handle for a file load started on the I/O pool.
+
+    Small files are inserted in one go when the read finishes; large ones
+    hand over to a ``StreamingLoader`` (``streaming``). ``done``,
+    ``cancelled`` and ``paged`` reflect whichever applies. ``close()`` abandons the load so
+    its text widget can be reused for another file.
+    """
+
+    def __init__(self):
+        self.streaming = None
+        self.closed = False
+        self._done = False
+
+    @property
+    def done(self):
+        return self.streaming.done if self.streaming is not None else self._done
+
+    @property
+    def cancelled(self):
+        return self.streaming is not None and self.streaming.cancelled
+
+    @property
+    def paged(self):
+        return self.streaming is not None and self.streaming.paged
+
+    def close(self):
+        self.closed = True
+        if self.streaming is not None:
+            self.streaming.close()
+
+
+def _mb(n):
+    return n / (1024 * 1024)
+
+
+class StreamingLoader:
+    """Loads a large file into a Text widget without blocking the UI.
+
+    The file is memory-mapped and inserted ``CHUNK_BYTES`` at a time from
+    ``after()`` ticks, with a progress line and a Cancel button packed at the
+    top of ``popup``. Files above ``PAGE_THRESHOLD_BYTES`` are paged: only one
+    ``PAGE_BYTES`` window (extended to the next line break) is in the widget at
+    a time, with Prev/Next buttons to move through the file.
+    """
+
+    def __init__(self, popup, text_widget, path, size, before=None, on_done=None):
+        self.popup = popup
+        self.text = text_widget
+        self.path = path
+        self.size = size
+        self.on_done = on_done
+        self.paged = size > PAGE_THRESHOLD_BYTES
+        self.done = False
+        self.cancelled = False
+        self._job = None
+        self._page_starts = [0]
+
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        popup.bind("<Destroy>", self._on_destroy, add="+")
+
+        self.bar = tk.Frame(popup)
+        # ``before`` is the popup child the bar is packed above (the text by default)
+        self.bar.pack(side="top", fill="x", before=before or text_widget)
+        self.status = tk.Label(self.bar, anchor="w")
+        self.status.pack(side="left", fill="x", expand=True, padx=5)
+        self.cancel_btn = tk.Button(self.bar, text="Cancel", command=self.cancel)
+        self.cancel_btn.pack(side="right", padx=5)
+        if self.paged:
+            self.next_btn = tk.Button(self.bar, text="Next Page", command=self.next_page)
+            self.next_btn.pack(side="right", padx=2)
+            self.prev_btn = tk.Button(self.bar, text="Prev Page", command=self.prev_page)
+            self.prev_btn.pack(side="right", padx=2)
+        self._load_page(0)
+
+    # --- Paging ---
+    def _page_end(self, start):
+        if not self.paged:
+            return self.size
+        end = min(self.size, start + PAGE_BYTES)
+        if end < self.size:
+            newline = self._mm.find(b"\n", end)
+            end = self.size if newline < 0 else newline + 1
+        return end
+
+    def _load_page(self, index):
+        self._stop()
+        self.page = index
+        self.offset = self._page_starts[index]
+        self.end = self._page_end(self.offset)
+        if index + 1 == len(self._page_starts) and self.end < self.size:
+            self._page_starts.append(self.end)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.done = False
+        self.cancelled = False
+        self.text.delete("1.0", tk.END)
+        self.cancel_btn.config(state="normal")
+        if self.paged:
+            self.prev_btn.config(state="disabled")
+            self.next_btn.config(state="disabled")
+        self._job = self.popup.after(1, self._tick)
+
+    def next_page(self):
+        if self.page + 1 < len(self._page_starts):
+            self._load_page(self.page + 1)
+
+    def prev_page(self):
+        if self.page > 0:
+            self._load_page(self.page - 1)
+
+    # --- Loading ---
+    def _tick(self):
+        self._job = None
+        chunk = self._mm[self.offset:min(self.end, self.offset + CHUNK_BYTES)]
+        self.offset += len(chunk)
+        finished = self.offset >= self.end
+        self.text.insert(tk.END, self._decoder.decode(chunk, final=finished))
+        self._show_progress()
+        if finished:
+            self._finish()
+        else:
+            self._job = self.popup.after(1, self._tick)
+
+    def _show_progress(self):
+        start = self._page_starts[self.page]
+        span = max(1, self.end - start)
+        percent = 100.0 * (self.offset - start) / span
+        text = f"Loading {percent:.0f}% of {_mb(span):.1f} MB"
+        if self.paged:
+            pages = math.ceil(self.size / PAGE_BYTES)
+            text = f"Page {self.page + 1} of ~{pages} - " + text
+        if self.cancelled:
+            text += " (cancelled)"
+        elif self.offset >= self.end:
+            text = text.replace("Loading", "Loaded")
+        self.status.config(text=text)
+
+    def _finish(self):
+        self.done = True
+        self.cancel_btn.config(state="disabled")
+        if self.paged:
+            self.prev_btn.config(state="normal" if self.page > 0 else "disabled")
+            self.next_btn.config(state="normal" if self.end < self.size else "disabled")
+        if self.on_done:
+            self.on_done(self)
+
+    def _stop(self):
+        if self._job is not None:
+            self.popup.after_cancel(self._job)
+            self._job = None
+
+    def cancel(self):
+        if self.done or self.cancelled:
+            return
+        self._stop()
+        self.cancelled = True
+        self.cancel_btn.config(state="disabled")
+        if self.paged:
+            self.prev_btn.config(state="normal" if self.page > 0 else "disabled")
+            self.next_btn.config(state="normal" if self.end < self.size else "disabled")
+        self._show_progress()
+
+    def close(self):
+        """Stop loading and remove the progress bar, leaving ``popup`` in use."""
+        if self._mm.closed:
+            return
+        # The <Destroy> handler stays bound (unbind would drop the popup's
+        # other handlers before Python 3.13); it does nothing once released
+        self._release()
+        self.bar.destroy()
+
+    def _release(self):
+        self._stop()
+        self._mm.close()
+        self._file.close()
+
+    def _on_destroy(self, event):
+        if event.widget is self.popup and not self._mm.closed:
+            self._release()
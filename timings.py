@@ -0,0 +1,39 @@
+import time
+
+
+class PhaseTimer:
+    """Records named phases (e.g. of startup) relative to a fixed origin.
+
+    ``mark`` closes a phase that started where the previous one ended;
+    ``begin``/``end`` bracket phases that complete asynchronously.
+    """
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases = []  # (name, start, end), in completion order
+        self._open = {}
+        self._last = self.origin
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, self._last, now))
+        self._last = now
+
+    def begin(self, name):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name):
+        start = self._open.pop(name, None)
+        if start is None:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, start, now))
+        self._last = now
+
+    def report(self):
+        lines = [f"{'phase':<14} {'start ms':>9} {'took ms':>9}"]
+        for name, start, end in self.phases:
+            lines.append(f"{name:<14} {(start - self.origin) * 1000:>9.1f} {(end - start) * 1000:>9.1f}")
+        if self.phases:
+            lines.append(f"{'total':<14} {'':>9} {(self.phases[-1][2] - self.origin) * 1000:>9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,49 @@
+import tkinter as tk
+from tkinter import ttk
+
+REFRESH_MS = 1000
+
+
+class SlowestHandlersOverlay(tk.Toplevel):
+    """Small always-on-top table of the slowest traced handlers.
+
+    Refreshed once a second from ``tracer.slowest``; the last row counts
+    main-loop stalls.
+    """
+
+    def __init__(self, parent, tracer, count=10):
+        super().__init__(parent)
+        self.title("Slowest Handlers")
+        self.geometry("560x260")
+        self.attributes("-topmost", True)
+        self.tracer = tracer
+        self.count = count
+
+        self.table = ttk.Treeview(self, columns=("calls", "total", "max"), height=count)
+        self.table.heading("#0", text="Handler")
+        self.table.column("#0", width=340)
+        for name, heading in (("calls", "Calls"), ("total", "Total ms"), ("max", "Max ms")):
+            self.table.heading(name, text=heading)
+            self.table.column(name, width=70, anchor="e")
+        self.table.pack(fill="both", expand=True)
+        self.stalls = tk.Label(self, anchor="w")
+        self.stalls.pack(fill="x", padx=5)
+        self._job = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh()
+
+    def refresh(self):
+        self.table.delete(*self.table.get_children())
+        for name, calls, total, worst in self.tracer.slowest(self.count):
+            self.table.insert("", "end", text=name, values=(calls, f"{total * 1000:.1f}", f"{worst * 1000:.1f}"))
+        stalls = self.tracer.stalls
+        text = f"Main loop stalls over {self.tracer.stall_threshold * 1000:.0f} ms: {len(stalls)}"
+        if stalls:
+            text += f" (last {stalls[-1][1] * 1000:.0f} ms)"
+        self.stalls.config(text=text)
+        self._job = self.after(REFRESH_MS, self.refresh)
+
+    def close(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+        self.destroy()
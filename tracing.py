@@ -0,0 +1,199 @@
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+# The active Tracer, or None when tracing is off (the default). Hot paths
+# check this one global, so disabled tracing costs next to nothing.
+TRACER = None
+
+# Main-loop gaps longer than this are reported as stalls
+STALL_THRESHOLD_MS = 200
+# Events kept for the trace file; the oldest are dropped first
+MAX_EVENTS = 500_000
+HEARTBEAT_MS = 50
+
+
+def _label(func):
+    """``qualname (file:line)`` for a callback, falling back to its repr."""
+    func = getattr(func, "__func__", func)
+    code = getattr(func, "__code__", None)
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", None) or type(func).__name__
+    if code is None:
+        return name
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Tracer:
+    """Times callbacks and watches the Tk main loop for stalls.
+
+    Spans are kept as Chrome trace events (``export`` writes a file that
+    chrome://tracing and Perfetto open) and summed per name for the
+    slowest-handlers overlay. A heartbeat ``after`` job marks the main loop
+    as alive; a watchdog thread captures the main thread's stack when the
+    heartbeat is late by more than ``stall_threshold_ms``.
+    """
+
+    def __init__(self, stall_threshold_ms=STALL_THRESHOLD_MS, max_events=MAX_EVENTS):
+        self.stall_threshold = stall_threshold_ms / 1000
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=max_events)
+        self.stats = {}  # name -> [count, total seconds, max seconds]
+        self.stalls = []  # (start, duration, stack)
+        self.root = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._main_thread = threading.main_thread().ident
+        self._last_beat = None
+        self._stall_stack = None
+        self._stopped = threading.Event()
+        self._labels = {}
+
+    # --- Recording ---
+    def record(self, name, cat, start, end, args=None):
+        event = {"name": name, "cat": cat, "ph": "X", "pid": self._pid, "tid": threading.get_ident(),
+                 "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+        duration = end - start
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                self.stats[name] = [1, duration, duration]
+            else:
+                stat[0] += 1
+                stat[1] += duration
+                stat[2] = max(stat[2], duration)
+
+    def call(self, func, args, cat, name=None):
+        """Run ``func(*args)`` as a span named after ``func``."""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.record(name or self.label(func), cat, start, time.perf_counter())
+
+    def traced(self, func, name, cat):
+        """Wrap ``func`` so each call is recorded as a span called ``name``."""
+        def run(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, cat, start, time.perf_counter())
+        return run
+
+    def label(self, func):
+        code = getattr(getattr(func, "__func__", func), "__code__", None)
+        if code is None:
+            return _label(func)
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _label(func)
+        return label
+
+    # --- Tk hooks ---
+    def install_tk(self):
+        """Time every Tk callback: commands, bindings, variable traces and ``after`` jobs.
+
+        Patches ``tkinter.CallWrapper``, which every Tk callback goes
+        through, so it must run before the widgets are created.
+        """
+        import tkinter
+
+        tracer = self
+        wrapped = tkinter.CallWrapper.__call__
+        # after() registers a "callit" closure around the job; unwrap it for the name
+        callit = _callit_code(tkinter.Misc.after)
+        job_cell = callit.co_freevars.index("func") if callit is not None else None
+
+        def __call__(wrapper, *args):
+            func = wrapper.func
+            cat = "tk"
+            if job_cell is not None and getattr(func, "__code__", None) is callit:
+                func = func.__closure__[job_cell].cell_contents
+                cat = "after"
+            if getattr(func, "__func__", None) is Tracer._heartbeat:
+                return wrapped(wrapper, *args)
+            start = time.perf_counter()
+            try:
+                return wrapped(wrapper, *args)
+            finally:
+                tracer.record(tracer.label(func), cat, start, time.perf_counter())
+
+        tkinter.CallWrapper.__call__ = __call__
+
+    def attach(self, root):
+        """Start the heartbeat on ``root`` and the stall watchdog thread."""
+        self.root = root
+        self._last_beat = time.perf_counter()
+        root.after(HEARTBEAT_MS, self._heartbeat)
+        threading.Thread(target=self._watch, name="stall-watchdog", daemon=True).start()
+
+    def _heartbeat(self):
+        now = time.perf_counter()
+        gap = now - self._last_beat - HEARTBEAT_MS / 1000
+        if gap > self.stall_threshold:
+            stack = self._stall_stack or ""
+            self.stalls.append((self._last_beat, now - self._last_beat, stack))
+            self.record("main loop stall", "stall", self._last_beat, now, {"stack": stack})
+        self._stall_stack = None
+        self._last_beat = now
+        if not self._stopped.is_set():
+            self.root.after(HEARTBEAT_MS, self._heartbeat)
+
+    def _watch(self):
+        interval = max(0.01, self.stall_threshold / 4)
+        while not self._stopped.wait(interval):
+            late = time.perf_counter() - self._last_beat - HEARTBEAT_MS / 1000
+            if late > self.stall_threshold and self._stall_stack is None:
+                frame = sys._current_frames().get(self._main_thread)
+                self._stall_stack = "".join(traceback.format_stack(frame)) if frame else ""
+                print(f"UI stalled for over {late * 1000:.0f} ms in:\n{self._stall_stack}", file=sys.stderr)
+
+    def stop(self):
+        self._stopped.set()
+
+    # --- Output ---
+    def slowest(self, count=10):
+        """``[(name, calls, total, max)]`` sorted by the slowest single call."""
+        with self._lock:
+            rows = [(name, s[0], s[1], s[2]) for name, s in self.stats.items()]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows[:count]
+
+    def export(self, path):
+        """Write a Chrome trace (JSON object format) to ``path``."""
+        from library import atomic_write
+
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+                    for tid, name in names.items()]
+        atomic_write(path, json.dumps({"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"}))
+
+    def report(self, count=10):
+        lines = [f"{'handler':<60} {'calls':>6} {'total ms':>9} {'max ms':>8}"]
+        for name, calls, total, worst in self.slowest(count):
+            lines.append(f"{name[:60]:<60} {calls:>6} {total * 1000:>9.1f} {worst * 1000:>8.1f}")
+        lines.append(f"main loop stalls over {self.stall_threshold * 1000:.0f} ms: {len(self.stalls)}")
+        return "\n".join(lines)
+
+
+def _callit_code(after):
+    # tkinter's after() defines its callback closure inline; find its code object
+    for const in after.__code__.co_consts:
+        if getattr(const, "co_name", None) == "callit":
+            return const
+    return None
+
+
+def enable(stall_threshold_ms=STALL_THRESHOLD_MS):
+    """Turn tracing on for this process and return the ``Tracer``."""
+    global TRACER
+    TRACER = Tracer(stall_threshold_ms)
+    TRACER.install_tk()
+    return TRACER
@@ -0,0 +1,64 @@
+import queue
+
+import tracing
+
+
+class UIQueue:
+    """Runs callbacks posted from background threads on the Tk thread.
+
+    Tkinter widgets must only be touched from the thread running
+    ``mainloop``, so workers call ``post`` and the queue is drained by a
+    short ``after()`` loop. An empty queue costs one ``get_nowait`` per tick.
+    """
+
+    def __init__(self, widget, interval_ms=50, max_per_tick=200):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.max_per_tick = max_per_tick
+        self._queue = queue.Queue()
+        self._job = None
+
+    def post(self, func, *args):
+        """Schedule ``func(*args)`` on the Tk thread. Safe from any thread."""
+        self._queue.put((func, args))
+
+    def start(self):
+        if self._job is None:
+            self._job = self.widget.after(self.interval_ms, self._poll)
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def drain(self):
+        """Run everything queued so far (used at exit, after ``mainloop``).
+
+        A failing callback is logged and skipped, as in the ``after()`` loop,
+        so the rest of the exit sequence still runs.
+        """
+        while True:
+            try:
+                func, args = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._call(func, args)
+
+    def _call(self, func, args):
+        tracer = tracing.TRACER
+        try:
+            if tracer is None:
+                func(*args)
+            else:
+                tracer.call(func, args, "ui")
+        except Exception as e:
+            print(f"UI callback {func!r} failed: {e}")
+
+    def _poll(self):
+        for _ in range(self.max_per_tick):
+            try:
+                func, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._call(func, args)
+        self._job = self.widget.after(self.interval_ms, self._poll)
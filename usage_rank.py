@@ -0,0 +1,214 @@
+import math
+import random
+import time
+
+HALF_LIFE_DAYS = 7
+# What a use adds to an entry's score, by kind of use
+EVENT_WEIGHTS = {"open": 1.0, "copy": 2.0, "run": 2.0}
+COUNTERS = {"open": "opens", "copy": "copies", "run": "runs"}
+# Scores are stored relative to this moment (2024-01-01 UTC)
+EPOCH = 1704067200
+UNUSED = -math.inf
+
+
+def _log2_add(a, b):
+    """``log2(2 ** a + 2 ** b)`` without overflowing."""
+    if a < b:
+        a, b = b, a
+    if b == UNUSED:
+        return a
+    return a + math.log2(1 + 2 ** (b - a))
+
+
+def new_record():
+    return {"score": UNUSED, "opens": 0, "copies": 0, "runs": 0, "last_used": None}
+
+
+class _Node:
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value, height):
+        self.value = value
+        self.next = [None] * height
+        self.width = [0] * height
+
+
+_END = _Node((math.inf, math.inf), 0)
+
+
+class RankedOrder:
+    """Sorted sequence with O(log n) insert, remove and n-th item lookup.
+
+    An indexable skip list: each link records how many items it jumps over,
+    so ``order[i]`` walks down the levels instead of along the list. Items
+    are ``(-score, position)`` pairs and indexing returns the position, so
+    the object can be handed to ``VirtualList`` as its ``order``; moving one
+    entry after a use touches O(log n) links and nothing else.
+    """
+
+    def __init__(self, values=()):
+        self.build(values)
+
+    def build(self, values):
+        """Replace the contents with ``values`` in O(n); they must already be sorted."""
+        values = list(values)
+        self.size = len(values)
+        self.levels = max(8, (self.size * 2).bit_length())
+        self.head = _Node(None, self.levels)
+        last = [self.head] * self.levels
+        last_at = [0] * self.levels
+        for i, value in enumerate(values, 1):
+            # Perfectly balanced heights: 1 + the trailing zero bits of i
+            node = _Node(value, min(self.levels, (i & -i).bit_length()))
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = i - last_at[level]
+                last[level], last_at[level] = node, i
+        for level in range(self.levels):
+            last[level].next[level] = _END
+            last[level].width[level] = self.size + 1 - last_at[level]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        node = self.head
+        index += 1
+        for level in reversed(range(self.levels)):
+            while node.width[level] <= index:
+                index -= node.width[level]
+                node = node.next[level]
+        return node.value[1]
+
+    def __iter__(self):
+        node = self.head.next[0]
+        while node is not _END:
+            yield node.value[1]
+            node = node.next[0]
+
+    def insert(self, value):
+        chain = [None] * self.levels
+        steps_at = [0] * self.levels
+        node = self.head
+        for level in reversed(range(self.levels)):
+            while node.next[level].value <= value:
+                steps_at[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        height = 1
+        while height < self.levels and random.random() < 0.5:
+            height += 1
+        new = _Node(value, height)
+        steps = 0
+        for level in range(height):
+            previous = chain[level]
+            new.next[level] = previous.next[level]
+            previous.next[level] = new
+            new.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at[level]
+        for level in range(height, self.levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def discard(self, value):
+        """Remove ``value``; returns whether it was there."""
+        chain = [None] * self.levels
+        node = self.head
+        for level in reversed(range(self.levels)):
+            while node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+        found = chain[0].next[0]
+        if found.value != value:
+            return False
+        for level in range(len(found.next)):
+            previous = chain[level]
+            previous.width[level] += found.width[level] - 1
+            previous.next[level] = found.next[level]
+        for level in range(len(found.next), self.levels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+        return True
+
+
+class UsageRanking:
+    """Frecency ranking of one panel (scripts or CMDs), kept in step with its list.
+
+    Every open, copy or run adds its weight to the entry's score, and older
+    uses fade with a half-life of ``half_life_days``. The score is kept as
+    ``log2`` of the uses' weight scaled to ``EPOCH`` rather than to now, so
+    all scores fade at the same rate, their order never changes by itself
+    and nothing has to be decayed over time. A use only moves its own
+    entry: O(log n) in ``order`` (and in ``filtered``, when the panel is
+    filtered). Entries never used keep their list order at the end.
+    """
+
+    def __init__(self, half_life_days=HALF_LIFE_DAYS):
+        self.half_life = half_life_days * 86400
+        self.usage = {}  # key -> record (see new_record), persisted by the caller
+        self.positions = {}  # key -> position in the panel list
+        self.order = RankedOrder()
+        self.filtered = None  # RankedOrder over a subset of positions
+
+    def _value(self, key, position):
+        record = self.usage.get(key)
+        return (-(record["score"] if record else UNUSED), position)
+
+    # --- Keeping step with the list ---
+    def rebuild(self, keys):
+        """Rank the panel's keys (in list order) from scratch, e.g. after removals."""
+        self.positions = {key: position for position, key in enumerate(keys)}
+        self.order.build(sorted(self._value(key, position) for key, position in self.positions.items()))
+        self.filtered = None
+
+    def append(self, key):
+        position = len(self.positions)
+        self.positions[key] = position
+        self.order.insert(self._value(key, position))
+
+    def clear(self):
+        """Stop ranking (the panel shows list order); uses are still counted."""
+        self.positions = {}
+        self.order = RankedOrder()
+        self.filtered = None
+
+    def set_filter(self, positions):
+        """Rank only ``positions`` (a tag filter's matches); ``None`` ranks them all."""
+        if positions is None:
+            self.filtered = None
+            return
+        keys = list(self.positions)
+        self.filtered = RankedOrder(sorted(self._value(keys[position], position) for position in positions))
+
+    def current(self):
+        """The order to show: the filtered one if there is a filter."""
+        return self.order if self.filtered is None else self.filtered
+
+    # --- Uses ---
+    def record(self, key, event, when=None):
+        """Count a use of ``key`` and move it to its new rank; returns its record."""
+        when = time.time() if when is None else when
+        position = self.positions.get(key)
+        old = self._value(key, position)
+        record = self.usage.setdefault(key, new_record())
+        use = (when - EPOCH) / self.half_life + math.log2(EVENT_WEIGHTS[event])
+        record["score"] = _log2_add(record["score"], use)
+        record[COUNTERS[event]] += 1
+        record["last_used"] = when
+        if position is not None:
+            new = self._value(key, position)
+            for order in (self.order, self.filtered):
+                if order is not None and order.discard(old):
+                    order.insert(new)
+        return record
+
+    def score(self, key, now=None):
+        """Decayed score of ``key`` now: uses weighted by how recent they are."""
+        record = self.usage.get(key)
+        if record is None or record["score"] == UNUSED:
+            return 0.0
+        now = time.time() if now is None else now
+        return 2 ** (record["score"] - (now - EPOCH) / self.half_life)
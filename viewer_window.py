@@ -0,0 +1,152 @@
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import scrolledtext, ttk
+
+MAX_TABS = 12
+
+
+class _Tab:
+    """A notebook page and its text widget; reused from file to file."""
+
+    def __init__(self, frame, text):
+        self.frame = frame
+        self.text = text
+        self.title = ""
+        self.load = None
+
+
+class ViewerWindow(tk.Toplevel):
+    """One window of tabs for viewing scripts and CMDs.
+
+    Opening a file that already has a tab selects that tab. At most
+    ``max_tabs`` stay open; past that the least recently used one is closed
+    and its text widget is reused for the new file, so the window never
+    holds more than ``max_tabs`` widgets however many files are opened.
+    Closing the window empties the tabs and hides it for the next open.
+
+    ``load(frame, text, kind, filename)`` fills ``text`` and returns a
+    ``FileLoad``.
+    """
+
+    def __init__(self, parent, load, max_tabs=MAX_TABS):
+        super().__init__(parent)
+        self.title("Viewer")
+        self.geometry("600x400")
+        self.load = load
+        self.max_tabs = max(1, max_tabs)
+        self.tabs = OrderedDict()  # (kind, filename) -> _Tab, least recently used first
+        self.spare = []  # pages of closed tabs, used before creating new ones
+
+        bar = tk.Frame(self)
+        bar.pack(side="bottom", fill="x")
+        tk.Button(bar, text="Close Tab", command=self.close_current).pack(side="right", padx=5, pady=2)
+        self.status = tk.Label(bar, anchor="w")
+        self.status.pack(side="left", fill="x", expand=True, padx=5)
+
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(side="top", fill="both", expand=True)
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self._on_tab_changed())
+        self.notebook.bind("<Button-2>", self._on_middle_click)
+        self.bind("<Control-w>", lambda e: self.close_current())
+        self.protocol("WM_DELETE_WINDOW", self.hide)
+
+    # --- Opening ---
+    def open(self, kind, filename, title):
+        """Show ``filename`` in its tab, opening one if needed, and raise the window."""
+        key = (kind, filename)
+        tab = self.tabs.get(key)
+        if tab is None:
+            tab = self._take_page()
+            tab.title = title
+            self.tabs[key] = tab
+            self.notebook.add(tab.frame, text=title)
+            tab.load = self.load(tab.frame, tab.text, kind, filename)
+        else:
+            self.tabs.move_to_end(key)
+        self.notebook.select(tab.frame)
+        self.deiconify()
+        self.lift()
+        tab.text.focus_set()
+        self._show_status()
+
+    def _take_page(self):
+        if len(self.tabs) >= self.max_tabs:
+            _key, tab = self.tabs.popitem(last=False)
+            self._forget(tab)
+            return tab
+        if self.spare:
+            return self.spare.pop()
+        frame = tk.Frame(self.notebook)
+        text = scrolledtext.ScrolledText(frame, wrap=tk.WORD)
+        text.pack(fill="both", expand=True)
+        return _Tab(frame, text)
+
+    def reload(self, kind, filename):
+        """Load a file again if it has a tab (it was saved or changed on disk)."""
+        tab = self.tabs.get((kind, filename))
+        if tab is not None:
+            self._reset(tab)
+            tab.load = self.load(tab.frame, tab.text, kind, filename)
+
+    # --- Closing ---
+    def _reset(self, tab):
+        if tab.load is not None:
+            tab.load.close()
+            tab.load = None
+        tab.text.config(state="normal")
+        tab.text.delete("1.0", tk.END)
+        tab.text.edit_reset()
+        tab.text.yview_moveto(0)
+
+    def _forget(self, tab):
+        self._reset(tab)
+        self.notebook.forget(tab.frame)
+
+    def close(self, kind, filename):
+        tab = self.tabs.pop((kind, filename), None)
+        if tab is None:
+            return
+        self._forget(tab)
+        self.spare.append(tab)
+        if not self.tabs:
+            self.withdraw()
+        self._show_status()
+
+    def close_current(self):
+        key = self._selected_key()
+        if key is not None:
+            self.close(*key)
+
+    def hide(self):
+        for key in list(self.tabs):
+            self.close(*key)
+        self.withdraw()
+
+    # --- Tabs ---
+    def _selected_key(self):
+        selected = self.notebook.select()
+        for key, tab in self.tabs.items():
+            if str(tab.frame) == selected:
+                return key
+        return None
+
+    def _on_tab_changed(self):
+        key = self._selected_key()
+        if key is not None:
+            self.tabs.move_to_end(key)
+            self.title(f"Viewer - {self.tabs[key].title}")
+
+    def _on_middle_click(self, event):
+        try:
+            index = self.notebook.index(f"@{event.x},{event.y}")
+        except tk.TclError:
+            return
+        page = self.notebook.tabs()[index]
+        for key, tab in self.tabs.items():
+            if str(tab.frame) == page:
+                self.close(*key)
+                return
+
+    def _show_status(self):
+        self.status.config(text=f"{len(self.tabs)} of {self.max_tabs} tabs open; "
+                                "the least recently used closes first")
@@ -0,0 +1,200 @@
+import math
+import tkinter as tk
+
+
+class VirtualList(tk.Frame):
+    """Scrollable list of ``{"desc", "filename"}`` entries (with optional
+    ``"tags"``) for the Scripts and Saved CMDs panels.
+
+    Only a fixed pool of row widgets is created, sized to the visible canvas
+    area. Scrolling rebinds the pooled rows to different entries instead of
+    creating new widgets, so render cost depends on the viewport and not on
+    the number of entries.
+    """
+
+    ROW_HEIGHT = 28
+
+    def __init__(self, parent, on_open, on_edit, on_delete, on_run=None, selectable=False,
+                 height=120, row_height=ROW_HEIGHT):
+        super().__init__(parent)
+        self.on_open = on_open
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.on_run = on_run  # Adds a Run button to each row when given
+        self.selectable = selectable  # Adds a checkbox to each row
+        self.selected = set()  # Filenames of the checked entries
+        self.row_height = row_height
+
+        self.canvas = tk.Canvas(self, height=height, highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.items = []
+        self.order = None  # Optional list of indices into items (filtering/sorting)
+        self.first = 0  # Position of the first visible entry
+        self.rows = []  # Pooled row widgets
+        self.row_windows = []  # Canvas window ids for the pooled rows
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.canvas)
+        self._resize_pool(height)
+
+    # --- Public API ---
+    def set_items(self, items, order=None):
+        """Show ``items`` (optionally through ``order``) and redraw the viewport."""
+        self.items = items
+        self.order = order
+        self.redraw()
+
+    def count(self):
+        return len(self.order) if self.order is not None else len(self.items)
+
+    def item_index(self, position):
+        """Map a list position to an index into ``items``."""
+        return self.order[position] if self.order is not None else position
+
+    def redraw(self):
+        """Rebind every pooled row, e.g. after entries were added or removed."""
+        self._clamp_first()
+        for slot in range(len(self.rows)):
+            self._bind_row(slot)
+        self._update_scrollbar()
+
+    def selected_items(self):
+        """Checked entries that are still in ``items``, in list order."""
+        return [item for item in self.items if item["filename"] in self.selected]
+
+    def clear_selection(self):
+        self.selected.clear()
+        self.redraw()
+
+    def refresh_item(self, item):
+        """Rebind the row showing ``item``, if it is currently visible."""
+        for slot in range(len(self.rows)):
+            position = self.first + slot
+            if position < self.count() and self.items[self.item_index(position)] is item:
+                self._bind_row(slot)
+                return
+
+    # --- Scrolling ---
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def yview(self, *args):
+        total = self.count()
+        if not args or not total:
+            return
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows()
+            self.first += step
+        self.redraw()
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.yview("scroll", step * 3, "units")
+        return "break"
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+
+    def _clamp_first(self):
+        max_first = max(0, self.count() - self.visible_rows())
+        self.first = min(max(0, self.first), max_first)
+
+    def _update_scrollbar(self):
+        total = self.count()
+        if not total:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible_rows()) / total))
+
+    # --- Row pool ---
+    def _on_resize(self, event):
+        for window in self.row_windows:
+            self.canvas.itemconfigure(window, width=event.width)
+        self._resize_pool(event.height)
+        self.redraw()
+
+    def _resize_pool(self, height):
+        needed = math.ceil(height / self.row_height) + 1
+        while len(self.rows) < needed:
+            self._create_row(len(self.rows))
+        while len(self.rows) > needed:
+            self.rows.pop().destroy()
+            self.canvas.delete(self.row_windows.pop())
+
+    def _create_row(self, slot):
+        row = tk.Frame(self.canvas)
+        buttons = []
+        if self.selectable:
+            row.check_var = tk.BooleanVar()
+            check = tk.Checkbutton(row, variable=row.check_var, command=lambda s=slot: self._toggle(s))
+            check.pack(side="left")
+            buttons.append(check)
+        desc_label = tk.Label(row, anchor="w")
+        desc_label.pack(side="left", padx=5)
+        file_label = tk.Label(row, fg="blue", cursor="hand2", anchor="w")
+        file_label.pack(side="left", padx=5)
+        file_label.bind("<Button-1>", lambda e, s=slot: self._fire(self.on_open, s))
+        tags_label = tk.Label(row, fg="gray", anchor="w")
+        tags_label.pack(side="left", padx=5)
+        del_btn = tk.Button(row, text="Delete", command=lambda s=slot: self._fire(self.on_delete, s))
+        del_btn.pack(side="right", padx=5)
+        edit_btn = tk.Button(row, text="Edit", command=lambda s=slot: self._fire(self.on_edit, s))
+        edit_btn.pack(side="right", padx=5)
+        buttons += [edit_btn, del_btn]
+        if self.on_run is not None:
+            run_btn = tk.Button(row, text="Run", command=lambda s=slot: self._fire(self.on_run, s))
+            run_btn.pack(side="right", padx=5)
+            buttons.append(run_btn)
+        row.desc_label = desc_label
+        row.file_label = file_label
+        row.tags_label = tags_label
+        for widget in [row, desc_label, file_label, tags_label] + buttons:
+            self._bind_wheel(widget)
+        window = self.canvas.create_window(
+            (0, slot * self.row_height), window=row, anchor="nw",
+            height=self.row_height, width=self.canvas.winfo_width()
+        )
+        self.rows.append(row)
+        self.row_windows.append(window)
+
+    def _bind_row(self, slot):
+        row = self.rows[slot]
+        position = self.first + slot
+        if position >= self.count():
+            self.canvas.itemconfigure(self.row_windows[slot], state="hidden")
+            return
+        item = self.items[self.item_index(position)]
+        row.desc_label.config(text=item["desc"] + ": ")
+        row.file_label.config(text=item["filename"])
+        row.tags_label.config(text=" ".join("#" + tag for tag in item.get("tags", ())))
+        if self.selectable:
+            row.check_var.set(item["filename"] in self.selected)
+        self.canvas.itemconfigure(self.row_windows[slot], state="normal")
+
+    def _toggle(self, slot):
+        position = self.first + slot
+        if position < self.count():
+            filename = self.items[self.item_index(position)]["filename"]
+            if self.rows[slot].check_var.get():
+                self.selected.add(filename)
+            else:
+                self.selected.discard(filename)
+
+    def _fire(self, callback, slot):
+        position = self.first + slot
+        if position < self.count():
+            callback(self.item_index(position))
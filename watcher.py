@@ -0,0 +1,162 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM
+              | IN_MOVED_TO | IN_CREATE | IN_DELETE)
+_EVENT = struct.Struct("iIII")
+
+
+class InotifySource:
+    """Linux inotify event source. Reports ``(key, filename)`` pairs."""
+
+    def __init__(self, folders):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.keys = {}
+        for key, path in folders.items():
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(err, f"inotify_add_watch failed for {path}")
+            self.keys[wd] = key
+
+    def wait(self, timeout):
+        """Block up to ``timeout`` seconds and return the events read."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; every folder needs a full rescan
+                events.extend((key, None) for key in self.keys.values())
+                continue
+            key = self.keys.get(wd)
+            if key is not None and name:
+                events.append((key, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    """Stat-based fallback for platforms without inotify.
+
+    Each tick only stats the watched directories themselves; a directory
+    mtime change (create, delete, rename) reports a full rescan of that
+    folder. In-place content edits do not touch the directory mtime, so every
+    ``verify_every`` ticks each folder is rescanned once as well.
+    """
+
+    def __init__(self, folders, stop_event, interval=1.0, verify_every=30):
+        self.folders = dict(folders)
+        self.stop_event = stop_event
+        self.interval = interval
+        self.verify_every = verify_every
+        self.ticks = 0
+        self.mtimes = {key: self._dir_mtime(path) for key, path in self.folders.items()}
+
+    @staticmethod
+    def _dir_mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def wait(self, timeout):
+        if self.stop_event.wait(min(timeout, self.interval)):
+            return []
+        self.ticks += 1
+        verify = self.verify_every and self.ticks % self.verify_every == 0
+        events = []
+        for key, path in self.folders.items():
+            mtime = self._dir_mtime(path)
+            if verify or mtime != self.mtimes[key]:
+                self.mtimes[key] = mtime
+                events.append((key, None))
+        return events
+
+    def close(self):
+        pass
+
+
+class FolderWatcher(threading.Thread):
+    """Background watcher for the user scripts/cmds folders.
+
+    ``folders`` maps a key (e.g. ``"scripts"``) to a directory. Events are
+    debounced and coalesced into one batch, ``{key: set_of_filenames}``,
+    where a value of ``None`` means the folder needs a full rescan. ``callback``
+    is called on the watcher thread; callers post it to the Tk thread.
+    """
+
+    def __init__(self, folders, callback, debounce=0.3, max_delay=2.0, poll_interval=1.0):
+        super().__init__(name="FolderWatcher", daemon=True)
+        self.callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self.source = None
+        if sys.platform.startswith("linux"):
+            try:
+                self.source = InotifySource(folders)
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable, falling back to polling: {e}")
+        if self.source is None:
+            self.source = PollingSource(folders, self._stop_event, interval=poll_interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        pending = {}
+        first_event = last_event = 0.0
+        try:
+            while not self._stop_event.is_set():
+                events = self.source.wait(self.debounce if pending else self.poll_interval)
+                now = time.monotonic()
+                if events:
+                    if not pending:
+                        first_event = now
+                    last_event = now
+                    for key, name in events:
+                        names = pending.setdefault(key, set())
+                        if name is None:
+                            pending[key] = None
+                        elif names is not None:
+                            names.add(name)
+                if pending and (now - last_event >= self.debounce or now - first_event >= self.max_delay):
+                    self.callback(pending)
+                    pending = {}
+        finally:
+            self.source.close()